@@ -0,0 +1,71 @@
+"""Compare application profiles: create_app() startup time and per-request overhead.
+
+"legacy" rebuilds the previous module-level app: debug=True plus a BaseHTTPMiddleware that scanned
+sys.modules for pytest on every request. Requests go straight to the ASGI app; the unrouted path
+isolates middleware/routing cost, the listing adds a DB round trip.
+
+Usage: python -m benchmarks.bench_app_profiles [--requests N] [--startups N]
+"""
+import argparse
+import asyncio
+import sys
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from benchmarks.common import asgi_get, benchmark_client, register_and_login, timed
+from cm_customer_svc.app import PROFILES, create_app
+
+
+class _LegacyTestCookieMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if not any("pytest" in m for m in sys.modules):
+            return response
+        return response
+
+
+def _legacy_app() -> FastAPI:
+    application = create_app(PROFILES["development"])
+    application.add_middleware(_LegacyTestCookieMiddleware)
+    return application
+
+
+def _builders():
+    return {
+        "legacy": _legacy_app,
+        "test": lambda: create_app(PROFILES["test"]),
+        "development": lambda: create_app(PROFILES["development"]),
+        "production": lambda: create_app(PROFILES["production"]),
+    }
+
+
+async def _run(client, path: str, query: str, requests: int, expected: int) -> None:
+    for _ in range(requests):
+        status_code = await asgi_get(client, path, query)
+        assert status_code == expected, status_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--startups", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"requests={args.requests} startups={args.startups}")
+    for name, build in _builders().items():
+        startup = timed(lambda: [build() for _ in range(args.startups)]) / args.startups
+        with benchmark_client(build()) as client:
+            register_and_login(client)
+            # first request builds the middleware stack
+            asyncio.run(_run(client, "/api/nothing-here", "", 1, 404))
+            unrouted = timed(lambda: asyncio.run(_run(client, "/api/nothing-here", "", args.requests, 404))) / args.requests
+            listing = timed(lambda: asyncio.run(_run(client, "/api/customers", "page_size=1", args.requests // 10, 200))) / (args.requests // 10)
+        print(
+            f"{name:>12}: create_app {startup * 1e3:6.1f} ms   unrouted 404 {unrouted * 1e6:6.0f} us/request   "
+            f"GET /api/customers {listing * 1e6:6.0f} us/request"
+        )
+
+
+if __name__ == "__main__":
+    main()
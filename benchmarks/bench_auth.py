@@ -0,0 +1,39 @@
+"""Measure cookie authentication cost: full JWT verification vs the verified-token cache.
+
+Usage: python -m benchmarks.bench_auth [--requests N]
+"""
+import argparse
+
+from fastapi import Request
+
+from benchmarks.common import timed
+from cm_customer_svc.dependencies.auth import get_current_user
+from cm_customer_svc.routers.auth import ACCESS_TOKEN_COOKIE_NAME
+from cm_customer_svc.utils.jwt_utils import create_access_token, verified_token_cache
+
+
+def _run(token: str, requests: int, cached: bool) -> None:
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"cookie", f"{ACCESS_TOKEN_COOKIE_NAME}={token}".encode())]}
+    for _ in range(requests):
+        if not cached:
+            verified_token_cache.clear()
+        assert get_current_user(Request(scope)) == "90000001"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token({"sub": "90000001"})
+    uncached = timed(lambda: _run(token, args.requests, cached=False))
+    verified_token_cache.clear()
+    cached = timed(lambda: _run(token, args.requests, cached=True))
+
+    print(f"requests={args.requests}")
+    print(f"full verify: {uncached:.3f}s  {uncached / args.requests * 1e6:.1f} us/request")
+    print(f"cached:      {cached:.3f}s  {cached / args.requests * 1e6:.1f} us/request  ({uncached / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
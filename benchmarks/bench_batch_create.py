@@ -0,0 +1,46 @@
+"""Compare customer insert throughput: POST /api/customers per row vs POST /api/customers:batch.
+
+Usage: python -m benchmarks.bench_batch_create [--rows N] [--batch-size N]
+"""
+import argparse
+
+from benchmarks.common import benchmark_client, register_and_login, timed
+
+
+def _single_row(client, rows: int) -> None:
+    for i in range(rows):
+        r = client.post("/api/customers", json={"customer_name": f"Single {i}", "customer_contact": "1234567"})
+        assert r.status_code == 201
+
+
+def _batched(client, rows: int, batch_size: int) -> None:
+    for start in range(0, rows, batch_size):
+        items = [
+            {"customer_name": f"Batch {i}", "customer_contact": "1234567"}
+            for i in range(start, min(start + batch_size, rows))
+        ]
+        r = client.post("/api/customers:batch", json={"items": items})
+        assert r.status_code == 200 and r.json()["error_count"] == 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with benchmark_client() as client:
+        register_and_login(client)
+        single = timed(lambda: _single_row(client, args.rows))
+
+    with benchmark_client() as client:
+        register_and_login(client)
+        batched = timed(lambda: _batched(client, args.rows, args.batch_size))
+
+    print(f"rows={args.rows} batch_size={args.batch_size}")
+    print(f"single-row: {single:.3f}s  {args.rows / single:,.0f} rows/s")
+    print(f"batched:    {batched:.3f}s  {args.rows / batched:,.0f} rows/s  ({single / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
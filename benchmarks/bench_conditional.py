@@ -0,0 +1,63 @@
+"""Measure conditional GETs: full 200 responses vs 304 revalidations for a customer and a listing page.
+
+Requests go straight to the ASGI app (no TestClient thread hand-off) so the handler cost is visible.
+
+Usage: python -m benchmarks.bench_conditional [--customers N] [--requests N] [--page-size N]
+"""
+import argparse
+import asyncio
+
+from benchmarks.common import asgi_get, benchmark_client, register_and_login, timed
+
+
+async def _run(client, path: str, query: str, headers, requests: int, expected: int) -> int:
+    received = 0
+
+    def on_body(chunk: bytes) -> None:
+        nonlocal received
+        received += len(chunk)
+
+    for _ in range(requests):
+        status_code = await asgi_get(client, path, query, on_body, headers)
+        assert status_code == expected, status_code
+    return received
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    with benchmark_client() as client:
+        register_and_login(client)
+        items = [{"customer_name": f"Customer {i:06d}", "customer_address": f"{i} Main Street"} for i in range(args.customers)]
+        for start in range(0, len(items), 1000):
+            assert client.post("/api/customers:batch", json={"items": items[start : start + 1000]}).status_code == 200
+        customer_id = client.get("/api/customers", params={"page_size": 1}).json()["items"][0]["customer_id"]
+
+        cases = [
+            ("customer", f"/api/customers/{customer_id}", ""),
+            (f"page of {args.page_size}", "/api/customers", f"page_size={args.page_size}"),
+        ]
+        print(f"customers={args.customers} requests={args.requests}")
+        for label, path, query in cases:
+            etag = client.get(f"{path}?{query}").headers["etag"]
+            conditional_headers = [(b"if-none-match", etag.encode())]
+            received = {}
+
+            def run(name, headers, expected):
+                received[name] = asyncio.run(_run(client, path, query, headers, args.requests, expected))
+
+            full_time = timed(lambda: run("full", [], 200))
+            cond_time = timed(lambda: run("conditional", conditional_headers, 304))
+            print(
+                f"{label:>12}: 200 {full_time / args.requests * 1e6:6.0f} us/request {received['full'] // args.requests:6d} B  |  "
+                f"304 {cond_time / args.requests * 1e6:6.0f} us/request {received['conditional'] // args.requests:6d} B  "
+                f"({full_time / cond_time:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
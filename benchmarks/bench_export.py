@@ -0,0 +1,54 @@
+"""Measure time to first byte, total time and peak Python memory of GET /api/customers/export.
+
+Usage: python -m benchmarks.bench_export [--rows N] [--format ndjson|csv]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks.common import asgi_get, benchmark_client, register_and_login
+
+
+def _seed(client, rows: int, batch_size: int = 1000) -> None:
+    for start in range(0, rows, batch_size):
+        items = [{"customer_name": f"Export {i}", "customer_address": f"{i} Main St"} for i in range(start, min(start + batch_size, rows))]
+        r = client.post("/api/customers:batch", json={"items": items})
+        assert r.status_code == 200
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+
+    with benchmark_client() as client:
+        register_and_login(client)
+        _seed(client, args.rows)
+
+        first_byte = None
+        received = 0
+
+        def on_body(chunk: bytes) -> None:
+            nonlocal first_byte, received
+            if chunk and first_byte is None:
+                first_byte = time.perf_counter() - start
+            received += len(chunk)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        status_code = asyncio.run(asgi_get(client, "/api/customers/export", f"format={args.format}", on_body))
+        total = time.perf_counter() - start
+        assert status_code == 200
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"rows={args.rows} format={args.format} bytes={received:,}")
+    print(f"time to first byte: {first_byte * 1000:.1f} ms")
+    print(f"total: {total:.3f}s  {args.rows / total:,.0f} rows/s")
+    print(f"peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
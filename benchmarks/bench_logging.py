@@ -0,0 +1,117 @@
+"""Measure what logging costs the request thread on a flood of invalid requests.
+
+Part one times a single log call made inside an except block: the old call-site pattern
+logger.error(e, exc_info=True) written synchronously (the former basicConfig setup), the same call
+through configure_logging() (queued, rate limited), and the DEBUG line client errors now use.
+
+Part two sends malformed customer ids and bad session cookies through the app with each setup at
+--level and reports the time per request and the lines written. Each figure is the best of
+--repeats runs.
+
+Usage: python -m benchmarks.bench_logging [--calls N] [--requests N] [--repeats N] [--level LEVEL]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import timeit
+
+from benchmarks.common import asgi_get, benchmark_client, register_and_login, timed
+from cm_customer_svc.routers.auth import ACCESS_TOKEN_COOKIE_NAME
+from cm_customer_svc.utils.logging_utils import TEXT_FORMAT, configure_logging, stop_logging
+
+
+class _CountingSink:
+    def __init__(self):
+        self.lines = 0
+        self._devnull = open(os.devnull, "w")
+
+    def write(self, text: str) -> int:
+        self.lines += text.count("\n")
+        return self._devnull.write(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _setup(kind: str, level: str, sink: _CountingSink) -> None:
+    root = logging.getLogger()
+    if kind == "sync":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(level)
+    else:
+        configure_logging(level=level, stream=sink)
+
+
+def _teardown() -> None:
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+def _call_time(kind: str, traceback: bool, calls: int, repeats: int) -> float:
+    sink = _CountingSink()
+    _setup(kind, "INFO", sink)
+    log = logging.getLogger("cm_customer_svc.bench")
+    try:
+        raise ValueError("badly formed hexadecimal UUID string")
+    except ValueError as e:
+        if traceback:
+            call = lambda: log.error(e, exc_info=True)  # noqa: E731
+        else:
+            call = lambda: log.debug("malformed customer id %r", "not-a-uuid")  # noqa: E731
+        elapsed = min(timeit.repeat(call, number=calls, repeat=repeats)) / calls
+    _teardown()
+    return elapsed
+
+
+def _flood_time(kind: str, level: str, requests: int, repeats: int):
+    sink = _CountingSink()
+    with benchmark_client() as client:
+        register_and_login(client)
+        session = client.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
+
+        async def run():
+            client.cookies.clear()
+            client.cookies.set(ACCESS_TOKEN_COOKIE_NAME, session)
+            for _ in range(requests // 2):
+                assert await asgi_get(client, "/api/customers/not-a-uuid") == 404
+            client.cookies.clear()
+            client.cookies.set(ACCESS_TOKEN_COOKIE_NAME, "not-a-token")
+            for _ in range(requests - requests // 2):
+                assert await asgi_get(client, "/api/customers") == 401
+
+        _setup(kind, level, sink)
+        try:
+            elapsed = min(timed(lambda: asyncio.run(run())) for _ in range(repeats)) / requests
+        finally:
+            _teardown()
+    return elapsed, sink.lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--level", default="DEBUG")
+    args = parser.parse_args()
+
+    print(f"calls={args.calls} requests={args.requests} repeats={args.repeats} level={args.level}")
+    sync_tb = _call_time("sync", True, args.calls, args.repeats)
+    queued_tb = _call_time("queued", True, args.calls, args.repeats)
+    queued_debug = _call_time("queued", False, args.calls, args.repeats)
+    print(
+        f"log call:  error+traceback sync {sync_tb * 1e6:6.1f} us   error+traceback queued {queued_tb * 1e6:6.1f} us   "
+        f"debug (filtered at INFO) {queued_debug * 1e6:6.2f} us"
+    )
+    for kind in ("sync", "queued"):
+        elapsed, lines = _flood_time(kind, args.level, args.requests, args.repeats)
+        print(f"flood {kind:6s}: {elapsed * 1e6:6.1f} us/request   {lines} lines written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure the login rate limiter: the cost of one check, and how much password hashing a
+credential-stuffing burst from one client address gets through with and without the limiter.
+
+The burst sends --attempts logins with wrong passwords, spread over --accounts seeded employee ids
+(and unknown ids, which now cost a dummy verification), all from one address.
+
+Usage: python -m benchmarks.bench_login_limit [--attempts N] [--accounts N] [--checks N]
+"""
+import argparse
+import asyncio
+import json
+import timeit
+
+from benchmarks.common import asgi_request, benchmark_client, engine_for, timed
+from benchmarks.seed import employee_ids, seed_database
+from cm_customer_svc.config import LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_PER_MINUTE, LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE
+from cm_customer_svc.utils import rate_limit
+from cm_customer_svc.utils.metrics import password_hash_duration
+from cm_customer_svc.utils.rate_limit import LoginRateLimiter, MemoryBucketStore
+
+_JSON_HEADERS = ((b"content-type", b"application/json"),)
+
+
+def _limiter() -> LoginRateLimiter:
+    return LoginRateLimiter(MemoryBucketStore(100000), LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE, LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_PER_MINUTE)
+
+
+def _verifications() -> int:
+    return password_hash_duration.count("verify")
+
+
+def _burst(limited: bool, attempts: int, accounts: int):
+    engine = engine_for(None)
+    seed_database(engine, customers=1, users=accounts)
+    ids = employee_ids(accounts) + [f"{80000001 + i:08d}" for i in range(accounts)]
+    rate_limit.login_limiter = _limiter() if limited else None
+    statuses = {}
+    with benchmark_client(engine=engine) as client:
+
+        async def run():
+            for i in range(attempts):
+                body = json.dumps({"employee_id": ids[i % len(ids)], "password": "WrongPass1"}).encode()
+                status = await asgi_request(client, "POST", "/api/auth/login", body=body, headers=_JSON_HEADERS, client_host="203.0.113.7")
+                statuses[status] = statuses.get(status, 0) + 1
+
+        before = _verifications()
+        elapsed = timed(lambda: asyncio.run(run()))
+        verified = _verifications() - before
+    engine.dispose()
+    return elapsed, verified, statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--attempts", type=int, default=300)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--checks", type=int, default=100000)
+    args = parser.parse_args()
+
+    limiter = _limiter()
+    keys = [f"198.51.{i >> 8 & 255}.{i & 255}" for i in range(4096)]
+    counter = iter(range(10**12))
+    per_check = min(timeit.repeat(lambda: limiter.check(keys[next(counter) % 4096], "90000001"), number=args.checks, repeat=5)) / args.checks
+    print(f"limiter check (memory store): {per_check * 1e6:.2f} us")
+
+    print(f"burst of {args.attempts} wrong-password logins from one address over {args.accounts} known + {args.accounts} unknown ids")
+    for limited in (False, True):
+        elapsed, verified, statuses = _burst(limited, args.attempts, args.accounts)
+        print(
+            f"  limiter {'on ' if limited else 'off'}: {elapsed:6.2f} s   {verified:4d} PBKDF2 verifications   "
+            f"responses {dict(sorted(statuses.items()))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure the cost of metrics collection: the per-request route wrapper and the per-statement SQL
+events, each with and without instrumentation.
+
+Statements are also timed with no-op cursor listeners, which separates SQLAlchemy's event dispatch
+from the recording itself. Each figure is the best of --repeats runs.
+
+Usage: python -m benchmarks.bench_metrics [--requests N] [--statements N] [--repeats N]
+"""
+import argparse
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+
+from benchmarks.common import asgi_get, timed
+from cm_customer_svc.utils.metrics import instrument_engine, instrument_routes
+
+
+def _ping_app(instrumented: bool) -> FastAPI:
+    application = FastAPI()
+
+    @application.get("/ping")
+    async def ping() -> Response:
+        return Response(b"pong")
+
+    if instrumented:
+        instrument_routes(application)
+    return application
+
+
+def _request_time(instrumented: bool, requests: int, repeats: int) -> float:
+    client = TestClient(_ping_app(instrumented))
+
+    async def run():
+        for _ in range(requests):
+            assert await asgi_get(client, "/ping") == 200
+
+    return min(timed(lambda: asyncio.run(run())) for _ in range(repeats)) / requests
+
+
+def _noop(*args) -> None:
+    pass
+
+
+def _statement_time(listeners: str, statements: int, repeats: int) -> float:
+    engine = create_engine("sqlite:///:memory:")
+    if listeners == "metrics":
+        instrument_engine(engine)
+    elif listeners == "noop":
+        event.listen(engine, "before_cursor_execute", _noop)
+        event.listen(engine, "after_cursor_execute", _noop)
+    with engine.connect() as conn:
+        statement = text("SELECT 1")
+        conn.execute(statement)
+        elapsed = min(timed(lambda: [conn.execute(statement) for _ in range(statements)]) for _ in range(repeats)) / statements
+    engine.dispose()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--statements", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"requests={args.requests} statements={args.statements} repeats={args.repeats}")
+    plain, metered = (_request_time(instrumented, args.requests, args.repeats) for instrumented in (False, True))
+    print(f"request:   plain {plain * 1e6:6.1f} us   instrumented {metered * 1e6:6.1f} us   overhead {(metered - plain) * 1e6:5.1f} us")
+    plain, noop, metered = (_statement_time(listeners, args.statements, args.repeats) for listeners in ("none", "noop", "metrics"))
+    print(
+        f"statement: plain {plain * 1e6:6.1f} us   no-op listeners {noop * 1e6:6.1f} us   instrumented {metered * 1e6:6.1f} us   "
+        f"recording {(metered - noop) * 1e6:5.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
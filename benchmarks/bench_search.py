@@ -0,0 +1,108 @@
+"""Compare GET /api/customers/search backends with a LIKE scan over the customers table.
+
+Seeds a SQLite database directly (Core inserts, no HTTP) and times the search query of each
+backend against the equivalent '%term%' LIKE predicate for a few typical queries.
+
+Usage: python -m benchmarks.bench_search [--rows N] [--repeat N]
+"""
+import argparse
+import random
+import time
+import uuid
+
+from sqlalchemy import and_, create_engine, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from cm_customer_svc.models import Customer, User
+from cm_customer_svc.models.base import Base
+from cm_customer_svc.utils import search_index
+from cm_customer_svc.utils.search_index import rebuild_search_index, search_customer_ids, search_terms
+
+_WORDS = ["acme", "globex", "initech", "umbrella", "stark", "wayne", "wonka", "tyrell", "cyberdyne", "soylent",
+          "hooli", "vandelay", "oscorp", "gringotts", "monarch", "aperture", "massive", "dynamic", "prime", "north"]
+_STREETS = ["Harbor Road", "Main Street", "Oak Avenue", "Mill Lane", "Station Road", "Park Way"]
+_QUERIES = ["wonka", "harbor", "tyrell prime", "5550199"]
+
+
+def _seed(session: Session, rows: int) -> None:
+    rng = random.Random(42)
+    session.execute(insert(User), [{"employee_id": "90000001", "employee_name": "Bench", "password_hash": "x"}])
+    batch = []
+    for i in range(rows):
+        batch.append(
+            {
+                "customer_id": uuid.UUID(int=rng.getrandbits(128)),
+                "customer_name": f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()} {i}",
+                "customer_address": f"{rng.randint(1, 999)} {rng.choice(_STREETS)}",
+                "customer_contact": f"+1 (555) {rng.randint(0, 9999999):07d}",
+                "managed_by": "90000001",
+            }
+        )
+        if len(batch) == 10000:
+            session.execute(insert(Customer), batch)
+            batch = []
+    if batch:
+        session.execute(insert(Customer), batch)
+    session.commit()
+
+
+def _like_scan(session: Session, terms, limit: int):
+    digits = func.replace(func.replace(func.replace(func.replace(func.replace(
+        func.coalesce(Customer.customer_contact, ""), " ", ""), "-", ""), "(", ""), ")", ""), "+", "")
+    criteria = [
+        or_(
+            Customer.customer_name.like(f"%{term}%"),
+            Customer.customer_address.like(f"%{term}%"),
+            digits.like(f"%{term}%"),
+        )
+        for term in terms
+    ]
+    ids = session.execute(select(Customer.customer_id).where(and_(*criteria)).limit(limit)).scalars().all()
+    total = session.execute(select(func.count()).select_from(Customer).where(and_(*criteria))).scalar_one()
+    return ids, total
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        start = time.perf_counter()
+        _seed(session, args.rows)
+        seeded = time.perf_counter() - start
+        start = time.perf_counter()
+        rebuild_search_index(session)
+        session.commit()
+        indexed = time.perf_counter() - start
+        print(f"rows={args.rows} seed={seeded:.1f}s fts5 index build={indexed:.1f}s")
+
+        for q in _QUERIES:
+            terms = search_terms(q)
+            search_index.CUSTOMER_SEARCH_BACKEND = "fts5"
+            fts = _best_of(args.repeat, lambda: search_customer_ids(session, terms, 10, 0))
+            search_index.CUSTOMER_SEARCH_BACKEND = "memory"
+            search_customer_ids(session, terms, 10, 0)  # first call builds the in-memory index
+            memory = _best_of(args.repeat, lambda: search_customer_ids(session, terms, 10, 0))
+            like = _best_of(args.repeat, lambda: _like_scan(session, terms, 10))
+            total = _like_scan(session, terms, 10)[1]
+            print(
+                f"q={q!r:16} matches={total:>7}  like={like * 1000:8.1f} ms  fts5={fts * 1000:8.1f} ms ({like / fts:5.1f}x)"
+                f"  memory={memory * 1000:8.1f} ms ({like / memory:5.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Measure the serialization share of a customer listing page: the previous ORM -> CustomerResponse ->
+jsonable dict -> JSON chain vs row tuples serialized in one pydantic-core call.
+
+Usage: python -m benchmarks.bench_serialization [--customers N] [--page-size N] [--rounds N]
+"""
+import argparse
+import asyncio
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy import select
+
+from benchmarks.common import asgi_get, benchmark_client, register_and_login, timed
+from cm_customer_svc.app import app
+from cm_customer_svc.models.base import get_db
+from cm_customer_svc.models.customer import Customer
+from cm_customer_svc.schemas.customer import CustomerResponse, PaginatedCustomerResponse
+from cm_customer_svc.utils.serialization import CUSTOMER_COLUMNS, CustomerJSONResponse, customer_row_dicts
+
+
+def _listing_route():
+    return next(route for route in app.routes if getattr(route, "path", None) == "/api/customers" and "GET" in route.methods)
+
+
+def _orm_path(db, page_size: int, field) -> bytes:
+    db.expunge_all()
+    customers = db.execute(select(Customer).order_by(Customer.created_at, Customer.customer_id).limit(page_size)).scalars().all()
+    model = PaginatedCustomerResponse(
+        total_count=None,
+        page=1,
+        page_size=page_size,
+        items=[CustomerResponse.model_validate(c) for c in customers],
+    )
+    content = asyncio.run(serialize_response(field=field, response_content=model))
+    return JSONResponse(content).body
+
+
+def _row_path(db, page_size: int) -> bytes:
+    rows = db.execute(select(*CUSTOMER_COLUMNS).order_by(Customer.created_at, Customer.customer_id).limit(page_size)).all()
+    content = {
+        "total_count": None,
+        "total_count_exact": True,
+        "page": 1,
+        "page_size": page_size,
+        "items": customer_row_dicts(rows),
+        "next_cursor": None,
+    }
+    return CustomerJSONResponse(content).body
+
+
+def _serialize_only(db, page_size: int, field):
+    """(before, after) callables that only serialize an already loaded page."""
+    customers = db.execute(select(Customer).limit(page_size)).scalars().all()
+    rows = db.execute(select(*CUSTOMER_COLUMNS).limit(page_size)).all()
+
+    def before():
+        model = PaginatedCustomerResponse(total_count=None, page=1, page_size=page_size, items=[CustomerResponse.model_validate(c) for c in customers])
+        JSONResponse(asyncio.run(serialize_response(field=field, response_content=model))).body
+
+    def after():
+        content = {"total_count": None, "total_count_exact": True, "page": 1, "page_size": page_size, "items": customer_row_dicts(rows), "next_cursor": None}
+        CustomerJSONResponse(content).body
+
+    return before, after
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    with benchmark_client() as client:
+        register_and_login(client)
+        items = [{"customer_name": f"Customer {i:06d}", "customer_address": f"{i} Main Street", "customer_contact": "555-0100"} for i in range(args.customers)]
+        for start in range(0, len(items), 1000):
+            assert client.post("/api/customers:batch", json={"items": items[start : start + 1000]}).status_code == 200
+
+        sessions = app.dependency_overrides[get_db]()
+        db = next(sessions)
+        field = _listing_route().response_field
+        # both paths must produce the same bytes
+        assert _orm_path(db, args.page_size, field) == _row_path(db, args.page_size)
+
+        before, after = _serialize_only(db, args.page_size, field)
+        serialize_before = timed(lambda: [before() for _ in range(args.rounds)]) / args.rounds
+        serialize_after = timed(lambda: [after() for _ in range(args.rounds)]) / args.rounds
+        load_before = timed(lambda: [_orm_path(db, args.page_size, field) for _ in range(args.rounds)]) / args.rounds
+        load_after = timed(lambda: [_row_path(db, args.page_size) for _ in range(args.rounds)]) / args.rounds
+
+        async def requests():
+            for _ in range(args.rounds):
+                assert await asgi_get(client, "/api/customers", f"page_size={args.page_size}&include_total=false") == 200
+
+        request_after = timed(lambda: asyncio.run(requests())) / args.rounds
+        request_before = request_after - serialize_after + serialize_before
+        sessions.close()
+
+    print(f"customers={args.customers} page_size={args.page_size} rounds={args.rounds}")
+    print(f"serialize page:        before {serialize_before * 1e6:7.0f} us   after {serialize_after * 1e6:7.0f} us  ({serialize_before / serialize_after:.1f}x)")
+    print(f"query + serialize:     before {load_before * 1e6:7.0f} us   after {load_after * 1e6:7.0f} us  ({load_before / load_after:.1f}x)")
+    print(
+        f"share of GET latency:  before {serialize_before / request_before:6.1%} of ~{request_before * 1e6:.0f} us   "
+        f"after {serialize_after / request_after:6.1%} of {request_after * 1e6:.0f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Shared helpers for the benchmark scripts.
+
+Each benchmark runs the real application in-process against a fresh in-memory SQLite database,
+mirroring the fixtures in tests/conftest.py.
+"""
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, StaticPool, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from cm_customer_svc.app import app
+from cm_customer_svc.models.base import Base, engine_options, get_db
+
+
+def memory_engine() -> Engine:
+    """Fresh in-memory SQLite database shared by all threads."""
+    return create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def engine_for(url: Optional[str]) -> Engine:
+    """Engine for url with the service's pool settings; None gives memory_engine()."""
+    if not url:
+        return memory_engine()
+    options = engine_options(url)
+    if url.startswith("sqlite"):
+        # requests run on threadpool threads
+        options["connect_args"] = {"check_same_thread": False}
+    return create_engine(url, **options)
+
+
+@contextmanager
+def benchmark_client(application: FastAPI = app, engine: Optional[Engine] = None) -> Iterator[TestClient]:
+    """TestClient for application with get_db bound to engine (default: a fresh memory_engine()).
+
+    The schema is created if missing. An engine passed in is left open for the caller.
+    """
+    owned = engine is None
+    if owned:
+        engine = memory_engine()
+    Base.metadata.create_all(engine)
+    session_local = sessionmaker(bind=engine)
+
+    def override_session():
+        session = session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    application.dependency_overrides[get_db] = override_session
+    try:
+        # https base URL so the Secure session cookie is sent back without the test-only middleware
+        with TestClient(application, base_url="https://testserver") as client:
+            yield client
+    finally:
+        application.dependency_overrides.pop(get_db, None)
+        if owned:
+            engine.dispose()
+
+
+def register_and_login(client: TestClient, employee_id: str = "90000001", password: str = "Password123") -> None:
+    r = client.post("/api/register", json={"employee_id": employee_id, "employee_name": "Bench", "password": password})
+    assert r.status_code == 201, r.text
+    r = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert r.status_code == 200, r.text
+
+
+def timed(fn: Callable[[], object]) -> float:
+    """Run fn once and return elapsed wall time in seconds."""
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+async def asgi_get(
+    client: TestClient,
+    path: str,
+    query: str = "",
+    on_body: Optional[Callable[[bytes], None]] = None,
+    headers: Sequence[Tuple[bytes, bytes]] = (),
+) -> int:
+    """Issue a GET straight against the ASGI app, passing each body chunk to on_body as it is sent.
+
+    TestClient buffers whole responses; this does not, so streaming endpoints can be timed per chunk.
+    Returns the response status code.
+    """
+    return await asgi_request(client, "GET", path, query, on_body=on_body, headers=headers)
+
+
+async def asgi_request(
+    client: TestClient,
+    method: str,
+    path: str,
+    query: str = "",
+    body: bytes = b"",
+    on_body: Optional[Callable[[bytes], None]] = None,
+    headers: Sequence[Tuple[bytes, bytes]] = (),
+    client_host: str = "127.0.0.1",
+    cookies: Optional[Dict[str, str]] = None,
+) -> int:
+    """asgi_get for any method; body is sent as a single request message. Returns the status code.
+
+    client_host is the peer address the app sees (login attempts are rate limited per address).
+    cookies replaces the client's cookie jar for this request.
+    """
+    jar = client.cookies.items() if cookies is None else cookies.items()
+    cookie = "; ".join(f"{name}={value}" for name, value in jar)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [
+            (b"host", b"testserver"),
+            (b"cookie", cookie.encode()),
+            *([(b"content-length", str(len(body)).encode())] if body else []),
+            *headers,
+        ],
+        "client": (client_host, 50000),
+        "server": ("testserver", 443),
+    }
+    status_code = 0
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body" and on_body is not None:
+            on_body(message.get("body", b""))
+
+    await client.app(scope, receive, send)
+    return status_code
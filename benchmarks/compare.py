@@ -0,0 +1,68 @@
+"""Compare two load-driver result files (python -m benchmarks.load --output ...).
+
+Prints req/s and p50/p95/p99 per scenario with the relative change from the baseline, and exits
+with status 1 when any scenario's p95 grew, or its req/s fell, by more than --threshold percent.
+Scenarios present in only one file are listed but not judged.
+
+Usage: python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold PERCENT]
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+_METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def regressions(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Tuple[str, str, float]]:
+    """(scenario, metric, percent change) where p95 rose or req/s fell by more than threshold percent."""
+    found = []
+    for name, after in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        slower = _change(before["p95_ms"], after["p95_ms"])
+        if slower > threshold:
+            found.append((name, "p95_ms", slower))
+        fewer = _change(before["rps"], after["rps"])
+        if -fewer > threshold:
+            found.append((name, "rps", fewer))
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    print(f"baseline {baseline['meta'].get('git_commit')} {baseline['meta'].get('timestamp')}")
+    print(f"current  {current['meta'].get('git_commit')} {current['meta'].get('timestamp')}")
+    print(f"{'scenario':24s} " + " ".join(f"{metric:>18s}" for metric in _METRICS))
+    for name in sorted(set(baseline["results"]) | set(current["results"])):
+        before, after = baseline["results"].get(name), current["results"].get(name)
+        if before is None or after is None:
+            print(f"{name:24s} only in {'current' if before is None else 'baseline'}")
+            continue
+        cells = [f"{after[metric]:9.2f} ({_change(before[metric], after[metric]):+6.1f}%)" for metric in _METRICS]
+        print(f"{name:24s} " + " ".join(f"{cell:>18s}" for cell in cells))
+
+    found = regressions(baseline, current, args.threshold)
+    for name, metric, change in found:
+        print(f"REGRESSION {name} {metric} {change:+.1f}%")
+    sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
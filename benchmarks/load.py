@@ -0,0 +1,319 @@
+"""In-process load driver: every endpoint scenario against the real ASGI app, reporting latency
+percentiles and throughput.
+
+Requests go straight to the ASGI app (no sockets, no HTTP parsing), so the figures measure the
+application, its database access and the threadpool, not uvicorn. Each scenario first sends
+--warmup requests that are not recorded, then --requests requests from --concurrency concurrent
+clients; login and register send a tenth as many because each one is a full PBKDF2 derivation, and
+export a fiftieth because each one streams the whole table. Every request comes from its own client
+address so the per-IP login rate limit does not turn logins into 429s.
+
+delete_customer removes customers that the read and update scenarios never pick, and logout revokes
+a token minted for that request, so neither disturbs the other scenarios or the driver's session.
+The stream endpoint (GET /api/customers/stream) is left out: it is an open-ended SSE connection with
+no request latency to measure.
+
+The database is seeded with benchmarks.seed: a temporary SQLite file by default (an in-memory
+database is a single connection shared by all threads, which concurrent writes corrupt), or --url. An
+existing database that already has customers is used as is (seed it once with benchmarks.seed for
+large runs). Results can be written as JSON with --output and compared with benchmarks.compare.
+
+Usage: python -m benchmarks.load [--url URL] [--customers N] [--users N] [--requests N]
+       [--concurrency N] [--warmup N] [--scenarios a,b,...] [--output FILE]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from benchmarks.common import asgi_request, benchmark_client, engine_for
+from benchmarks.seed import BENCH_PASSWORD, employee_ids, seed_database
+from cm_customer_svc.models import Customer, User
+from cm_customer_svc.utils.jwt_utils import create_access_token
+
+_JSON_HEADERS = ((b"content-type", b"application/json"),)
+
+# (method, path, query, JSON body or None) for one request
+Request = Tuple[str, str, str, Optional[Dict[str, Any]]]
+
+
+@dataclass
+class Fixture:
+    """Seeded values the scenarios draw from."""
+
+    employee_ids: List[str]
+    customer_ids: List[str]
+    phone_numbers: List[str]
+    rng: random.Random
+    # customers outside customer_ids, consumed by delete_customer
+    deletable_ids: List[str] = field(default_factory=list)
+    # next employee id for register; above any id a previous run registered
+    next_employee_id: int = 70000000
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: Callable[[Fixture], Request]
+    expected: int
+    # fraction of --requests this scenario sends
+    share: float = 1.0
+    # cookies for one request instead of the driver's session, built before the timer starts
+    cookies: Optional[Callable[[Fixture], Dict[str, str]]] = None
+
+
+def _login(f: Fixture) -> Request:
+    return "POST", "/api/auth/login", "", {"employee_id": f.rng.choice(f.employee_ids), "password": BENCH_PASSWORD}
+
+
+def _create_customer(f: Fixture) -> Request:
+    n = f.rng.randrange(10000000)
+    return "POST", "/api/customers", "", {"customer_name": f"Load Test {n}", "customer_contact": f"+1 (555) {n:07d}", "customer_address": "1 Bench Street"}
+
+
+def _list_customers(f: Fixture) -> Request:
+    return "GET", "/api/customers", f"page={f.rng.randint(1, 50)}&page_size=20", None
+
+
+def _get_customer(f: Fixture) -> Request:
+    return "GET", f"/api/customers/{f.rng.choice(f.customer_ids)}", "", None
+
+
+def _update_customer(f: Fixture) -> Request:
+    return "PUT", f"/api/customers/{f.rng.choice(f.customer_ids)}", "", {"customer_address": f"{f.rng.randint(1, 999)} Updated Road"}
+
+
+def _batch_get(f: Fixture) -> Request:
+    return "POST", "/api/customers:batchGet", "", {"ids": f.rng.sample(f.customer_ids, min(20, len(f.customer_ids)))}
+
+
+def _search(f: Fixture) -> Request:
+    return "GET", "/api/customers/search", f"q={f.rng.choice(['wonka', 'harbor', 'tyrell prime', 'acme'])}", None
+
+
+def _by_phone(f: Fixture) -> Request:
+    return "GET", f"/api/customers/by-phone/{f.rng.choice(f.phone_numbers)}", "", None
+
+
+def _me(f: Fixture) -> Request:
+    return "GET", "/api/users/me", "", None
+
+
+def _batch_create(f: Fixture) -> Request:
+    items = [{"customer_name": f"Load Batch {f.rng.randrange(10000000)}", "customer_address": "2 Bench Street"} for _ in range(20)]
+    return "POST", "/api/customers:batch", "", {"items": items}
+
+
+def _delete_customer(f: Fixture) -> Request:
+    # an exhausted pool deletes a missing id, which is counted as an error (404)
+    pk = f.deletable_ids.pop() if f.deletable_ids else str(uuid.uuid4())
+    return "DELETE", f"/api/customers/{pk}", "", None
+
+
+def _export(f: Fixture) -> Request:
+    return "GET", "/api/customers/export", f"format={f.rng.choice(['ndjson', 'csv'])}", None
+
+
+def _changes(f: Fixture) -> Request:
+    return "GET", "/api/customers/changes", "limit=100", None
+
+
+def _register(f: Fixture) -> Request:
+    employee_id = f"{f.next_employee_id:08d}"
+    f.next_employee_id += 1
+    return "POST", "/api/register", "", {"employee_id": employee_id, "employee_name": "Load Test", "password": BENCH_PASSWORD}
+
+
+def _logout(f: Fixture) -> Request:
+    return "POST", "/api/auth/logout", "", None
+
+
+def _own_session(f: Fixture) -> Dict[str, str]:
+    return {"access_token": create_access_token({"sub": f.rng.choice(f.employee_ids)})}
+
+
+SCENARIOS = (
+    Scenario("login", _login, 200, share=0.1),
+    Scenario("create_customer", _create_customer, 201),
+    Scenario("get_all_customers", _list_customers, 200),
+    Scenario("get_customer", _get_customer, 200),
+    Scenario("update_customer", _update_customer, 200),
+    Scenario("batch_get_customers", _batch_get, 200),
+    Scenario("search_customers", _search, 200),
+    Scenario("get_customers_by_phone", _by_phone, 200),
+    Scenario("me", _me, 200),
+    Scenario("batch_create_customers", _batch_create, 200, share=0.2),
+    Scenario("get_customer_changes", _changes, 200),
+    Scenario("export_customers", _export, 200, share=0.02),
+    Scenario("register", _register, 201, share=0.1),
+    Scenario("logout", _logout, 200, cookies=_own_session),
+    Scenario("delete_customer", _delete_customer, 204),
+)
+
+
+def latency_summary(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """requests, errors, req/s and mean/p50/p95/p99/max latency in milliseconds."""
+    ordered = sorted(latencies)
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(cuts[49] * 1000, 3) if ordered else 0.0,
+        "p95_ms": round(cuts[94] * 1000, 3) if ordered else 0.0,
+        "p99_ms": round(cuts[98] * 1000, 3) if ordered else 0.0,
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+async def _drive(client, scenario: Scenario, fixture: Fixture, requests: int, concurrency: int) -> Tuple[List[float], int]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, path, query, payload = scenario.build(fixture)
+            body = json.dumps(payload).encode() if payload is not None else b""
+            host = f"10.{remaining >> 16 & 255}.{remaining >> 8 & 255}.{remaining & 255}"
+            cookies = scenario.cookies(fixture) if scenario.cookies is not None else None
+            start = time.perf_counter()
+            status = await asgi_request(
+                client, method, path, query, body, headers=_JSON_HEADERS if payload is not None else (), client_host=host, cookies=cookies
+            )
+            latencies.append(time.perf_counter() - start)
+            if status != scenario.expected:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    return latencies, errors
+
+
+def run_scenario(client, scenario: Scenario, fixture: Fixture, requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    count = max(int(requests * scenario.share), 1)
+    if warmup:
+        asyncio.run(_drive(client, scenario, fixture, max(int(warmup * scenario.share), 1), concurrency))
+    start = time.perf_counter()
+    latencies, errors = asyncio.run(_drive(client, scenario, fixture, count, concurrency))
+    return latency_summary(latencies, errors, time.perf_counter() - start)
+
+
+def _fixture(engine, seed: int) -> Fixture:
+    with engine.connect() as conn:
+        users = conn.execute(select(User.employee_id).where(User.employee_id.in_(employee_ids(100)))).scalars().all()
+        rows = conn.execute(
+            select(Customer.customer_id, Customer.customer_contact).order_by(Customer.created_at, Customer.customer_id).limit(1000)
+        ).all()
+        deletable = conn.execute(
+            select(Customer.customer_id).order_by(Customer.created_at, Customer.customer_id).offset(1000).limit(5000)
+        ).scalars().all()
+        last_registered = conn.execute(select(func.max(User.employee_id)).where(User.employee_id.like("7%"))).scalar()
+    if not users or not rows:
+        raise SystemExit("database has no seeded users/customers; run python -m benchmarks.seed first")
+    return Fixture(
+        employee_ids=list(users),
+        customer_ids=[str(row.customer_id) for row in rows],
+        phone_numbers=[row.customer_contact for row in rows if row.customer_contact] or ["+15550000000"],
+        rng=random.Random(seed),
+        deletable_ids=[str(pk) for pk in deletable],
+        next_employee_id=int(last_registered) + 1 if last_registered else 70000000,
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run(url: str, selected, args) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Seed url if it is empty, then run the selected scenarios; returns (results, seed summary)."""
+    engine = engine_for(url)
+    seeded = None
+    with engine.connect() as conn:
+        has_rows = engine.dialect.has_table(conn, "customers") and conn.execute(select(func.count()).select_from(Customer)).scalar()
+    if not has_rows:
+        seeded = seed_database(engine, args.customers, args.users, seed=args.seed, index=True)
+        print(f"seeded {seeded['users']} users, {seeded['customers']} customers in {seeded['seed_seconds'] + seeded['index_seconds']:.1f} s")
+    fixture = _fixture(engine, args.seed)
+
+    results: Dict[str, Any] = {}
+    with benchmark_client(engine=engine) as client:
+        r = client.post("/api/auth/login", json={"employee_id": fixture.employee_ids[0], "password": BENCH_PASSWORD})
+        assert r.status_code == 200, r.text
+        print(f"{'scenario':24s} {'requests':>8s} {'errors':>6s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+        for scenario in selected:
+            summary = results[scenario.name] = run_scenario(client, scenario, fixture, args.requests, args.concurrency, args.warmup)
+            print(
+                f"{scenario.name:24s} {summary['requests']:8d} {summary['errors']:6d} {summary['rps']:8.1f} "
+                f"{summary['p50_ms']:8.2f} {summary['p95_ms']:8.2f} {summary['p99_ms']:8.2f}"
+            )
+    engine.dispose()
+    return results, seeded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL (default: a temporary SQLite file)")
+    parser.add_argument("--customers", type=int, default=10000, help="customers to seed into an empty database")
+    parser.add_argument("--users", type=int, default=100, help="users to seed into an empty database")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", help="comma-separated subset of: " + ", ".join(s.name for s in SCENARIOS))
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    selected = SCENARIOS
+    if args.scenarios:
+        wanted = args.scenarios.split(",")
+        unknown = set(wanted) - {s.name for s in SCENARIOS}
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        selected = tuple(s for s in SCENARIOS if s.name in wanted)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        results, seeded = _run(url, selected, args)
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "git_commit": _git_commit(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "database": args.url or "temporary sqlite file",
+                "seeded": seeded,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "warmup": args.warmup,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
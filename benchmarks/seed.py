@@ -0,0 +1,157 @@
+"""Bulk-load users and customers for benchmarks with Core executemany inserts (no HTTP).
+
+Every user gets the same password (BENCH_PASSWORD unless --password), hashed once up front, so a
+million users cost one PBKDF2 call instead of a million. Employee ids run 90000001, 90000002, ...
+Customers are spread round-robin over the users, with realistic names, addresses and phone numbers
+(customer_contact_digits filled in as the API would) and created_at/updated_at one second apart, so
+keyset pages and filters see a spread of values. The data is deterministic for a given --seed.
+
+On SQLite the inserts run with synchronous=OFF and a memory journal; that is only for the load and
+reverts when the connection closes.
+
+Usage: python -m benchmarks.seed --url sqlite:///bench.db [--customers N] [--users N] [--batch-size N] [--seed N] [--index]
+"""
+import argparse
+import itertools
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import Connection, Engine, insert, select, text
+from sqlalchemy.orm import Session
+
+from benchmarks.common import engine_for
+from cm_customer_svc.config import PHONE_DEFAULT_COUNTRY_CODE
+from cm_customer_svc.models import Customer, User
+from cm_customer_svc.models.base import Base
+from cm_customer_svc.utils.password_utils import hash_password
+from cm_customer_svc.utils.search_index import rebuild_search_index
+from cm_customer_svc.utils.validation_utils import normalize_phone_digits
+
+BENCH_PASSWORD = "Password123"
+FIRST_EMPLOYEE_ID = 90000001
+
+_WORDS = ["acme", "globex", "initech", "umbrella", "stark", "wayne", "wonka", "tyrell", "cyberdyne", "soylent",
+          "hooli", "vandelay", "oscorp", "gringotts", "monarch", "aperture", "massive", "dynamic", "prime", "north"]
+_STREETS = ["Harbor Road", "Main Street", "Oak Avenue", "Mill Lane", "Station Road", "Park Way"]
+_EPOCH = datetime(2024, 1, 1)
+
+
+def employee_ids(users: int) -> List[str]:
+    """Employee ids of the first `users` seeded users."""
+    return [f"{FIRST_EMPLOYEE_ID + i:08d}" for i in range(users)]
+
+
+def _user_rows(users: int, password_hash: str) -> Iterator[Dict[str, Any]]:
+    for i, employee_id in enumerate(employee_ids(users)):
+        yield {"employee_id": employee_id, "employee_name": f"Bench User {i + 1}", "password_hash": password_hash}
+
+
+def _customer_rows(customers: int, managers: List[str], seed: int) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    names = [f"{first.title()} {second.title()}" for first in _WORDS for second in _WORDS]
+    addresses = [f"{number} {street}" for number in range(1, 1000) for street in _STREETS]
+    # every seeded number has the same "+1 (555)" prefix, so its digits only need computing once
+    prefix_digits = normalize_phone_digits("+1 (555) ", PHONE_DEFAULT_COUNTRY_CODE)
+    for i in range(customers):
+        # one draw per row: 128 bits for the id, the low bits reused to pick name, address and phone
+        bits = rng.getrandbits(128)
+        number = f"{bits % 10000000:07d}"
+        created = _EPOCH + timedelta(seconds=i)
+        yield {
+            "customer_id": uuid.UUID(int=bits, version=4),
+            "customer_name": f"{names[(bits >> 24) % len(names)]} {i}",
+            "customer_contact": f"+1 (555) {number}" if i % 10 else None,
+            "customer_contact_digits": prefix_digits + number if i % 10 else None,
+            "customer_address": addresses[(bits >> 40) % len(addresses)],
+            "managed_by": managers[i % len(managers)],
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def _insert_batches(conn: Connection, table, rows: Iterator[Dict[str, Any]], batch_size: int) -> int:
+    written = 0
+    while batch := list(itertools.islice(rows, batch_size)):
+        conn.execute(insert(table), batch)
+        written += len(batch)
+    return written
+
+
+def _is_populated(conn: Connection) -> bool:
+    return conn.execute(select(Customer.customer_id).limit(1)).first() is not None
+
+
+def seed_database(
+    engine: Engine,
+    customers: int = 10000,
+    users: int = 100,
+    password: str = BENCH_PASSWORD,
+    batch_size: int = 10000,
+    seed: int = 42,
+    index: bool = False,
+) -> Dict[str, Any]:
+    """Create the schema if needed and insert users then customers; returns counts and timings.
+
+    index=True also rebuilds the search index (GET /api/customers/search) over the seeded rows.
+    """
+    Base.metadata.create_all(engine)
+    started = time.perf_counter()
+    password_hash = hash_password(password)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.exec_driver_sql("PRAGMA journal_mode=MEMORY")
+        user_count = _insert_batches(conn, User.__table__, _user_rows(users, password_hash), batch_size)
+        # building the secondary indexes once after the load is much cheaper than maintaining them per row
+        secondary = [] if _is_populated(conn) else list(Customer.__table__.indexes)
+        for table_index in secondary:
+            table_index.drop(conn)
+        customer_count = _insert_batches(conn, Customer.__table__, _customer_rows(customers, employee_ids(users), seed), batch_size)
+        for table_index in secondary:
+            table_index.create(conn)
+    seeded = time.perf_counter()
+
+    indexed = 0
+    if index:
+        with Session(engine) as session:
+            indexed = rebuild_search_index(session)
+            session.commit()
+    return {
+        "users": user_count,
+        "customers": customer_count,
+        "indexed": indexed,
+        "seed_seconds": seeded - started,
+        "index_seconds": time.perf_counter() - seeded,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", required=True, help="SQLAlchemy database URL, e.g. sqlite:///bench.db")
+    parser.add_argument("--customers", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--index", action="store_true", help="also rebuild the search index")
+    args = parser.parse_args()
+
+    engine = engine_for(args.url)
+    with engine.connect() as conn:
+        existing = conn.execute(text("SELECT count(*) FROM users")).scalar() if engine.dialect.has_table(conn, "users") else 0
+    if existing:
+        parser.error(f"{args.url} already has {existing} users; seed an empty database")
+    result = seed_database(engine, args.customers, args.users, args.password, args.batch_size, args.seed, args.index)
+    engine.dispose()
+    rate = result["customers"] / result["seed_seconds"] if result["seed_seconds"] else 0.0
+    print(
+        f"users={result['users']} customers={result['customers']} in {result['seed_seconds']:.1f} s ({rate:,.0f} customers/s)"
+        + (f", indexed {result['indexed']} in {result['index_seconds']:.1f} s" if args.index else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""pytest-benchmark microbenchmarks of the per-request building blocks: input validation, password
+hashing, JWT encode/decode and customer serialization.
+
+Not part of the test suite (pytest's testpaths is tests/); run them explicitly, e.g.
+
+    pytest benchmarks --benchmark-only --benchmark-autosave
+    pytest benchmarks --benchmark-only --benchmark-compare
+
+which stores each run as JSON under .benchmarks/ and compares against the previous one. Skipped
+when pytest-benchmark is not installed.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sqlalchemy import select  # noqa: E402
+
+from benchmarks.common import memory_engine  # noqa: E402
+from benchmarks.seed import seed_database  # noqa: E402
+from cm_customer_svc.schemas.customer import CustomerCreate  # noqa: E402
+from cm_customer_svc.utils.jwt_utils import (  # noqa: E402
+    create_access_token,
+    decode_access_token,
+    decode_access_token_cached,
+)
+from cm_customer_svc.utils.password_utils import hash_password, verify_password  # noqa: E402
+from cm_customer_svc.utils.serialization import CUSTOMER_COLUMNS, CustomerJSONResponse, customer_row_dicts  # noqa: E402
+from cm_customer_svc.utils.validation_utils import (  # noqa: E402
+    sanitize_input,
+    validate_employee_id_format,
+    validate_password_strength,
+    validate_phone_number_format,
+)
+
+PAGE_SIZE = 100
+
+
+@pytest.fixture(scope="module")
+def customer_rows():
+    engine = memory_engine()
+    seed_database(engine, customers=PAGE_SIZE, users=1)
+    with engine.connect() as conn:
+        rows = conn.execute(select(*CUSTOMER_COLUMNS)).all()
+    engine.dispose()
+    return rows
+
+
+@pytest.fixture(scope="module")
+def password_hash():
+    return hash_password("Password123")
+
+
+@pytest.fixture(scope="module")
+def token():
+    return create_access_token({"sub": "90000001"})
+
+
+def test_validate_password_strength(benchmark):
+    assert benchmark(validate_password_strength, "Password123") == "Password123"
+
+
+def test_validate_employee_id_format(benchmark):
+    assert benchmark(validate_employee_id_format, " 90000001 ") == "90000001"
+
+
+def test_validate_phone_number_format(benchmark):
+    assert benchmark(validate_phone_number_format, "+1 (555)  010-0199") == "+1 (555) 010-0199"
+
+
+def test_sanitize_input(benchmark):
+    assert benchmark(sanitize_input, "  Acme <b>Corp</b>\t Ltd ") == "Acme &lt;b&gt;Corp&lt;/b&gt; Ltd"
+
+
+def test_customer_create_validation(benchmark):
+    payload = {"customer_name": "Acme Corp", "customer_contact": "+1 (555) 010-0199", "customer_address": "1 Harbor Road"}
+    assert benchmark(CustomerCreate.model_validate, payload).customer_name == "Acme Corp"
+
+
+def test_hash_password(benchmark):
+    # one PBKDF2 derivation per call; a few rounds are plenty
+    assert benchmark.pedantic(hash_password, args=("Password123",), rounds=5, iterations=1).startswith("$pbkdf2")
+
+
+def test_verify_password(benchmark, password_hash):
+    assert benchmark.pedantic(verify_password, args=("Password123", password_hash), rounds=5, iterations=1)
+
+
+def test_create_access_token(benchmark):
+    assert benchmark(create_access_token, {"sub": "90000001"})
+
+
+def test_decode_access_token(benchmark, token):
+    assert benchmark(decode_access_token, token)["sub"] == "90000001"
+
+
+def test_decode_access_token_cached(benchmark, token):
+    decode_access_token_cached(token)
+    assert benchmark(decode_access_token_cached, token)["sub"] == "90000001"
+
+
+def test_serialize_customer_page(benchmark, customer_rows):
+    def serialize() -> bytes:
+        content = {"total_count": None, "page": 1, "page_size": PAGE_SIZE, "items": customer_row_dicts(customer_rows), "next_cursor": None}
+        return CustomerJSONResponse(content).body
+
+    assert benchmark(serialize).startswith(b'{"total_count"')
@@ -0,0 +1,26 @@
+"""Add composite (created_at, customer_id) index for keyset pagination
+
+Revision ID: 3b7e2c9d41a0
+Revises: 0f5a3fbf9d5c
+Create Date: 2026-10-17 09:12:04.118523
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e2c9d41a0'
+down_revision: Union[str, None] = '0f5a3fbf9d5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_customer_created_at_customer_id', 'customers', ['created_at', 'customer_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_customer_created_at_customer_id', table_name='customers')
@@ -0,0 +1,30 @@
+"""Add indexes backing the customer listing filters and sorts
+
+Revision ID: 5d2e9a7c3f18
+Revises: 8c41f0a2d7e5
+Create Date: 2026-10-17 14:05:37.402915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e9a7c3f18'
+down_revision: Union[str, None] = '8c41f0a2d7e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_customer_managed_by_created_at', 'customers', ['managed_by', 'created_at', 'customer_id'], unique=False)
+    op.create_index('idx_customer_updated_at_customer_id', 'customers', ['updated_at', 'customer_id'], unique=False)
+    op.create_index('idx_customer_name_customer_id', 'customers', ['customer_name', 'customer_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_customer_name_customer_id', table_name='customers')
+    op.drop_index('idx_customer_updated_at_customer_id', table_name='customers')
+    op.drop_index('idx_customer_managed_by_created_at', table_name='customers')
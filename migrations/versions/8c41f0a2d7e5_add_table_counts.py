@@ -0,0 +1,32 @@
+"""Add table_counts row counter table
+
+Revision ID: 8c41f0a2d7e5
+Revises: 3b7e2c9d41a0
+Create Date: 2026-10-17 10:03:41.602115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41f0a2d7e5'
+down_revision: Union[str, None] = '3b7e2c9d41a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('table_counts',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    # seed the customers counter so the API only has to maintain it from here on
+    op.execute("INSERT INTO table_counts (table_name, row_count) SELECT 'customers', COUNT(*) FROM customers")
+
+
+def downgrade() -> None:
+    op.drop_table('table_counts')
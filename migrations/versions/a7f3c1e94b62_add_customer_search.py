@@ -0,0 +1,70 @@
+"""Add customer search: FTS5 table on SQLite, pg_trgm indexes on PostgreSQL
+
+Revision ID: a7f3c1e94b62
+Revises: 5d2e9a7c3f18
+Create Date: 2026-10-18 09:41:12.530871
+
+"""
+import re
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7f3c1e94b62'
+down_revision: Union[str, None] = '5d2e9a7c3f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH_SIZE = 1000
+
+
+def _backfill_sqlite(bind) -> None:
+    search = sa.table('customer_search', sa.column('rowid'), sa.column('customer_id'), sa.column('customer_name'),
+                      sa.column('customer_address'), sa.column('contact_digits'))
+    result = bind.execution_options(yield_per=_BATCH_SIZE).execute(
+        sa.text("SELECT customer_id, customer_name, customer_address, customer_contact FROM customers")
+    )
+    for rows in result.partitions():
+        documents = []
+        for customer_id, name, address, contact in rows:
+            pk = uuid.UUID(hex=customer_id)
+            documents.append({
+                'rowid': int.from_bytes(pk.bytes[:8], 'big', signed=True),
+                'customer_id': pk.hex,
+                'customer_name': name,
+                'customer_address': address or '',
+                'contact_digits': re.sub(r'\D', '', contact or ''),
+            })
+        bind.execute(sa.insert(search), documents)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS customer_search USING fts5("
+            "customer_id UNINDEXED, customer_name, customer_address, contact_digits, tokenize='trigram')"
+        )
+        _backfill_sqlite(bind)
+    elif bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX idx_customer_name_trgm ON customers USING gin (customer_name gin_trgm_ops)")
+        op.execute("CREATE INDEX idx_customer_address_trgm ON customers USING gin ((coalesce(customer_address, '')) gin_trgm_ops)")
+        op.execute(
+            "CREATE INDEX idx_customer_contact_digits_trgm ON customers "
+            "USING gin ((regexp_replace(coalesce(customer_contact, ''), '\\D', '', 'g')) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS customer_search")
+    elif bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_customer_contact_digits_trgm")
+        op.execute("DROP INDEX IF EXISTS idx_customer_address_trgm")
+        op.execute("DROP INDEX IF EXISTS idx_customer_name_trgm")
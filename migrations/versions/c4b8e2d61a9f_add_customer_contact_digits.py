@@ -0,0 +1,86 @@
+"""Add normalized customer_contact_digits column with index and backfill it in batches
+
+Revision ID: c4b8e2d61a9f
+Revises: a7f3c1e94b62
+Create Date: 2026-10-18 11:26:48.071354
+
+"""
+import os
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4b8e2d61a9f'
+down_revision: Union[str, None] = 'a7f3c1e94b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH_SIZE = 1000
+
+
+def _normalize(contact, default_country_code):
+    # same rules as utils.validation_utils.normalize_phone_digits / is_valid_phone_digits at the time
+    # of this revision; contacts that do not fit E.164 with the country code stay unindexed
+    if contact is None:
+        return None
+    s = contact.strip()
+    digits = re.sub(r'\D', '', s)
+    if not digits:
+        return None
+    if s.startswith('00'):
+        digits = digits[2:]
+    elif not s.startswith('+') and default_country_code:
+        cc = default_country_code
+        if cc == '1':
+            # NANP: code plus a 10-digit national number, the "1" trunk prefix being the code itself
+            if not (len(digits) == 11 and digits.startswith('1')):
+                digits = cc + digits
+        elif digits.startswith('0'):
+            # drop the trunk prefix
+            digits = cc + digits[1:]
+        elif not (digits.startswith(cc) and len(digits) - len(cc) >= 7):
+            digits = cc + digits
+    return digits if 7 <= len(digits) <= 15 else None
+
+
+def _backfill(bind) -> None:
+    default_country_code = os.getenv('PHONE_DEFAULT_COUNTRY_CODE', '')
+    customers = sa.table('customers', sa.column('customer_id'), sa.column('customer_contact'), sa.column('customer_contact_digits'))
+    # keyset over the primary key, so each batch is an index range scan and no batch re-reads earlier rows
+    select_batch = (
+        sa.select(customers.c.customer_id, customers.c.customer_contact)
+        .where(customers.c.customer_contact.isnot(None))
+        .where(customers.c.customer_id > sa.bindparam('after'))
+        .order_by(customers.c.customer_id)
+        .limit(_BATCH_SIZE)
+    )
+    update_row = (
+        sa.update(customers)
+        .where(customers.c.customer_id == sa.bindparam('pk'))
+        .values(customer_contact_digits=sa.bindparam('digits'))
+    )
+    first = (
+        sa.select(customers.c.customer_id, customers.c.customer_contact)
+        .where(customers.c.customer_contact.isnot(None))
+        .order_by(customers.c.customer_id)
+        .limit(_BATCH_SIZE)
+    )
+    rows = bind.execute(first).all()
+    while rows:
+        bind.execute(update_row, [{'pk': pk, 'digits': _normalize(contact, default_country_code)} for pk, contact in rows])
+        rows = bind.execute(select_batch, {'after': rows[-1][0]}).all()
+
+
+def upgrade() -> None:
+    op.add_column('customers', sa.Column('customer_contact_digits', sa.String(length=15), nullable=True))
+    op.create_index('idx_customer_contact_digits', 'customers', ['customer_contact_digits'], unique=False)
+    _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    op.drop_index('idx_customer_contact_digits', table_name='customers')
+    op.drop_column('customers', 'customer_contact_digits')
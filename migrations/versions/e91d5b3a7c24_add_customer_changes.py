@@ -0,0 +1,39 @@
+"""Add customer_changes changelog for the incremental change feed
+
+Revision ID: e91d5b3a7c24
+Revises: c4b8e2d61a9f
+Create Date: 2026-10-18 13:52:09.664120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91d5b3a7c24'
+down_revision: Union[str, None] = 'c4b8e2d61a9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('customer_changes',
+    sa.Column('seq', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('customer_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('op', sa.String(length=8), nullable=False),
+    sa.Column('changed_at', sa.DateTime().with_variant(sqlite.DATETIME(truncate_microseconds=True), 'sqlite'), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
+    # one upsert per existing customer, oldest change first, so a consumer starting from the
+    # beginning of the feed receives the full table
+    op.execute(
+        "INSERT INTO customer_changes (customer_id, op, changed_at) "
+        "SELECT customer_id, 'upsert', updated_at FROM customers ORDER BY updated_at, customer_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('customer_changes')
@@ -0,0 +1,30 @@
+"""Use the C collation for customers.customer_name on PostgreSQL
+
+Revision ID: f2a6c9d4b817
+Revises: e91d5b3a7c24
+Create Date: 2026-10-18 16:04:37.218409
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c9d4b817'
+down_revision: Union[str, None] = 'e91d5b3a7c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the name_prefix filter is a half-open range that only matches exactly the prefixed names under
+    # code point order; SQLite's default BINARY collation already compares that way. PostgreSQL
+    # rebuilds idx_customer_name_customer_id (and the trigram index) with the new collation.
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE customers ALTER COLUMN customer_name TYPE varchar COLLATE "C"')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE customers ALTER COLUMN customer_name TYPE varchar COLLATE "default"')
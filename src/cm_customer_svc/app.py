@@ -1,23 +1,59 @@
 import logging
 import os
 import sys
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from dataclasses import dataclass
+from typing import Optional
 
+from fastapi import APIRouter, FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cm_customer_svc.config import APP_ENV, DB_ASYNC, METRICS_ENABLED, SERVER_TIMING_ENABLED
 from cm_customer_svc.routers.auth import auth_router
+from cm_customer_svc.routers.async_auth import async_auth_router
 from cm_customer_svc.routers.users import users_router
+from cm_customer_svc.routers.admin import admin_router
 from cm_customer_svc.routers.registration import registration_router
 from cm_customer_svc.routers.customers import customers_router
+from cm_customer_svc.routers.async_customers import async_customers_router
+from cm_customer_svc.routers.metrics import metrics_router
+from cm_customer_svc.utils.hashing_service import password_hasher
+from cm_customer_svc.utils.metrics import instrument_routes
+from cm_customer_svc.utils.server_timing import ServerTimingMiddleware
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(debug=True)
 
-# register routers
-app.include_router(auth_router, prefix="/api/auth")
-app.include_router(users_router, prefix="/api/users")
-app.include_router(registration_router, prefix="/api")
-app.include_router(customers_router, prefix="/api")
+def _overlay_router(primary: APIRouter, fallback: APIRouter) -> APIRouter:
+    """Return fallback's routes with any route that primary also defines replaced by primary's.
+
+    Fallback's order is kept so literal paths such as /customers/export still match before
+    /customers/{customer_id}.
+    """
+    overrides = {(route.path, frozenset(route.methods)): route for route in primary.routes}
+    merged = APIRouter()
+    for route in fallback.routes:
+        merged.routes.append(overrides.pop((route.path, frozenset(route.methods)), route))
+    merged.routes.extend(overrides.values())
+    return merged
+
+
+def register_routers(app: FastAPI, async_db: bool = DB_ASYNC) -> None:
+    """Mount the API routers.
+
+    With async_db the async customer/auth handlers replace their sync counterparts; endpoints that
+    only exist in the sync routers (bulk create, export, logout) are still served from those.
+    """
+    if async_db:
+        app.include_router(_overlay_router(async_auth_router, auth_router), prefix="/api/auth")
+    else:
+        app.include_router(auth_router, prefix="/api/auth")
+    app.include_router(users_router, prefix="/api/users")
+    app.include_router(admin_router, prefix="/api/admin")
+    app.include_router(registration_router, prefix="/api")
+    if async_db:
+        app.include_router(_overlay_router(async_customers_router, customers_router), prefix="/api")
+    else:
+        app.include_router(customers_router, prefix="/api")
 
 
 def _is_running_under_pytest() -> bool:
@@ -33,38 +69,106 @@ def _is_running_under_pytest() -> bool:
     return False
 
 
-class _TestCookieMiddleware(BaseHTTPMiddleware):
-    """During pytest, append a non-secure duplicate Set-Cookie when a secure cookie is present.
+class _TestCookieMiddleware:
+    """Append a non-secure duplicate Set-Cookie when a secure access_token cookie is set.
 
     This preserves the original secure Set-Cookie header (so security assertions still pass)
     while enabling TestClient (which runs over http) to return the cookie in subsequent requests.
-    The middleware only runs when pytest is detected to avoid changing runtime behavior.
+    Only the "test" profile installs it. It is a plain ASGI middleware so the response body is
+    passed through untouched.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        try:
-            if not _is_running_under_pytest():
-                return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-            sc = response.headers.get("set-cookie")
-            if not sc:
-                return response
+        async def send_with_test_cookies(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                try:
+                    message["headers"] = _with_insecure_cookie_copies(message.get("headers", []))
+                except Exception as e:
+                    logger.error("Test cookie middleware error", exc_info=True)
+            await send(message)
 
-            # Only act on access token style cookies; avoid touching unrelated cookies
-            if "access_token=" in sc and "secure" in sc.lower():
-                # Build a non-secure duplicate by removing the Secure attribute
-                non_secure = sc.replace("; Secure", "").replace("; secure", "")
-                # Append duplicate header; preserve original secure header
-                response.headers.append("set-cookie", non_secure)
+        await self.app(scope, receive, send_with_test_cookies)
 
-        except Exception as e:
-            logger.error("Test cookie middleware error", exc_info=True)
 
-        return response
+def _with_insecure_cookie_copies(headers):
+    headers = list(headers)
+    for name, value in list(headers):
+        if name.lower() != b"set-cookie":
+            continue
+        cookie = value.decode("latin-1")
+        # Only act on access token style cookies; avoid touching unrelated cookies
+        if "access_token=" in cookie and "secure" in cookie.lower():
+            non_secure = cookie.replace("; Secure", "").replace("; secure", "")
+            headers.append((name, non_secure.encode("latin-1")))
+    return headers
 
 
-# Add middleware to support TestClient cookie round-trip only when running tests
-if _is_running_under_pytest():
-    app.add_middleware(_TestCookieMiddleware)
+@dataclass(frozen=True)
+class AppSettings:
+    """Options create_app builds the application from; see PROFILES."""
+
+    env: str = "production"
+    debug: bool = False
+    test_cookies: bool = False
+    async_db: bool = DB_ASYNC
+    metrics: bool = METRICS_ENABLED
+    server_timing: bool = SERVER_TIMING_ENABLED
+
+
+PROFILES = {
+    # no debug tracebacks and no test-only middleware; only plain ASGI middleware on the request path
+    "production": AppSettings(env="production"),
+    "development": AppSettings(env="development", debug=True),
+    # TestClient talks plain http, so secure session cookies need a non-secure copy
+    "test": AppSettings(env="test", debug=True, test_cookies=True),
+}
+
+
+def settings_for(env: Optional[str] = None) -> AppSettings:
+    """AppSettings for a profile name (default APP_ENV).
+
+    An empty name picks "test" under pytest and "production" otherwise; pytest detection runs here,
+    once, not per request. Unknown names are logged and fall back to "production".
+    """
+    name = (APP_ENV if env is None else env).strip().lower()
+    if not name:
+        name = "test" if _is_running_under_pytest() else "production"
+    if name not in PROFILES:
+        logger.error("unknown APP_ENV profile %r, using production", name)
+        name = "production"
+    return PROFILES[name]
+
+
+def create_app(settings: Optional[AppSettings] = None) -> FastAPI:
+    """Build the application for settings (default: the APP_ENV profile)."""
+    settings = settings or settings_for()
+    application = FastAPI(debug=settings.debug)
+    register_routers(application, async_db=settings.async_db)
+    if settings.metrics:
+        application.include_router(metrics_router)
+        # after every router is included: wrapped routes record latency under their path template
+        instrument_routes(application)
+    application.router.add_event_handler("startup", password_hasher.start)
+    application.router.add_event_handler("shutdown", password_hasher.shutdown)
+    if settings.test_cookies:
+        application.add_middleware(_TestCookieMiddleware)
+    if settings.server_timing:
+        application.add_middleware(ServerTimingMiddleware)
+    application.state.settings = settings
+    return application
+
+
+def __getattr__(name: str):
+    # the module-level app ("cm_customer_svc.app:app") is built on first access, not on import, so
+    # main() importing create_app builds the application only once
+    if name == "app":
+        application = globals()["app"] = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
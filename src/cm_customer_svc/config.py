@@ -1,4 +1,5 @@
 import os
+import sys
 import logging
 from dotenv import load_dotenv
 
@@ -35,15 +36,130 @@ def _get_env_int(name: str, default: int) -> int:
         return default
 
 
+def _default_hash_workers(app_env: str) -> int:
+    """Half the CPUs (at least one) for the production profile, 0 for development and test.
+
+    Picks the profile like app.settings_for: an empty APP_ENV means test under pytest, else production.
+    """
+    env = app_env.strip().lower()
+    if env in ("development", "test") or (not env and any("pytest" in m for m in sys.modules)):
+        return 0
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def _to_async_url(url: str) -> str:
+    """Map a sync SQLAlchemy URL to its asyncio driver equivalent (aiosqlite / asyncpg)."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    drivers = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+    if dialect in drivers:
+        return f"{drivers[dialect]}{sep}{rest}"
+    return url
+
+
 # Existing DB and service settings
 DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///:memory:")
+
+# Connection pool tuning (pool_size/max_overflow/pool_timeout are ignored for SQLite's single-connection pools)
+DB_POOL_SIZE: int = _get_env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW: int = _get_env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT: int = _get_env_int("DB_POOL_TIMEOUT", 30)
+DB_POOL_RECYCLE: int = _get_env_int("DB_POOL_RECYCLE", -1)
+DB_POOL_PRE_PING: bool = _get_env_bool("DB_POOL_PRE_PING", False)
+# Server-side statement timeout in milliseconds (PostgreSQL only); 0 disables
+DB_STATEMENT_TIMEOUT_MS: int = _get_env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+
+# Serve customer and auth handlers from the asyncio engine instead of the sync threadpool path
+DB_ASYNC: bool = _get_env_bool("DB_ASYNC", False)
+ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", _to_async_url(DATABASE_URL))
 SERVICE_PORT: int = _get_env_int("SERVICE_PORT", 8000)
 
+# Application profile used by create_app: "production", "development" or "test". Empty picks "test"
+# when pytest is loaded at import time and "production" otherwise.
+APP_ENV: str = os.getenv("APP_ENV", "")
+
+# Logging (configured by main): root level, "json" lines or "text", records buffered for the writer
+# thread before new ones are dropped, and per call site the records let through per window before
+# only one in LOG_SAMPLE_EVERY is
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE: int = _get_env_int("LOG_QUEUE_SIZE", 10000)
+LOG_RATE_LIMIT_BURST: int = _get_env_int("LOG_RATE_LIMIT_BURST", 10)
+LOG_RATE_LIMIT_WINDOW_SECONDS: int = _get_env_int("LOG_RATE_LIMIT_WINDOW_SECONDS", 60)
+LOG_SAMPLE_EVERY: int = _get_env_int("LOG_SAMPLE_EVERY", 100)
+
+# GET /metrics (Prometheus text format) with per-route latency, SQL timing and hashing/JWT timings
+METRICS_ENABLED: bool = _get_env_bool("METRICS_ENABLED", True)
+
+# Server-Timing response header with auth/db/validation/serialize phases
+SERVER_TIMING_ENABLED: bool = _get_env_bool("SERVER_TIMING_ENABLED", True)
+# Employee ids allowed to request a sampling profile of one request with ?profile=1 (comma-separated;
+# empty disables profiling), and the sampling interval
+PROFILE_EMPLOYEE_IDS: frozenset = frozenset(v.strip() for v in os.getenv("PROFILE_EMPLOYEE_IDS", "").split(",") if v.strip())
+PROFILE_SAMPLE_INTERVAL_MS: int = _get_env_int("PROFILE_SAMPLE_INTERVAL_MS", 1)
+
 # JWT and session cookie settings
 SECRET_KEY: str = os.getenv("SECRET_KEY", "super-secret-key")
 ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES: int = _get_env_int("ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24)
 
+# Verified-token cache used by get_current_user (entries also expire at the token's exp)
+JWT_CACHE_MAX_ENTRIES: int = _get_env_int("JWT_CACHE_MAX_ENTRIES", 10000)
+
+# Password hashing: PBKDF2 process pool size (0 = hash inline in the request thread; default half the
+# CPUs in production, inline in development/test) and how many more operations may wait for a worker
+# before login/register answer 429
+PASSWORD_HASH_WORKERS: int = _get_env_int("PASSWORD_HASH_WORKERS", _default_hash_workers(APP_ENV))
+PASSWORD_HASH_MAX_PENDING: int = _get_env_int("PASSWORD_HASH_MAX_PENDING", 32)
+
 SECURE_COOKIE: bool = _get_env_bool("SECURE_COOKIE", True)
 HTTP_ONLY_COOKIE: bool = _get_env_bool("HTTP_ONLY_COOKIE", True)
 SAMESITE_COOKIE: str = os.getenv("SAMESITE_COOKIE", "Lax")
+
+# Customer listing total_count options
+CUSTOMER_COUNT_CACHE_TTL_SECONDS: int = _get_env_int("CUSTOMER_COUNT_CACHE_TTL_SECONDS", 30)
+
+# Bulk customer create/get: max items (ids) per request, and rows per INSERT statement / ids per
+# IN (...) list so statements stay within driver bind-parameter limits
+CUSTOMER_BATCH_MAX_ITEMS: int = _get_env_int("CUSTOMER_BATCH_MAX_ITEMS", 1000)
+CUSTOMER_BATCH_GET_MAX_IDS: int = _get_env_int("CUSTOMER_BATCH_GET_MAX_IDS", 1000)
+CUSTOMER_BATCH_CHUNK_SIZE: int = _get_env_int("CUSTOMER_BATCH_CHUNK_SIZE", 500)
+
+# Streaming export: rows fetched from the server-side cursor per batch
+CUSTOMER_EXPORT_YIELD_PER: int = _get_env_int("CUSTOMER_EXPORT_YIELD_PER", 1000)
+
+# GET /api/customers/stream: events buffered per subscriber before it is dropped as too slow,
+# seconds between heartbeat comments, and the cap on concurrent subscribers per process
+CUSTOMER_STREAM_QUEUE_SIZE: int = _get_env_int("CUSTOMER_STREAM_QUEUE_SIZE", 100)
+CUSTOMER_STREAM_HEARTBEAT_SECONDS: int = _get_env_int("CUSTOMER_STREAM_HEARTBEAT_SECONDS", 15)
+CUSTOMER_STREAM_MAX_SUBSCRIBERS: int = _get_env_int("CUSTOMER_STREAM_MAX_SUBSCRIBERS", 1000)
+
+# Read-through cache for GET /api/customers/{customer_id}: "memory", "redis" or "none"
+CUSTOMER_CACHE_BACKEND: str = os.getenv("CUSTOMER_CACHE_BACKEND", "memory")
+CUSTOMER_CACHE_TTL_SECONDS: int = _get_env_int("CUSTOMER_CACHE_TTL_SECONDS", 60)
+CUSTOMER_CACHE_MAX_ENTRIES: int = _get_env_int("CUSTOMER_CACHE_MAX_ENTRIES", 10000)
+# Country calling code (digits only, e.g. "1") prepended to phone numbers written without "+" or
+# "00" when deriving customer_contact_digits; empty keeps such numbers as plain digits
+PHONE_DEFAULT_COUNTRY_CODE: str = os.getenv("PHONE_DEFAULT_COUNTRY_CODE", "")
+
+# Customer search backend: "auto" (FTS5 on SQLite, pg_trgm on PostgreSQL), "fts5", "postgresql" or
+# "memory" (per-process inverted index; also the fallback when the database offers neither)
+CUSTOMER_SEARCH_BACKEND: str = os.getenv("CUSTOMER_SEARCH_BACKEND", "auto")
+
+REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Login rate limiting: token buckets per client IP and per employee_id. Only failed attempts take a
+# token; an attempt is refused before any password hashing while either bucket is empty. Each bucket
+# holds up to *_BURST failures and refills at *_PER_MINUTE; 0 disables one.
+# Backend "memory" (per process, at most LOGIN_RATE_LIMIT_MAX_KEYS buckets) or "redis" (REDIS_URL)
+LOGIN_RATE_LIMIT_ENABLED: bool = _get_env_bool("LOGIN_RATE_LIMIT_ENABLED", True)
+LOGIN_RATE_LIMIT_BACKEND: str = os.getenv("LOGIN_RATE_LIMIT_BACKEND", "memory")
+LOGIN_RATE_LIMIT_MAX_KEYS: int = _get_env_int("LOGIN_RATE_LIMIT_MAX_KEYS", 100000)
+# sized for a whole office behind one NAT address mistyping passwords at shift start
+LOGIN_IP_BURST: int = _get_env_int("LOGIN_IP_BURST", 100)
+LOGIN_IP_PER_MINUTE: int = _get_env_int("LOGIN_IP_PER_MINUTE", 60)
+LOGIN_ACCOUNT_BURST: int = _get_env_int("LOGIN_ACCOUNT_BURST", 5)
+LOGIN_ACCOUNT_PER_MINUTE: int = _get_env_int("LOGIN_ACCOUNT_PER_MINUTE", 2)
+# Comma-separated proxy addresses or CIDR networks whose X-Forwarded-For is trusted for the client IP
+# (e.g. "10.0.0.0/8,127.0.0.1"); empty keys the IP bucket on the connection's peer address
+LOGIN_TRUSTED_PROXIES: str = os.getenv("LOGIN_TRUSTED_PROXIES", "")
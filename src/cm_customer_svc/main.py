@@ -1,20 +1,28 @@
 import logging
 
 import uvicorn
-from cm_customer_svc.app import app
+from cm_customer_svc.app import create_app
 from cm_customer_svc.config import SERVICE_PORT
+from cm_customer_svc.utils.logging_utils import configure_logging, stop_logging
 
 
-# Set up logging for the application
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 def main():
+    # JSON lines written by a background thread; LOG_LEVEL / LOG_FORMAT configure it
+    configure_logging()
     service_port = int(SERVICE_PORT)
-    uvicorn.run(app, host="0.0.0.0", port=service_port)
+    # APP_ENV selects the profile (production unless set)
+    app = create_app()
+    logger.info("starting with profile %s", app.state.settings.env)
+    try:
+        # log_config=None keeps uvicorn's loggers on the root handler instead of its own
+        uvicorn.run(app, host="0.0.0.0", port=service_port, log_config=None)
+    finally:
+        stop_logging()
 
 
 if __name__ == "__main__":
     # Entry point for the application
-    main()
\ No newline at end of file
+    main()
@@ -1,5 +1,8 @@
 from .base import Base, get_db
 from .user import User
 from .customer import Customer
+from .table_count import TableCount
+from .customer_change import CustomerChange
+from . import customer_search  # registers the search table DDL with Customer.__table__
 
-__all__ = ["Base", "get_db", "User", "Customer"]
+__all__ = ["Base", "get_db", "User", "Customer", "TableCount", "CustomerChange"]
@@ -1,19 +1,165 @@
-from sqlalchemy import Column, PrimaryKeyConstraint, String
-from sqlalchemy import create_engine
+import functools
+import threading
+import time
+from sqlalchemy import Column, PrimaryKeyConstraint, String, DateTime
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import scoped_session, sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, Session
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
-from cm_customer_svc.config import DATABASE_URL
+from cm_customer_svc.config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS,
+    METRICS_ENABLED,
+    SERVER_TIMING_ENABLED,
+)
+from cm_customer_svc.utils.metrics import instrument_engine
+from cm_customer_svc.utils.request_timing import add_phase
 
 Base = declarative_base()
 
-engine = create_engine(DATABASE_URL)
+# SQLite stores func.now() (CURRENT_TIMESTAMP) without fractional seconds. Bind timestamps in the
+# same format there so equality comparisons, e.g. keyset pagination ties, match stored values.
+TimestampType = DateTime().with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite")
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """create_engine/create_async_engine keyword arguments for url from the DB_POOL_* settings."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    options: Dict[str, Any] = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    if backend != "sqlite":
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    if backend == "postgresql" and DB_STATEMENT_TIMEOUT_MS > 0:
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+class PoolStats:
+    """Counts connection acquisitions made through the session factories and the time spent waiting.
+
+    Sessions check out their connection lazily, on first use; track() times each checkout from the
+    moment the session's transaction begins to the moment it holds a connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def track(self, target: Any) -> None:
+        """Record the connection wait of every session target (a sessionmaker or Session class) makes."""
+        event.listen(target, "after_transaction_create", _mark_connection_request)
+        event.listen(target, "after_begin", functools.partial(_record_connection_wait, self))
+
+    def snapshot(self, engine: Engine) -> Dict[str, Any]:
+        pool = engine.pool
+        with self._lock:
+            acquisitions = self.acquisitions
+            total_wait = self.total_wait_seconds
+            max_wait = self.max_wait_seconds
+        stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+        # QueuePool exposes sizing; SQLite's single-connection pools do not
+        for name in ("size", "checkedout", "checkedin", "overflow"):
+            fn = getattr(pool, name, None)
+            stats[name] = fn() if callable(fn) else None
+        stats.update(
+            acquisitions=acquisitions,
+            avg_wait_ms=(total_wait / acquisitions * 1000) if acquisitions else 0.0,
+            max_wait_ms=max_wait * 1000,
+        )
+        return stats
+
+
+def _mark_connection_request(session: Session, transaction: Any) -> None:
+    # a root transaction is created right before the session asks the pool for a connection
+    if transaction.parent is None:
+        session.info["connection_requested_at"] = time.perf_counter()
+
+
+def _record_connection_wait(stats: PoolStats, session: Session, transaction: Any, connection: Any) -> None:
+    start = session.info.pop("connection_requested_at", None)
+    if start is None:
+        return
+    waited = time.perf_counter() - start
+    stats.record_wait(waited)
+    add_phase("db", waited)
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+if METRICS_ENABLED or SERVER_TIMING_ENABLED:
+    instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine)
+pool_stats = PoolStats()
+pool_stats.track(SessionLocal)
 
 
-def get_db() -> Session:
-    session = scoped_session(sessionmaker(bind=engine))
+def get_db() -> Iterator[Session]:
+    """Yield a session from the shared SessionLocal factory.
+
+    The session checks out a connection only when it first runs SQL and returns it on commit or
+    close, so a request waiting on something else (password hashing, a slow client) holds none.
+    """
+    session = SessionLocal()
     try:
         yield session
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+
+# The async engine is created on first use so the asyncio driver is only required when DB_ASYNC is on.
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+async_pool_stats = PoolStats()
+
+
+class _AsyncSyncSession(Session):
+    """Sync session class behind the async factory, so async_pool_stats only tracks its sessions."""
+
+
+async_pool_stats.track(_AsyncSyncSession)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+        if METRICS_ENABLED or SERVER_TIMING_ENABLED:
+            instrument_engine(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine, expire_on_commit=False, sync_session_class=_AsyncSyncSession
+        )
+    return _async_engine
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    get_async_engine()
+    async with _AsyncSessionLocal() as session:
+        yield session
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Pool status and wait statistics for the sync engine and, once created, the async engine."""
+    stats = {"sync": pool_stats.snapshot(engine)}
+    if _async_engine is not None:
+        stats["async"] = async_pool_stats.snapshot(_async_engine.sync_engine)
+    return stats
@@ -1,23 +1,35 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
 
-from .base import Base
+from .base import Base, TimestampType
 
 
 class Customer(Base):
     __tablename__ = "customers"
 
     customer_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
-    customer_name = Column(String, nullable=False)
+    # byte-order collation on PostgreSQL, like SQLite's BINARY, so name_prefix ranges are exact prefixes
+    customer_name = Column(String().with_variant(String(collation="C"), "postgresql"), nullable=False)
     customer_contact = Column(String, nullable=True)
+    # digits-only/E.164 form of customer_contact, written by the API for lookup by phone
+    customer_contact_digits = Column(String(15), nullable=True)
     customer_address = Column(String, nullable=True)
     managed_by = Column(String(8), ForeignKey('users.employee_id'), nullable=False)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(TimestampType, default=func.now(), nullable=False)
+    updated_at = Column(TimestampType, default=func.now(), onupdate=func.now(), nullable=False)
 
-    __table_args__ = (Index("idx_customer_customer_id", "customer_id"),)
+    __table_args__ = (
+        Index("idx_customer_customer_id", "customer_id"),
+        # keyset pagination order: (created_at, customer_id)
+        Index("idx_customer_created_at_customer_id", "created_at", "customer_id"),
+        # listing filters/sorts: managed_by (+ default order), updated_at, customer_name prefix
+        Index("idx_customer_managed_by_created_at", "managed_by", "created_at", "customer_id"),
+        Index("idx_customer_updated_at_customer_id", "updated_at", "customer_id"),
+        Index("idx_customer_name_customer_id", "customer_name", "customer_id"),
+        Index("idx_customer_contact_digits", "customer_contact_digits"),
+    )
 
     def __repr__(self) -> str:
         return f"<Customer(customer_id={self.customer_id}, customer_name={self.customer_name})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from .base import Base, TimestampType
+
+
+class CustomerChange(Base):
+    """Append-only changelog of customer writes, read by GET /api/customers/changes.
+
+    One row per created/updated ("upsert") or deleted ("delete") customer, written in the same
+    transaction as the change itself. seq gives the commit order.
+    """
+
+    __tablename__ = "customer_changes"
+
+    # INTEGER on SQLite so the column aliases the rowid and autoincrements
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    customer_id = Column(UUID(as_uuid=True), nullable=False)
+    op = Column(String(8), nullable=False)
+    changed_at = Column(TimestampType, default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CustomerChange(seq={self.seq}, customer_id={self.customer_id}, op={self.op})>"
@@ -0,0 +1,50 @@
+import sqlite3
+
+from sqlalchemy import DDL, event
+from sqlalchemy.sql import column, table
+
+from .customer import Customer
+
+
+def _sqlite_has_fts5() -> bool:
+    """Whether the linked SQLite library can build FTS5 trigram tables (SQLite >= 3.34 with FTS5)."""
+    try:
+        connection = sqlite3.connect(":memory:")
+        try:
+            connection.execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+        finally:
+            connection.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+SQLITE_FTS5_AVAILABLE = _sqlite_has_fts5()
+
+# SQLite FTS5 index over the searchable customer fields, kept in step by the customer write paths.
+# customer_id holds the UUID hex exactly as the customers table stores it on SQLite; rowid is derived
+# from the UUID (utils.search_index.search_rowid) so entries can be replaced without a table scan.
+customer_search_table = table(
+    "customer_search",
+    column("rowid"),
+    column("customer_id"),
+    column("customer_name"),
+    column("customer_address"),
+    column("contact_digits"),
+)
+
+CREATE_CUSTOMER_SEARCH_SQLITE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS customer_search USING fts5("
+    "customer_id UNINDEXED, customer_name, customer_address, contact_digits, tokenize='trigram')"
+)
+DROP_CUSTOMER_SEARCH_SQLITE = "DROP TABLE IF EXISTS customer_search"
+
+
+def _sqlite_fts5(ddl, target, bind, **kw) -> bool:
+    return bind.dialect.name == "sqlite" and SQLITE_FTS5_AVAILABLE
+
+
+# metadata.create_all/drop_all (tests, local setups) manage the virtual table alongside customers;
+# the Alembic migration does the same for real databases
+event.listen(Customer.__table__, "after_create", DDL(CREATE_CUSTOMER_SEARCH_SQLITE).execute_if(callable_=_sqlite_fts5))
+event.listen(Customer.__table__, "before_drop", DDL(DROP_CUSTOMER_SEARCH_SQLITE).execute_if(callable_=_sqlite_fts5))
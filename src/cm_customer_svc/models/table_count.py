@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, BigInteger
+
+from .base import Base
+
+
+class TableCount(Base):
+    """Row counters for large tables, maintained by the API write paths.
+
+    Reading one row here is O(1), unlike COUNT(*) which scans the table.
+    """
+
+    __tablename__ = "table_counts"
+
+    table_name = Column(String, primary_key=True, nullable=False)
+    row_count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TableCount(table_name={self.table_name}, row_count={self.row_count})>"
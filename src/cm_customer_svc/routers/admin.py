@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from cm_customer_svc.dependencies.auth import get_current_user
+from cm_customer_svc.models.base import get_pool_stats
+from cm_customer_svc.utils.cache import customer_cache
+from cm_customer_svc.utils.hashing_service import password_hasher
+from cm_customer_svc.utils import rate_limit
+from cm_customer_svc.utils.event_hub import customer_events
+from cm_customer_svc.utils.server_timing import profile_reports, profiling_allowed
+
+admin_router = APIRouter()
+
+
+@admin_router.get("/pool")
+def pool_stats(_=Depends(get_current_user)) -> dict:
+    """Return connection pool usage and checkout wait statistics for this worker process."""
+    return get_pool_stats()
+
+
+@admin_router.get("/cache")
+def cache_stats(_=Depends(get_current_user)) -> dict:
+    """Return hit/miss/eviction counters of the customer read-through cache."""
+    if customer_cache is None:
+        return {"backend": "none"}
+    return customer_cache.info()
+
+
+@admin_router.get("/hashing")
+def hashing_stats(_=Depends(get_current_user)) -> dict:
+    """Return password hashing queue depth, rejections and latency for this worker process."""
+    return password_hasher.stats()
+
+
+@admin_router.get("/login-limits")
+def login_limit_stats(_=Depends(get_current_user)) -> dict:
+    """Return login rate limiter buckets, limits and throttled attempts for this worker process."""
+    if rate_limit.login_limiter is None:
+        return {"backend": "none"}
+    return rate_limit.login_limiter.stats()
+
+
+@admin_router.get("/stream")
+def stream_stats(_=Depends(get_current_user)) -> dict:
+    """Return customer event stream subscribers, published events and dropped slow subscribers."""
+    return customer_events.stats()
+
+
+@admin_router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def profile_report(profile_id: str, current_user_id: str = Depends(get_current_user)) -> PlainTextResponse:
+    """Return the sampling profile of a request made with ?profile=1 (PROFILE_EMPLOYEE_IDS only)."""
+    if not profiling_allowed(current_user_id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
+    report = profile_reports.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="profile not found")
+    return PlainTextResponse(report)
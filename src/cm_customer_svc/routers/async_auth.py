@@ -0,0 +1,55 @@
+import logging
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cm_customer_svc.schemas.user import UserLogin
+from cm_customer_svc.utils.hashing_service import HashingSaturated, password_hasher
+from cm_customer_svc.models.base import get_async_db
+from cm_customer_svc.models.user import User
+from cm_customer_svc.routers.auth import (
+    _hashing_saturated,
+    _invalid_credentials,
+    _login_failed,
+    _login_success,
+    _throttled,
+    _unknown_user,
+)
+
+logger = logging.getLogger(__name__)
+
+# Async (AsyncSession) version of the login handler, selected with DB_ASYNC.
+async_auth_router = APIRouter()
+
+
+@async_auth_router.post("/login")
+async def login(payload: UserLogin, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Authenticate user by employee_id and password, set access token cookie on success.
+
+    The user lookup awaits the async engine; PBKDF2 verification is awaited on the hashing service.
+    Rate limiting and the unknown-user dummy verification match the sync handler.
+    """
+    throttled = _throttled(request, payload.employee_id)
+    if throttled is not None:
+        return throttled
+
+    try:
+        stmt = select(User.employee_id, User.password_hash).filter_by(employee_id=payload.employee_id)
+        user = (await db.execute(stmt)).first()
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        return _invalid_credentials()
+
+    try:
+        if user is None:
+            await password_hasher.verify_async(payload.password, _unknown_user())
+            return _login_failed(request, payload.employee_id)
+        if not await password_hasher.verify_async(payload.password, user.password_hash):
+            return _login_failed(request, payload.employee_id)
+    except HashingSaturated:
+        return _hashing_saturated()
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        return _invalid_credentials()
+
+    return _login_success(user.employee_id)
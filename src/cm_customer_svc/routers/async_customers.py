@@ -0,0 +1,283 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cm_customer_svc.models.customer import Customer
+from cm_customer_svc.models.user import User
+from cm_customer_svc.schemas.customer import (
+    CustomerCreate,
+    CustomerUpdate,
+    CustomerResponse,
+    PaginationParams,
+    PaginatedCustomerResponse,
+    CustomerListFilters,
+    CustomerFieldsParams,
+)
+from cm_customer_svc.models.base import get_async_db
+from cm_customer_svc.dependencies.auth import get_current_user_async
+from cm_customer_svc.routers.customers import (
+    _parse_customer_pk,
+    _manager_not_found,
+    _contact_digits,
+    _filter_criteria,
+    _requested_fields,
+    _projected_customer_statement,
+    _projected_customer_response,
+    _page_columns,
+    _page_statement,
+    _page_response,
+    _split_page,
+    _select_customer_statement,
+    _update_statement,
+    _delete_statement,
+    _check_if_match,
+    _manager_statement,
+    _write_missed,
+    _listing_etag,
+    _cache_generation,
+    _cached_customer_response,
+    _customer_response,
+    _invalidate_customer,
+    _publish_customer,
+    _publish_deleted,
+    _SEARCHABLE_FIELDS,
+)
+from cm_customer_svc.utils.count_utils import (
+    count_rows_async,
+    cached_count_async,
+    counter_count_async,
+    adjust_counter_async,
+)
+from cm_customer_svc.utils.search_index import index_customers_async, unindex_customers_async
+from cm_customer_svc.utils.change_feed import CHANGE_DELETE, CHANGE_UPSERT, current_version_statement, record_changes_async
+from cm_customer_svc.utils.etag_utils import customer_etag, is_not_modified, not_modified_response, validator_headers
+from cm_customer_svc.utils.request_timing import timing_phase
+from cm_customer_svc.utils.event_hub import EVENT_CREATED, EVENT_UPDATED
+
+logger = logging.getLogger(__name__)
+
+# Async (AsyncSession) versions of the customer CRUD handlers, selected with DB_ASYNC.
+# They share statement builders with routers/customers.py so both paths issue the same SQL.
+async_customers_router = APIRouter()
+
+
+async def _rollback(db: AsyncSession) -> None:
+    try:
+        await db.rollback()
+    except Exception:
+        logger.error("rollback failed", exc_info=True)
+
+
+async def _require_if_match(db: AsyncSession, request: Request, pk):
+    header = request.headers.get("if-match")
+    if header is None:
+        return None
+    current = (await db.execute(_select_customer_statement(pk))).first()
+    try:
+        if current is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+        _check_if_match(header, current)
+    except HTTPException:
+        await db.rollback()
+        raise
+    return None if header.strip() == "*" else current
+
+
+@async_customers_router.post("/customers", status_code=status.HTTP_201_CREATED)
+async def create_customer(payload: CustomerCreate, current_user_id: str = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)) -> CustomerResponse:
+    """Create a new customer. managed_by is set from authenticated user."""
+    try:
+        manager = await db.get(User, current_user_id)
+        if manager is None:
+            raise _manager_not_found(current_user_id)
+
+        customer = Customer(
+            customer_name=payload.customer_name,
+            customer_contact=payload.customer_contact,
+            customer_contact_digits=_contact_digits(payload.customer_contact),
+            customer_address=payload.customer_address,
+            managed_by=current_user_id,
+        )
+        db.add(customer)
+        await db.flush()
+        await index_customers_async(db, [customer], replace=False)
+        await adjust_counter_async(db, Customer, 1)
+        await record_changes_async(db, [customer.customer_id], CHANGE_UPSERT)
+        await db.commit()
+        await db.refresh(customer)
+
+        with timing_phase("validation"):
+            response = CustomerResponse.model_validate(customer)
+        _publish_customer(EVENT_CREATED, response)
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await _rollback(db)
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+
+
+@async_customers_router.get("/customers/{customer_id}", response_model=CustomerResponse)
+async def get_customer(
+    customer_id: str,
+    request: Request,
+    field_params: CustomerFieldsParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    _=Depends(get_current_user_async),
+) -> Response:
+    fields = _requested_fields(field_params)
+    try:
+        pk = _parse_customer_pk(customer_id)
+        if fields is not None:
+            row = (await db.execute(_projected_customer_statement(pk, fields))).first()
+            if row is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+            return _projected_customer_response(request, fields, row)
+        cached = _cached_customer_response(request, pk)
+        if cached is not None:
+            return cached
+        generation = _cache_generation(pk)
+        row = (await db.execute(_select_customer_statement(pk))).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+        return _customer_response(request, pk, row, generation)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+
+
+@async_customers_router.get("/customers", response_model=PaginatedCustomerResponse)
+async def get_all_customers(
+    request: Request,
+    pagination: PaginationParams = Depends(),
+    filters: CustomerListFilters = Depends(),
+    field_params: CustomerFieldsParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    _=Depends(get_current_user_async),
+) -> Response:
+    """List customers; same filters, ordering, cursor, count options, projection and ETag as the sync handler."""
+    fields = _requested_fields(field_params)
+    try:
+        etag = _listing_etag((await db.execute(current_version_statement())).scalar_one(), pagination, filters, fields)
+        if is_not_modified(request.headers, etag):
+            return not_modified_response(etag)
+
+        criteria = _filter_criteria(filters)
+        rows = (await db.execute(_page_statement(pagination, criteria, _page_columns(pagination, fields)))).all()
+        items, next_cursor = _split_page(rows, pagination)
+
+        if not pagination.include_total:
+            total_count, total_count_exact = None, False
+        elif criteria:
+            total_count, total_count_exact = await count_rows_async(db, Customer, criteria), True
+        elif pagination.count_mode == "cached":
+            total_count, total_count_exact = await cached_count_async(db, Customer)
+        elif pagination.count_mode == "counter":
+            total_count, total_count_exact = await counter_count_async(db, Customer), False
+        else:
+            total_count, total_count_exact = await count_rows_async(db, Customer), True
+
+        return _page_response(
+            items,
+            total_count,
+            total_count_exact,
+            pagination.page,
+            pagination.page_size,
+            next_cursor,
+            headers=validator_headers(etag),
+            fields=fields,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+
+
+@async_customers_router.put("/customers/{customer_id}")
+async def update_customer(
+    customer_id: str,
+    payload: CustomerUpdate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    _=Depends(get_current_user_async),
+) -> CustomerResponse:
+    try:
+        pk = _parse_customer_pk(customer_id)
+        expected = await _require_if_match(db, request, pk)
+        changes = payload.model_dump(exclude_none=True)
+
+        if not changes:
+            row = (await db.execute(_select_customer_statement(pk))).first()
+            if row is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+            response.headers["ETag"] = customer_etag(row)
+            with timing_phase("validation"):
+                return CustomerResponse.model_validate(row)
+
+        previous_managed_by = None
+        if "managed_by" in changes:
+            previous_managed_by = expected.managed_by if expected is not None else (await db.execute(_manager_statement(pk))).scalar()
+
+        try:
+            row = (await db.execute(_update_statement(pk, changes, expected))).first()
+        except IntegrityError:
+            await db.rollback()
+            raise _manager_not_found(payload.managed_by)
+
+        if row is None:
+            await db.rollback()
+            current = (await db.execute(_select_customer_statement(pk))).first()
+            raise _write_missed(current, expected, changes.get("managed_by"))
+
+        if changes.keys() & _SEARCHABLE_FIELDS:
+            await index_customers_async(db, [row])
+        await record_changes_async(db, [pk], CHANGE_UPSERT)
+        await db.commit()
+        _invalidate_customer(pk)
+        response.headers["ETag"] = customer_etag(row)
+        with timing_phase("validation"):
+            updated = CustomerResponse.model_validate(row)
+        _publish_customer(EVENT_UPDATED, updated, previous_managed_by)
+        return updated
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await _rollback(db)
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+
+
+@async_customers_router.delete("/customers/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_customer(customer_id: str, request: Request, db: AsyncSession = Depends(get_async_db), _=Depends(get_current_user_async)) -> Response:
+    try:
+        pk = _parse_customer_pk(customer_id)
+        expected = await _require_if_match(db, request, pk)
+        deleted = (await db.execute(_delete_statement(pk, expected))).first()
+        if deleted is None:
+            await db.rollback()
+            current = None if expected is None else (await db.execute(_select_customer_statement(pk))).first()
+            raise _write_missed(current, expected)
+
+        await unindex_customers_async(db, [pk])
+        await adjust_counter_async(db, Customer, -1)
+        await record_changes_async(db, [pk], CHANGE_DELETE)
+        await db.commit()
+        _invalidate_customer(pk)
+        _publish_deleted(pk, deleted.managed_by)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await _rollback(db)
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
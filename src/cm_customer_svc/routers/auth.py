@@ -1,9 +1,13 @@
 import logging
-from fastapi import APIRouter, Response, status, Depends
+import math
+from typing import Optional
+
+from fastapi import APIRouter, Request, Response, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from cm_customer_svc.utils.jwt_utils import create_access_token
+from cm_customer_svc.utils.jwt_utils import create_access_token, revoke_access_token
 from cm_customer_svc.config import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     SECURE_COOKIE,
@@ -11,7 +15,9 @@ from cm_customer_svc.config import (
     SAMESITE_COOKIE,
 )
 from cm_customer_svc.schemas.user import UserLogin
-from cm_customer_svc.utils.password_utils import verify_password
+from cm_customer_svc.utils.hashing_service import HashingSaturated, dummy_password_hash, password_hasher
+from cm_customer_svc.utils.metrics import login_unknown_user_verifications
+from cm_customer_svc.utils import rate_limit
 from cm_customer_svc.models.base import get_db
 from cm_customer_svc.models.user import User
 
@@ -22,32 +28,59 @@ auth_router = APIRouter()
 ACCESS_TOKEN_COOKIE_NAME = "access_token"
 
 
-@auth_router.post("/login")
-def login(payload: UserLogin, db: Session = Depends(get_db)):
-    """Authenticate user by employee_id and password, set access token cookie on success.
+def _invalid_credentials() -> Response:
+    return Response(status_code=status.HTTP_401_UNAUTHORIZED, content='{"detail":"Invalid credentials"}', media_type="application/json")
 
-    Returns 401 on invalid credentials or internal failures during lookup/verification.
-    """
-    try:
-        stmt = select(User).filter_by(employee_id=payload.employee_id)
-        user = db.execute(stmt).scalar_one_or_none()
-    except Exception as e:
-        logger.error(e, exc_info=True)
-        # Avoid leaking details; treat as invalid credentials
-        return Response(status_code=status.HTTP_401_UNAUTHORIZED, content='{"detail":"Invalid credentials"}', media_type="application/json")
 
-    if not user:
-        return Response(status_code=status.HTTP_401_UNAUTHORIZED, content='{"detail":"Invalid credentials"}', media_type="application/json")
+def _hashing_saturated() -> Response:
+    return Response(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content='{"detail":"too many concurrent logins, retry shortly"}',
+        media_type="application/json",
+        headers={"Retry-After": "1"},
+    )
 
-    try:
-        if not verify_password(payload.password, user.password_hash):
-            return Response(status_code=status.HTTP_401_UNAUTHORIZED, content='{"detail":"Invalid credentials"}', media_type="application/json")
-    except Exception as e:
-        logger.error(e, exc_info=True)
-        return Response(status_code=status.HTTP_401_UNAUTHORIZED, content='{"detail":"Invalid credentials"}', media_type="application/json")
 
+def _client_ip(request: Request) -> Optional[str]:
+    peer = request.client.host if request.client else None
+    forwarded_for = ",".join(request.headers.getlist("x-forwarded-for"))
+    return rate_limit.client_ip(peer, forwarded_for, rate_limit.trusted_proxies)
+
+
+def _throttled(request: Request, employee_id: str) -> Optional[Response]:
+    """429 response when the client IP or employee_id is out of failed login attempts, else None."""
+    if rate_limit.login_limiter is None:
+        return None
+    ip = _client_ip(request)
+    wait = rate_limit.login_limiter.check(ip, employee_id)
+    if wait <= 0:
+        return None
+    logger.info("login throttled for employee_id %s from %s", employee_id, ip)
+    return Response(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content='{"detail":"too many login attempts, retry later"}',
+        media_type="application/json",
+        headers={"Retry-After": str(max(1, math.ceil(wait)))},
+    )
+
+
+def _login_failed(request: Request, employee_id: str) -> Response:
+    """Charge the failed attempt to the client IP and employee_id buckets; 401 response."""
+    if rate_limit.login_limiter is not None:
+        rate_limit.login_limiter.record_failure(_client_ip(request), employee_id)
+    return _invalid_credentials()
+
+
+def _unknown_user() -> str:
+    """Hash to verify an unknown employee_id's password against, so the 401 takes as long as a wrong password."""
+    login_unknown_user_verifications.inc()
+    return dummy_password_hash()
+
+
+def _login_success(employee_id: str) -> Response:
+    """Issue the access token cookie for employee_id; 500 response if token creation fails."""
     try:
-        token = create_access_token({"sub": user.employee_id})
+        token = create_access_token({"sub": employee_id})
         max_age = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
         resp = Response(content='{"message": "login successful"}', media_type="application/json")
@@ -65,10 +98,61 @@ def login(payload: UserLogin, db: Session = Depends(get_db)):
         return Response(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content='{"detail":"internal server error"}', media_type="application/json")
 
 
+@auth_router.post("/login")
+async def login(payload: UserLogin, request: Request, db: Session = Depends(get_db)):
+    """Authenticate user by employee_id and password, set access token cookie on success.
+
+    Returns 401 on invalid credentials or internal failures during lookup/verification, 429 when
+    the client IP or employee_id is out of failed login attempts (checked before any hashing) or
+    the password hashing queue is full. Only wrong passwords and unknown ids are charged. Unknown employee ids are verified against a dummy hash so they
+    cost the same time as a wrong password.
+
+    The handler is async so waiting for PBKDF2 does not hold a threadpool thread; only the user
+    lookup runs in the threadpool.
+    """
+    throttled = _throttled(request, payload.employee_id)
+    if throttled is not None:
+        return throttled
+
+    try:
+        stmt = select(User.employee_id, User.password_hash).filter_by(employee_id=payload.employee_id)
+        user = await run_in_threadpool(lambda: db.execute(stmt).first())
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        # Avoid leaking details; treat as invalid credentials
+        return _invalid_credentials()
+
+    try:
+        if user is None:
+            await password_hasher.verify_async(payload.password, _unknown_user())
+            return _login_failed(request, payload.employee_id)
+        if not await password_hasher.verify_async(payload.password, user.password_hash):
+            return _login_failed(request, payload.employee_id)
+    except HashingSaturated:
+        return _hashing_saturated()
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        return _invalid_credentials()
+
+    return _login_success(user.employee_id)
+
+
 @auth_router.post("/logout")
-def logout():
+def logout(request: Request):
+    # Revoke the presented token server-side so copies of the cookie stop working too
+    token = request.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
+    if token and not revoke_access_token(token):
+        logger.error("token revocation list is full, logout not recorded")
+        resp = Response(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content='{"detail":"logout could not be recorded, retry shortly"}',
+            media_type="application/json",
+            headers={"Retry-After": "1"},
+        )
+    else:
+        resp = Response(content='{"message": "logout successful"}', media_type="application/json")
+
     # Clear cookie by setting empty value and max_age=0
-    resp = Response(content='{"message": "logout successful"}', media_type="application/json")
     resp.set_cookie(
         key=ACCESS_TOKEN_COOKIE_NAME,
         value="",
@@ -1,10 +1,19 @@
+import asyncio
+import csv
+import io
+import json
 import logging
+import sys
+import time
 import uuid
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import Response
+from datetime import timezone
+from typing import AsyncIterator, Iterator, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, update, delete, exists, and_, or_
+from sqlalchemy.exc import IntegrityError
+from pydantic import ValidationError
 
 from cm_customer_svc.models.customer import Customer
 from cm_customer_svc.models.user import User
@@ -14,24 +23,135 @@ from cm_customer_svc.schemas.customer import (
     CustomerResponse,
     PaginationParams,
     PaginatedCustomerResponse,
+    CustomerListFilters,
+    CustomerFieldsParams,
+    CustomerSearchParams,
+    CustomerBatchCreate,
+    CustomerBatchItemError,
+    CustomerBatchCreateResponse,
+    CustomerBatchGet,
+    CustomerBatchGetResponse,
+    CustomerChangesParams,
+    CustomerChangeItem,
+    CustomerChangesResponse,
+    CustomerStreamParams,
 )
-from cm_customer_svc.models.base import get_db
+from cm_customer_svc.config import (
+    CUSTOMER_BATCH_CHUNK_SIZE,
+    CUSTOMER_EXPORT_YIELD_PER,
+    CUSTOMER_STREAM_HEARTBEAT_SECONDS,
+    PHONE_DEFAULT_COUNTRY_CODE,
+)
+from cm_customer_svc.models.base import SessionLocal, get_db
 from cm_customer_svc.dependencies.auth import get_current_user
+from cm_customer_svc.utils.pagination_utils import encode_cursor, decode_cursor
+from cm_customer_svc.utils.count_utils import count_rows, cached_count, counter_count, adjust_counter
+from cm_customer_svc.utils.cache import customer_cache
+from cm_customer_svc.utils.validation_utils import is_valid_phone_digits, normalize_phone_digits, sanitize_input
+from cm_customer_svc.utils.search_index import index_customers, unindex_customers, search_customer_ids, search_terms
+from cm_customer_svc.utils.change_feed import (
+    CHANGE_DELETE,
+    CHANGE_UPSERT,
+    changes_after_statement,
+    current_version_statement,
+    decode_change_token,
+    encode_change_token,
+    record_changes,
+)
+from cm_customer_svc.utils.etag_utils import (
+    customer_etag,
+    http_date,
+    if_match,
+    is_not_modified,
+    not_modified_response,
+    page_etag,
+    validator_headers,
+)
+from cm_customer_svc.utils.serialization import (
+    CUSTOMER_COLUMNS,
+    CustomerJSONResponse,
+    customer_json,
+    customer_row_dicts,
+    parse_fields,
+    projected_row_dicts,
+    projection_columns,
+)
+from cm_customer_svc.utils.request_timing import add_phase, timing_phase
+from cm_customer_svc.utils.event_hub import (
+    EVENT_BATCH_CREATED,
+    EVENT_CREATED,
+    EVENT_DELETED,
+    EVENT_UPDATED,
+    Subscription,
+    TooManySubscribers,
+    customer_events,
+    format_event,
+)
 
 logger = logging.getLogger(__name__)
 
 customers_router = APIRouter()
 
+_CUSTOMER_TABLE = Customer.__table__
+_CUSTOMER_COLUMNS = CUSTOMER_COLUMNS
+
+
+def _try_parse_customer_pk(customer_id: str) -> Optional[uuid.UUID]:
+    """UUID for customer_id, or None when it is malformed. Does not log: bad ids are an expected input."""
+    try:
+        return uuid.UUID(str(customer_id))
+    except (ValueError, TypeError):
+        return None
+
 
 def _parse_customer_pk(customer_id: str) -> uuid.UUID:
     try:
         return uuid.UUID(str(customer_id))
-    except (ValueError, TypeError) as e:
-        logger.error(e, exc_info=True)
+    except (ValueError, TypeError):
+        logger.debug("malformed customer id %r", customer_id)
         # Treat invalid UUIDs as not found to avoid leaking implementation details
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
 
 
+def _manager_not_found(employee_id: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"managed_by employee_id {employee_id} does not exist")
+
+
+def _requested_fields(params: CustomerFieldsParams) -> Optional[Tuple[str, ...]]:
+    """fields= projection in CustomerResponse order, or None for the full representation."""
+    try:
+        return parse_fields(params.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _contact_digits(contact: Optional[str]) -> Optional[str]:
+    """customer_contact_digits for a validated customer_contact."""
+    return normalize_phone_digits(contact, PHONE_DEFAULT_COUNTRY_CODE)
+
+
+def _publish_customer(event: str, customer: CustomerResponse, previous_managed_by: Optional[str] = None) -> None:
+    """Publish a created/updated customer; previous_managed_by is set when an update reassigned it."""
+    data = {"customer_id": str(customer.customer_id), "managed_by": customer.managed_by, "customer": customer.model_dump(mode="json")}
+    if previous_managed_by == customer.managed_by:
+        previous_managed_by = None
+    if previous_managed_by is not None:
+        data["previous_managed_by"] = previous_managed_by
+    customer_events.publish(event, customer.managed_by, data, previous_managed_by)
+
+
+def _publish_deleted(pk: uuid.UUID, managed_by: str) -> None:
+    customer_events.publish(EVENT_DELETED, managed_by, {"customer_id": str(pk), "managed_by": managed_by, "customer": None})
+
+
+def _publish_batch_created(managed_by: str, customer_ids: List[uuid.UUID]) -> None:
+    customer_events.publish(
+        EVENT_BATCH_CREATED,
+        managed_by,
+        {"managed_by": managed_by, "customer_ids": [str(customer_id) for customer_id in customer_ids]},
+    )
+
+
 @customers_router.post("/customers", status_code=status.HTTP_201_CREATED)
 def create_customer(payload: CustomerCreate, current_user_id: str = Depends(get_current_user), db: Session = Depends(get_db)) -> CustomerResponse:
     """Create a new customer. managed_by is set from authenticated user."""
@@ -39,19 +159,27 @@ def create_customer(payload: CustomerCreate, current_user_id: str = Depends(get_
         # validate current_user_id exists
         manager = db.get(User, current_user_id)
         if manager is None:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"managed_by employee_id {current_user_id} does not exist")
+            raise _manager_not_found(current_user_id)
 
         customer = Customer(
             customer_name=payload.customer_name,
             customer_contact=payload.customer_contact,
+            customer_contact_digits=_contact_digits(payload.customer_contact),
             customer_address=payload.customer_address,
             managed_by=current_user_id,
         )
         db.add(customer)
+        db.flush()
+        index_customers(db, [customer], replace=False)
+        adjust_counter(db, Customer, 1)
+        record_changes(db, [customer.customer_id], CHANGE_UPSERT)
         db.commit()
         db.refresh(customer)
 
-        return CustomerResponse.model_validate(customer)
+        with timing_phase("validation"):
+            response = CustomerResponse.model_validate(customer)
+        _publish_customer(EVENT_CREATED, response)
+        return response
 
     except HTTPException:
         raise
@@ -64,14 +192,436 @@ def create_customer(payload: CustomerCreate, current_user_id: str = Depends(get_
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
 
 
-@customers_router.get("/customers/{customer_id}")
-def get_customer(customer_id: str, db: Session = Depends(get_db), _=Depends(get_current_user)) -> CustomerResponse:
+@customers_router.post("/customers:batch")
+def create_customers_batch(payload: CustomerBatchCreate, current_user_id: str = Depends(get_current_user), db: Session = Depends(get_db)) -> CustomerBatchCreateResponse:
+    """Create many customers in one transaction. managed_by is set from authenticated user.
+
+    Items are validated individually; invalid items are reported in errors by index and skipped.
+    Valid items are written with one multi-row INSERT ... RETURNING per chunk and a single commit.
+    """
+    rows = []
+    errors = []
+    validation_start = time.perf_counter()
+    for index, item in enumerate(payload.items):
+        try:
+            data = CustomerCreate.model_validate(item)
+        except ValidationError as e:
+            errors.append(
+                CustomerBatchItemError(
+                    index=index,
+                    errors=e.errors(include_url=False, include_context=False, include_input=False),
+                )
+            )
+            continue
+        rows.append(
+            {
+                "customer_id": uuid.uuid4(),
+                "customer_name": data.customer_name,
+                "customer_contact": data.customer_contact,
+                "customer_contact_digits": _contact_digits(data.customer_contact),
+                "customer_address": data.customer_address,
+                "managed_by": current_user_id,
+            }
+        )
+    add_phase("validation", time.perf_counter() - validation_start)
+
+    try:
+        # validate current_user_id exists once for the whole batch
+        manager = db.get(User, current_user_id)
+        if manager is None:
+            raise _manager_not_found(current_user_id)
+
+        created = []
+        stmt = insert(Customer).returning(*_CUSTOMER_COLUMNS, sort_by_parameter_order=True)
+        for start in range(0, len(rows), CUSTOMER_BATCH_CHUNK_SIZE):
+            chunk = rows[start : start + CUSTOMER_BATCH_CHUNK_SIZE]
+            created.extend(db.execute(stmt, chunk).all())
+
+        if created:
+            index_customers(db, created, replace=False)
+            adjust_counter(db, Customer, len(created))
+            record_changes(db, [row.customer_id for row in created], CHANGE_UPSERT)
+        db.commit()
+        if created:
+            _publish_batch_created(current_user_id, [row.customer_id for row in created])
+
+        with timing_phase("validation"):
+            return CustomerBatchCreateResponse(
+                created_count=len(created),
+                error_count=len(errors),
+                items=[CustomerResponse.model_validate(row) for row in created],
+                errors=errors,
+            )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        try:
+            db.rollback()
+        except Exception:
+            logger.error("rollback failed", exc_info=True)
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+
+
+def _fetch_customer_rows(db: Session, pks: List[uuid.UUID]) -> dict:
+    """customer_id -> row for the existing customers among pks, one IN (...) query per chunk."""
+    found = {}
+    for start in range(0, len(pks), CUSTOMER_BATCH_CHUNK_SIZE):
+        chunk = pks[start : start + CUSTOMER_BATCH_CHUNK_SIZE]
+        for row in db.execute(select(*_CUSTOMER_COLUMNS).where(Customer.customer_id.in_(chunk))):
+            found[row.customer_id] = row
+    return found
+
+
+@customers_router.post("/customers:batchGet", response_model=CustomerBatchGetResponse)
+def get_customers_batch(payload: CustomerBatchGet, db: Session = Depends(get_db), _=Depends(get_current_user)) -> Response:
+    """Fetch many customers by id with one WHERE customer_id IN (...) query per chunk.
+
+    items follow the order of the requested ids (duplicates once). Ids that are malformed or do not
+    exist are returned in missing_ids as sent, just as GET /customers/{customer_id} treats both as not found.
+    """
+    parsed = [(raw_id, _try_parse_customer_pk(raw_id)) for raw_id in payload.ids]
+    pks = list(dict.fromkeys(pk for _, pk in parsed if pk is not None))
+
+    try:
+        found = _fetch_customer_rows(db, pks)
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+
+    items = []
+    missing_ids = []
+    seen = set()
+    for raw_id, pk in parsed:
+        key = pk if pk is not None else raw_id
+        if key in seen:
+            continue
+        seen.add(key)
+        row = found.get(pk)
+        if row is None:
+            missing_ids.append(raw_id)
+        else:
+            items.append(row)
+    return CustomerJSONResponse({"items": customer_row_dicts(items), "missing_ids": missing_ids})
+
+
+@customers_router.get("/customers/changes", response_model=CustomerChangesResponse)
+def get_customer_changes(params: CustomerChangesParams = Depends(), db: Session = Depends(get_db), _=Depends(get_current_user)) -> CustomerChangesResponse:
+    """Creates, updates and deletes after the since token, in commit order.
+
+    Within a page only the latest change per customer is returned; upserts carry the customer's
+    current state. Store next_token and pass it as since to resume.
+    """
+    after_seq = 0
+    if params.since:
+        try:
+            after_seq = decode_change_token(params.since)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid since token")
+
+    try:
+        rows = db.execute(changes_after_statement(after_seq, params.limit)).all()
+        has_more = len(rows) > params.limit
+        rows = rows[: params.limit]
+
+        latest = {}
+        for row in rows:
+            latest[row.customer_id] = row
+        entries = sorted(latest.values(), key=lambda row: row.seq)
+        current = _fetch_customer_rows(db, [row.customer_id for row in entries if row.op == CHANGE_UPSERT])
+
+        changes = []
+        for row in entries:
+            customer = None
+            if row.op == CHANGE_UPSERT:
+                found = current.get(row.customer_id)
+                if found is None:
+                    # deleted since; its tombstone has a later seq and comes on a following page
+                    continue
+                customer = CustomerResponse.model_validate(found)
+            changes.append(
+                CustomerChangeItem(seq=row.seq, op=row.op, customer_id=row.customer_id, changed_at=row.changed_at, customer=customer)
+            )
+
+        next_seq = rows[-1].seq if rows else after_seq
+        return CustomerChangesResponse(changes=changes, next_token=encode_change_token(next_seq), has_more=has_more)
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+
+
+# reconnect delay suggested to EventSource clients, in milliseconds
+_STREAM_RETRY_MS = 3000
+
+
+async def _stream_frames(subscription: Subscription, heartbeat_seconds: float) -> AsyncIterator[str]:
+    """SSE frames for one subscriber: events as published, a comment line when idle for
+    heartbeat_seconds (keeps proxies from closing the connection), and a final "dropped" event
+    when the hub dropped the subscriber for falling behind."""
+    try:
+        yield f"retry: {_STREAM_RETRY_MS}\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if frame is None:
+                yield format_event("dropped", {"reason": "subscriber fell behind; re-sync from /api/customers/changes"})
+                return
+            yield frame
+    finally:
+        customer_events.unsubscribe(subscription)
+
+
+@customers_router.get("/customers/stream")
+async def stream_customer_events(params: CustomerStreamParams = Depends(), _=Depends(get_current_user)) -> StreamingResponse:
+    """Server-Sent Events stream of customer creates, updates and deletes committed by this process."""
+    try:
+        subscription = customer_events.subscribe(params.managed_by)
+    except TooManySubscribers:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="too many stream subscribers")
+    return StreamingResponse(
+        _stream_frames(subscription, CUSTOMER_STREAM_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+_EXPORT_COLUMNS = tuple(CustomerResponse.model_fields)
+
+
+def _export_value(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _iter_export(bind, export_format: str, fields: Tuple[str, ...] = _EXPORT_COLUMNS) -> Iterator[str]:
+    """Yield the export body in chunks of CUSTOMER_EXPORT_YIELD_PER rows.
+
+    Rows are plain column tuples of just the exported fields, read from a server-side cursor, so
+    memory stays bounded by one chunk regardless of table size. The body is produced after the
+    request's get_db session has been closed, so the generator opens its own SessionLocal session
+    on bind and closes it when done.
+    """
+    columns = projection_columns(fields)
+    stmt = (
+        select(*columns)
+        .order_by(Customer.created_at, Customer.customer_id)
+        .execution_options(stream_results=True, yield_per=CUSTOMER_EXPORT_YIELD_PER)
+    )
+    db = SessionLocal(bind=bind)
+    try:
+        result = db.execute(stmt)
+        if export_format == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(fields)
+            yield buf.getvalue()
+            for partition in result.partitions():
+                buf.seek(0)
+                buf.truncate()
+                writer.writerows([[_export_value(v) for v in row] for row in partition])
+                yield buf.getvalue()
+        else:
+            for partition in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(fields, map(_export_value, row))), separators=(",", ":")) + "\n"
+                    for row in partition
+                )
+    except Exception as e:
+        # headers are already sent; all we can do is log and end the stream early
+        logger.error(e, exc_info=True)
+        raise
+    finally:
+        db.close()
+
+
+@customers_router.get("/customers/export")
+def export_customers(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    field_params: CustomerFieldsParams = Depends(),
+    db: Session = Depends(get_db),
+    _=Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream every customer as NDJSON or CSV, ordered by (created_at, customer_id).
+
+    fields= limits both the SELECT and the exported columns.
+    """
+    fields = _requested_fields(field_params) or _EXPORT_COLUMNS
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _iter_export(db.get_bind(), export_format, fields),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="customers.{export_format}"'},
+    )
+
+
+@customers_router.get("/customers/search", response_model=PaginatedCustomerResponse)
+def search_customers(params: CustomerSearchParams = Depends(), db: Session = Depends(get_db), _=Depends(get_current_user)) -> Response:
+    """Ranked search over customer name, address and contact digits.
+
+    Every term of q must match (as a substring, case-insensitive); best matches come first.
+    """
+    terms = search_terms(params.q)
+    if not terms:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="q must contain a term of at least 3 characters")
+
+    try:
+        ids, total_count = search_customer_ids(db, terms, params.page_size, (params.page - 1) * params.page_size)
+        items = []
+        if ids:
+            found = {row.customer_id: row for row in db.execute(select(*_CUSTOMER_COLUMNS).where(Customer.customer_id.in_(ids)))}
+            items = [found[pk] for pk in ids if pk in found]
+
+        return _page_response(items, total_count, True, params.page, params.page_size)
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+
+
+def _cache_key(pk: uuid.UUID) -> str:
+    return f"customer:{pk.hex}"
+
+
+def _cached_customer(pk: uuid.UUID) -> Optional[Tuple[str, str, bytes]]:
+    """(etag, last_modified, payload) cached for pk, or None on a miss or with caching disabled.
+
+    Entries are "etag\nlast_modified\npayload"; serialized JSON never contains a raw newline.
+    """
+    if customer_cache is None:
+        return None
+    value = customer_cache.get(_cache_key(pk))
+    if value is None:
+        return None
+    parts = value.split(b"\n", 2)
+    if len(parts) != 3:
+        # entry written before validators were cached; refill from the database
+        return None
+    return parts[0].decode("ascii"), parts[1].decode("ascii"), parts[2]
+
+
+def _cached_customer_response(request: Request, pk: uuid.UUID) -> Optional[Response]:
+    """Answer from the cache: 304 when the client's validators match, else the cached body."""
+    cached = _cached_customer(pk)
+    if cached is None:
+        return None
+    etag, last_modified, payload = cached
+    if is_not_modified(request.headers, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    return Response(content=payload, media_type="application/json", headers=validator_headers(etag, last_modified))
+
+
+def _cache_generation(pk: uuid.UUID):
+    """Read before loading the row for a fill; passed on to _customer_response."""
+    if customer_cache is None:
+        return None
+    return customer_cache.generation(_cache_key(pk))
+
+
+def _customer_response(request: Request, pk: uuid.UUID, customer, generation) -> Response:
+    """304 without serializing when the client's validators match; otherwise serialize the row once,
+    cache it with its validators and return it.
+
+    The entry is only stored if pk was not invalidated since generation was read, so a write that
+    commits while the row is being read cannot be overwritten by the older payload.
+    """
+    etag = customer_etag(customer)
+    last_modified = http_date(customer.updated_at)
+    if is_not_modified(request.headers, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    payload = customer_json(customer)
+    if customer_cache is not None:
+        entry = b"\n".join((etag.encode("ascii"), last_modified.encode("ascii"), payload))
+        customer_cache.set_if_unchanged(_cache_key(pk), entry, generation)
+    return Response(content=payload, media_type="application/json", headers=validator_headers(etag, last_modified))
+
+
+def _projected_customer_statement(pk: uuid.UUID, fields: Tuple[str, ...]):
+    # updated_at rides along for Last-Modified even when not requested
+    return select(*projection_columns(fields, ("updated_at",))).where(_CUSTOMER_TABLE.c.customer_id == pk)
+
+
+def _projected_customer_response(request: Request, fields: Tuple[str, ...], row) -> Response:
+    """fields= variant of _customer_response. Projections are not cached; their ETag covers the
+    requested fields only."""
+    etag = customer_etag(row, fields)
+    last_modified = http_date(row.updated_at)
+    if is_not_modified(request.headers, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    return CustomerJSONResponse(projected_row_dicts([row], fields)[0], headers=validator_headers(etag, last_modified))
+
+
+def _invalidate_customer(pk: uuid.UUID) -> None:
+    if customer_cache is not None:
+        customer_cache.delete(_cache_key(pk))
+
+
+# upper bound on customers returned for one phone number
+_PHONE_LOOKUP_LIMIT = 100
+
+
+def _phone_lookup_statement(number: str):
+    """Equality probe on idx_customer_contact_digits; 400 when number cannot be a phone number."""
+    digits = _contact_digits(number)
+    if not is_valid_phone_digits(digits):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid phone number")
+    return (
+        select(*_CUSTOMER_COLUMNS)
+        .where(Customer.customer_contact_digits == digits)
+        .order_by(Customer.created_at, Customer.customer_id)
+        .limit(_PHONE_LOOKUP_LIMIT)
+    )
+
+
+@customers_router.get("/customers/by-phone/{number}", response_model=List[CustomerResponse])
+def get_customers_by_phone(number: str, db: Session = Depends(get_db), _=Depends(get_current_user)) -> Response:
+    """Resolve a caller: customers whose contact number normalizes to the same digits as number.
+
+    Any formatting is accepted ("+1 (555) 123-4567", "5551234567"). Returns 404 when nobody matches.
+    """
+    stmt = _phone_lookup_statement(number)
+    try:
+        rows = db.execute(stmt).all()
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+    return CustomerJSONResponse(customer_row_dicts(rows))
+
+
+@customers_router.get("/customers/{customer_id}", response_model=CustomerResponse)
+def get_customer(
+    customer_id: str,
+    request: Request,
+    field_params: CustomerFieldsParams = Depends(),
+    db: Session = Depends(get_db),
+    _=Depends(get_current_user),
+) -> Response:
+    """Read-through cached lookup; the cache holds serialized CustomerResponse payloads with their
+    ETag and Last-Modified, so If-None-Match/If-Modified-Since hits are answered with 304.
+    A fields= projection selects just those columns and bypasses the cache."""
+    fields = _requested_fields(field_params)
     try:
         pk = _parse_customer_pk(customer_id)
+        if fields is not None:
+            row = db.execute(_projected_customer_statement(pk, fields)).first()
+            if row is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+            return _projected_customer_response(request, fields, row)
+        cached = _cached_customer_response(request, pk)
+        if cached is not None:
+            return cached
+        generation = _cache_generation(pk)
         customer = db.get(Customer, pk)
         if customer is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
-        return CustomerResponse.model_validate(customer)
+        return _customer_response(request, pk, customer, generation)
     except HTTPException:
         raise
     except Exception as e:
@@ -79,24 +629,197 @@ def get_customer(customer_id: str, db: Session = Depends(get_db), _=Depends(get_
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
 
 
+_SORT_COLUMNS = {
+    "created_at": Customer.created_at,
+    "updated_at": Customer.updated_at,
+    "customer_name": Customer.customer_name,
+}
+
+
+def _naive_utc(value):
+    # stored timestamps are naive UTC; compare aware inputs in the same terms
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with prefix, in code point order.
+
+    Trailing U+10FFFF characters cannot be incremented and are dropped (the carry); None when
+    nothing is left, as no string beyond such a prefix exists. Surrogates are skipped since they
+    cannot be stored. Code point order is what SQLite's BINARY and PostgreSQL's "C" collation of
+    customer_name (migration f2a6c9d4b817) compare by.
+    """
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+    code_point = ord(stripped[-1]) + 1
+    if 0xD800 <= code_point <= 0xDFFF:
+        code_point = 0xE000
+    return stripped[:-1] + chr(code_point)
+
+
+def _filter_criteria(filters: CustomerListFilters) -> List:
+    """WHERE criteria for the listing filters; each one is a sargable predicate on an indexed column."""
+    criteria = []
+    if filters.managed_by is not None:
+        criteria.append(Customer.managed_by == filters.managed_by)
+    if filters.created_after is not None:
+        criteria.append(Customer.created_at > _naive_utc(filters.created_after))
+    if filters.updated_after is not None:
+        criteria.append(Customer.updated_at > _naive_utc(filters.updated_after))
+    if filters.name_prefix is not None:
+        # names are stored sanitized, so match the prefix in the same form; a range instead of LIKE
+        # keeps it an index seek on idx_customer_name_customer_id
+        prefix = sanitize_input(filters.name_prefix)
+        if prefix:
+            criteria.append(Customer.customer_name >= prefix)
+            upper_bound = _prefix_upper_bound(prefix)
+            if upper_bound is not None:
+                criteria.append(Customer.customer_name < upper_bound)
+    return criteria
+
+
+def _total_count(db: Session, pagination: PaginationParams, criteria: List) -> Tuple[Optional[int], bool]:
+    """Return (total_count, exact) for the requested count strategy.
+
+    Filtered listings always use an exact filtered COUNT(*); the cache and counter only know the table total.
+    """
+    if not pagination.include_total:
+        return None, False
+    if criteria:
+        return count_rows(db, Customer, criteria), True
+    if pagination.count_mode == "cached":
+        return cached_count(db, Customer)
+    if pagination.count_mode == "counter":
+        return counter_count(db, Customer), False
+    return count_rows(db, Customer), True
+
+
+def _page_columns(pagination: PaginationParams, fields: Optional[Tuple[str, ...]]) -> Tuple:
+    """SELECT list for a page: every column, or the projected fields plus the keyset columns."""
+    if fields is None:
+        return _CUSTOMER_COLUMNS
+    return projection_columns(fields, (pagination.sort.lstrip("-"), "customer_id"))
+
+
+def _page_statement(pagination: PaginationParams, criteria: List = (), columns: Tuple = _CUSTOMER_COLUMNS):
+    """Build the page query: keyset seek when a cursor is given, OFFSET otherwise.
+
+    Rows are ordered by the sort column with customer_id as tiebreaker, both in the sort's direction.
+    One extra row is requested so _split_page can tell whether another page exists.
+    """
+    descending = pagination.sort.startswith("-")
+    sort_column = _SORT_COLUMNS[pagination.sort.lstrip("-")]
+    # plain column rows: no ORM instances or identity map for read-only pages
+    if descending:
+        stmt = select(*columns).order_by(sort_column.desc(), Customer.customer_id.desc())
+    else:
+        stmt = select(*columns).order_by(sort_column, Customer.customer_id)
+    stmt = stmt.where(*criteria)
+
+    if pagination.cursor:
+        try:
+            after_key, after_customer_id = decode_cursor(pagination.cursor, pagination.sort)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid cursor")
+        if descending:
+            seek = or_(
+                sort_column < after_key,
+                and_(sort_column == after_key, Customer.customer_id < after_customer_id),
+            )
+        else:
+            seek = or_(
+                sort_column > after_key,
+                and_(sort_column == after_key, Customer.customer_id > after_customer_id),
+            )
+        stmt = stmt.where(seek)
+    else:
+        stmt = stmt.offset((pagination.page - 1) * pagination.page_size)
+
+    return stmt.limit(pagination.page_size + 1)
+
+
+def _listing_etag(version: int, pagination: PaginationParams, filters: CustomerListFilters, fields: Optional[Tuple[str, ...]]) -> str:
+    return page_etag(version, {**pagination.model_dump(), **filters.model_dump(), "fields": fields})
+
+
+def _page_response(
+    items,
+    total_count: Optional[int],
+    total_count_exact: bool,
+    page: int,
+    page_size: int,
+    next_cursor: Optional[str] = None,
+    headers: Optional[dict] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Response:
+    """PaginatedCustomerResponse body serialized straight from rows (see utils.serialization);
+    items carry only the projected fields when fields is given."""
+    return CustomerJSONResponse(
+        {
+            "total_count": total_count,
+            "total_count_exact": total_count_exact,
+            "page": page,
+            "page_size": page_size,
+            "items": customer_row_dicts(items) if fields is None else projected_row_dicts(items, fields),
+            "next_cursor": next_cursor,
+        },
+        headers=headers,
+    )
+
+
+def _split_page(rows, pagination: PaginationParams) -> Tuple[list, Optional[str]]:
+    """Return (items, next_cursor) from the rows fetched by _page_statement."""
+    items = rows[: pagination.page_size]
+    next_cursor = None
+    if len(rows) > pagination.page_size:
+        last = items[-1]
+        key = getattr(last, pagination.sort.lstrip("-"))
+        next_cursor = encode_cursor(key, last.customer_id, pagination.sort)
+    return items, next_cursor
+
+
 @customers_router.get("/customers", response_model=PaginatedCustomerResponse)
-def get_all_customers(pagination: PaginationParams = Depends(), db: Session = Depends(get_db), _=Depends(get_current_user)) -> PaginatedCustomerResponse:
-    try:
-        offset = (pagination.page - 1) * pagination.page_size
+def get_all_customers(
+    request: Request,
+    pagination: PaginationParams = Depends(),
+    filters: CustomerListFilters = Depends(),
+    field_params: CustomerFieldsParams = Depends(),
+    db: Session = Depends(get_db),
+    _=Depends(get_current_user),
+) -> Response:
+    """List customers, optionally filtered, ordered by (sort column, customer_id).
 
-        items_stmt = select(Customer).offset(offset).limit(pagination.page_size)
-        items = db.execute(items_stmt).scalars().all()
+    Offset mode uses page/page_size. Keyset mode is selected by passing the next_cursor of a
+    previous page as cursor; it seeks on the composite index so deep pages cost the same as the first.
+    total_count follows count_mode and is skipped entirely with include_total=false.
+    fields= narrows both the SELECT and the items to the named fields.
+    The ETag combines the changelog version with the query, so a matching If-None-Match is
+    answered with 304 before the page and count queries run.
+    """
+    fields = _requested_fields(field_params)
+    try:
+        etag = _listing_etag(db.execute(current_version_statement()).scalar_one(), pagination, filters, fields)
+        if is_not_modified(request.headers, etag):
+            return not_modified_response(etag)
 
-        count_stmt = select(func.count()).select_from(Customer)
-        total_count = db.execute(count_stmt).scalar_one()
+        criteria = _filter_criteria(filters)
+        rows = db.execute(_page_statement(pagination, criteria, _page_columns(pagination, fields))).all()
+        items, next_cursor = _split_page(rows, pagination)
 
-        items_out = [CustomerResponse.model_validate(c) for c in items]
+        total_count, total_count_exact = _total_count(db, pagination, criteria)
 
-        return PaginatedCustomerResponse(
-            total_count=int(total_count),
-            page=pagination.page,
-            page_size=pagination.page_size,
-            items=items_out,
+        return _page_response(
+            items,
+            total_count,
+            total_count_exact,
+            pagination.page,
+            pagination.page_size,
+            next_cursor,
+            headers=validator_headers(etag),
+            fields=fields,
         )
     except HTTPException:
         raise
@@ -105,34 +828,162 @@ def get_all_customers(pagination: PaginationParams = Depends(), db: Session = De
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="internal server error")
 
 
+# fields held by the search index; other updates leave it untouched
+_SEARCHABLE_FIELDS = {"customer_name", "customer_address", "customer_contact"}
+
+
+def _select_customer_statement(pk: uuid.UUID):
+    return select(*_CUSTOMER_COLUMNS).where(_CUSTOMER_TABLE.c.customer_id == pk)
+
+
+# columns an If-Match write compares with the customer it checked; customer_id and created_at never change
+_VERSION_COLUMNS = ("customer_name", "customer_contact", "customer_address", "managed_by", "updated_at")
+
+
+def _unchanged_since(expected):
+    """WHERE clause matching the customer only while it still equals the row read as expected."""
+    return and_(*(_CUSTOMER_TABLE.c[name].is_not_distinct_from(getattr(expected, name)) for name in _VERSION_COLUMNS))
+
+
+def _update_statement(pk: uuid.UUID, changes: dict, expected=None):
+    """UPDATE ... RETURNING for the given column changes, guarded by manager existence when reassigning
+    and, with expected, by the customer being unchanged since the If-Match check."""
+    if "customer_contact" in changes:
+        changes = {**changes, "customer_contact_digits": _contact_digits(changes["customer_contact"])}
+    stmt = (
+        update(_CUSTOMER_TABLE)
+        .where(_CUSTOMER_TABLE.c.customer_id == pk)
+        .values(**changes)
+        .returning(*_CUSTOMER_COLUMNS)
+    )
+    if "managed_by" in changes:
+        stmt = stmt.where(exists().where(User.employee_id == changes["managed_by"]))
+    if expected is not None:
+        stmt = stmt.where(_unchanged_since(expected))
+    return stmt
+
+
+def _manager_statement(pk: uuid.UUID):
+    return select(_CUSTOMER_TABLE.c.managed_by).where(_CUSTOMER_TABLE.c.customer_id == pk)
+
+
+def _precondition_failed(current) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="customer has been modified",
+        headers={"ETag": customer_etag(current)},
+    )
+
+
+def _check_if_match(header: Optional[str], current) -> None:
+    """412 with the current ETag when an If-Match header does not match the stored customer."""
+    if header is None:
+        return
+    if not if_match(header, customer_etag(current)):
+        raise _precondition_failed(current)
+
+
+def _require_if_match(db: Session, request: Request, pk: uuid.UUID):
+    """Optimistic concurrency for PUT/DELETE: no-op without If-Match; 404 for a missing customer.
+
+    Returns the customer the header was checked against, for the write to be guarded with
+    (_unchanged_since), or None when there is nothing to guard. The check and the write are not in
+    one locked read: the guard in the write's WHERE clause is what makes them atomic.
+    """
+    header = request.headers.get("if-match")
+    if header is None:
+        return None
+    current = db.execute(_select_customer_statement(pk)).first()
+    try:
+        if current is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+        _check_if_match(header, current)
+    except HTTPException:
+        db.rollback()
+        raise
+    # "*" only requires the customer to exist
+    return None if header.strip() == "*" else current
+
+
+def _write_missed(current, expected, managed_by: Optional[str] = None) -> HTTPException:
+    """Error for a guarded UPDATE/DELETE that matched no row, from the customer as read afterwards."""
+    if current is None:
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+    if expected is not None and customer_etag(current) != customer_etag(expected):
+        return _precondition_failed(current)
+    if managed_by is not None:
+        return _manager_not_found(managed_by)
+    # changed and changed back between the check and the write
+    return _precondition_failed(current)
+
+
+def _delete_statement(pk: uuid.UUID, expected=None):
+    stmt = (
+        delete(_CUSTOMER_TABLE)
+        .where(_CUSTOMER_TABLE.c.customer_id == pk)
+        .returning(_CUSTOMER_TABLE.c.customer_id, _CUSTOMER_TABLE.c.managed_by)
+    )
+    if expected is not None:
+        stmt = stmt.where(_unchanged_since(expected))
+    return stmt
+
+
 @customers_router.put("/customers/{customer_id}")
-def update_customer(customer_id: str, payload: CustomerUpdate, db: Session = Depends(get_db), _=Depends(get_current_user)) -> CustomerResponse:
+def update_customer(
+    customer_id: str,
+    payload: CustomerUpdate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    _=Depends(get_current_user),
+) -> CustomerResponse:
+    """Apply the non-null fields of payload with a single UPDATE ... RETURNING.
+
+    A managed_by change is guarded by an EXISTS predicate in the same statement. Only when no row
+    comes back is a follow-up lookup made, to tell a missing customer (404) from a missing manager (400).
+    With If-Match the stored customer is compared first (412 on mismatch) and the UPDATE only applies
+    while it is still unchanged, so a concurrent write in between also gives 412.
+    """
     try:
         pk = _parse_customer_pk(customer_id)
-        customer = db.get(Customer, pk)
-        if customer is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+        expected = _require_if_match(db, request, pk)
+        changes = payload.model_dump(exclude_none=True)
 
-        # If managed_by present, validate existence
-        if payload.managed_by is not None:
-            manager = db.get(User, payload.managed_by)
-            if manager is None:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"managed_by employee_id {payload.managed_by} does not exist")
-            customer.managed_by = payload.managed_by
-
-        # Update other optional fields
-        if payload.customer_name is not None:
-            customer.customer_name = payload.customer_name
-        if payload.customer_contact is not None:
-            customer.customer_contact = payload.customer_contact
-        if payload.customer_address is not None:
-            customer.customer_address = payload.customer_address
+        if not changes:
+            row = db.execute(_select_customer_statement(pk)).first()
+            if row is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+            response.headers["ETag"] = customer_etag(row)
+            with timing_phase("validation"):
+                return CustomerResponse.model_validate(row)
 
-        db.add(customer)
-        db.commit()
-        db.refresh(customer)
+        previous_managed_by = None
+        if "managed_by" in changes:
+            # for the stream event: the old manager's subscribers see the customer leave
+            previous_managed_by = expected.managed_by if expected is not None else db.execute(_manager_statement(pk)).scalar()
+
+        try:
+            row = db.execute(_update_statement(pk, changes, expected)).first()
+        except IntegrityError:
+            # manager deleted between the EXISTS check and the FK check
+            db.rollback()
+            raise _manager_not_found(payload.managed_by)
+
+        if row is None:
+            db.rollback()
+            current = db.execute(_select_customer_statement(pk)).first()
+            raise _write_missed(current, expected, changes.get("managed_by"))
 
-        return CustomerResponse.model_validate(customer)
+        if changes.keys() & _SEARCHABLE_FIELDS:
+            index_customers(db, [row])
+        record_changes(db, [pk], CHANGE_UPSERT)
+        db.commit()
+        _invalidate_customer(pk)
+        response.headers["ETag"] = customer_etag(row)
+        with timing_phase("validation"):
+            updated = CustomerResponse.model_validate(row)
+        _publish_customer(EVENT_UPDATED, updated, previous_managed_by)
+        return updated
 
     except HTTPException:
         raise
@@ -146,15 +997,27 @@ def update_customer(customer_id: str, payload: CustomerUpdate, db: Session = Dep
 
 
 @customers_router.delete("/customers/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_customer(customer_id: str, db: Session = Depends(get_db), _=Depends(get_current_user)) -> Response:
+def delete_customer(customer_id: str, request: Request, db: Session = Depends(get_db), _=Depends(get_current_user)) -> Response:
+    """Delete with a single DELETE ... RETURNING; no row back means the customer does not exist.
+
+    With If-Match the stored customer is compared first (412 on mismatch) and the DELETE only applies
+    while it is still unchanged.
+    """
     try:
         pk = _parse_customer_pk(customer_id)
-        customer = db.get(Customer, pk)
-        if customer is None:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="customer not found")
+        expected = _require_if_match(db, request, pk)
+        deleted = db.execute(_delete_statement(pk, expected)).first()
+        if deleted is None:
+            db.rollback()
+            current = None if expected is None else db.execute(_select_customer_statement(pk)).first()
+            raise _write_missed(current, expected)
 
-        db.delete(customer)
+        unindex_customers(db, [pk])
+        adjust_counter(db, Customer, -1)
+        record_changes(db, [pk], CHANGE_DELETE)
         db.commit()
+        _invalidate_customer(pk)
+        _publish_deleted(pk, deleted.managed_by)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
     except HTTPException:
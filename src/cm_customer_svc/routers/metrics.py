@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from cm_customer_svc.utils.metrics import CONTENT_TYPE, registry
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Return this worker process's metrics in the Prometheus text exposition format."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -1,5 +1,6 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
@@ -7,22 +8,29 @@ from sqlalchemy.exc import IntegrityError
 from cm_customer_svc.schemas.user import UserCreate
 from cm_customer_svc.models.user import User
 from cm_customer_svc.models.base import get_db
-from cm_customer_svc.utils.password_utils import hash_password
+from cm_customer_svc.utils.hashing_service import HashingSaturated, password_hasher
 
 logger = logging.getLogger(__name__)
 
 registration_router = APIRouter()
 
 
+def _insert_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+
 @registration_router.post("/register", status_code=status.HTTP_201_CREATED)
-def register_user(payload: UserCreate, db: Session = Depends(get_db)) -> JSONResponse:
+async def register_user(payload: UserCreate, db: Session = Depends(get_db)) -> JSONResponse:
     """Register a new user: validate, hash password, persist to DB.
 
-    Returns 201 on success. On duplicate employee_id returns 409.
+    Returns 201 on success. On duplicate employee_id returns 409; 429 when the hashing queue is full.
+    Hashing is awaited on the hashing service and only the insert runs in the threadpool.
     """
     try:
         # Hash the incoming password
-        hashed = hash_password(payload.password)
+        hashed = await password_hasher.hash_async(payload.password)
 
         user = User(
             employee_id=payload.employee_id,
@@ -30,27 +38,32 @@ def register_user(payload: UserCreate, db: Session = Depends(get_db)) -> JSONRes
             password_hash=hashed,
         )
 
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        await run_in_threadpool(_insert_user, db, user)
 
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
             content={"message": "user created", "employee_id": user.employee_id},
         )
 
+    except HashingSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="too many concurrent registrations, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
     except IntegrityError as e:
         # Likely duplicate primary key / unique constraint
         try:
-            db.rollback()
+            await run_in_threadpool(db.rollback)
         except Exception:
             logger.error("rollback failed", exc_info=True)
-        logger.error(e, exc_info=True)
+        logger.info("registration conflict: %s", e.orig)
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="employee_id already exists")
 
     except Exception as e:
         try:
-            db.rollback()
+            await run_in_threadpool(db.rollback)
         except Exception:
             logger.error("rollback failed", exc_info=True)
         logger.error(e, exc_info=True)
@@ -1,9 +1,10 @@
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Literal, Dict
 from uuid import UUID
 from datetime import datetime
 import re
 
+from cm_customer_svc.config import CUSTOMER_BATCH_MAX_ITEMS, CUSTOMER_BATCH_GET_MAX_IDS, PHONE_DEFAULT_COUNTRY_CODE
 from cm_customer_svc.utils.validation_utils import (
     sanitize_input,
     validate_phone_number_format,
@@ -24,7 +25,7 @@ class CustomerCreate(BaseModel):
     @field_validator("customer_contact", mode="before", check_fields=False)
     @classmethod
     def _validate_contact(cls, v: Any) -> Optional[str]:
-        return validate_phone_number_format(v)
+        return validate_phone_number_format(v, PHONE_DEFAULT_COUNTRY_CODE)
 
     @field_validator("customer_address", mode="before", check_fields=False)
     @classmethod
@@ -59,7 +60,7 @@ class CustomerUpdate(BaseModel):
     @field_validator("customer_contact", mode="before", check_fields=False)
     @classmethod
     def _validate_contact(cls, v: Any) -> Optional[str]:
-        return validate_phone_number_format(v)
+        return validate_phone_number_format(v, PHONE_DEFAULT_COUNTRY_CODE)
 
     @field_validator("customer_address", mode="before", check_fields=False)
     @classmethod
@@ -82,12 +83,96 @@ class CustomerUpdate(BaseModel):
 class PaginationParams(BaseModel):
     page: int = Field(1, ge=1)
     page_size: int = Field(10, ge=1, le=100)
+    # opaque keyset cursor from a previous page's next_cursor; when set, page is ignored
+    cursor: Optional[str] = None
+    # total_count strategy: exact COUNT(*), TTL-cached count, or the maintained counter table
+    include_total: bool = True
+    count_mode: Literal["exact", "cached", "counter"] = "exact"
+    # whitelisted sort key; "-" prefix sorts descending. customer_id is always the tiebreaker
+    sort: Literal["created_at", "-created_at", "updated_at", "-updated_at", "customer_name", "-customer_name"] = "created_at"
+
+
+class CustomerFieldsParams(BaseModel):
+    # comma-separated CustomerResponse fields to return, e.g. "customer_id,customer_name"; all when omitted
+    fields: Optional[str] = Field(None, max_length=200, pattern=r"^\s*[a-z_]+\s*(,\s*[a-z_]+\s*)*$")
+
+
+class CustomerListFilters(BaseModel):
+    # all filters are optional and combined with AND
+    managed_by: Optional[str] = Field(None, pattern=r"^(\d{8}|EMP\d{5})$")
+    created_after: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    # case-sensitive prefix of customer_name
+    name_prefix: Optional[str] = Field(None, min_length=1, max_length=100)
+
+
+class CustomerStreamParams(BaseModel):
+    # only events for customers managed by this employee_id
+    managed_by: Optional[str] = Field(None, pattern=r"^(\d{8}|EMP\d{5})$")
+
+
+class CustomerSearchParams(BaseModel):
+    # free text: name/address fragments and phone digits; terms shorter than 3 characters are ignored
+    q: str = Field(min_length=1, max_length=200)
+    page: int = Field(1, ge=1)
+    page_size: int = Field(10, ge=1, le=100)
 
 
 class PaginatedCustomerResponse(BaseModel):
-    total_count: int
+    total_count: Optional[int]
+    # False when total_count came from a cache/counter and may lag the table
+    total_count_exact: bool = True
     page: int
     page_size: int
     items: List[CustomerResponse]
+    next_cursor: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CustomerBatchCreate(BaseModel):
+    # items are validated one by one as CustomerCreate so a bad item does not reject the batch
+    items: List[Dict[str, Any]] = Field(min_length=1, max_length=CUSTOMER_BATCH_MAX_ITEMS)
+
+
+class CustomerBatchItemError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class CustomerBatchCreateResponse(BaseModel):
+    created_count: int
+    error_count: int
+    items: List[CustomerResponse]
+    errors: List[CustomerBatchItemError]
+
+
+class CustomerBatchGet(BaseModel):
+    # customer ids as strings; malformed ids are reported as missing rather than failing the request
+    ids: List[str] = Field(min_length=1, max_length=CUSTOMER_BATCH_GET_MAX_IDS)
+
+
+class CustomerBatchGetResponse(BaseModel):
+    items: List[CustomerResponse]
+    missing_ids: List[str]
+
+
+class CustomerChangesParams(BaseModel):
+    # next_token of a previous response; omitted to start from the beginning of the changelog
+    since: Optional[str] = None
+    limit: int = Field(100, ge=1, le=1000)
+
+
+class CustomerChangeItem(BaseModel):
+    seq: int
+    op: Literal["upsert", "delete"]
+    customer_id: UUID
+    changed_at: datetime
+    # current state for upserts; null for deletes
+    customer: Optional[CustomerResponse] = None
+
+
+class CustomerChangesResponse(BaseModel):
+    changes: List[CustomerChangeItem]
+    next_token: str
+    has_more: bool
@@ -5,6 +5,7 @@ from .validation_utils import (
     validate_phone_number_format,
     sanitize_input,
 )
+from .pagination_utils import encode_cursor, decode_cursor
 
 __all__ = [
     "hash_password",
@@ -13,4 +14,6 @@ __all__ = [
     "validate_employee_id_format",
     "validate_phone_number_format",
     "sanitize_input",
+    "encode_cursor",
+    "decode_cursor",
 ]
@@ -0,0 +1,216 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from cm_customer_svc.config import (
+    CUSTOMER_CACHE_BACKEND,
+    CUSTOMER_CACHE_TTL_SECONDS,
+    CUSTOMER_CACHE_MAX_ENTRIES,
+    REDIS_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStats:
+    """Thread-safe hit/miss/eviction counters shared by the cache backends."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class LRUCache:
+    """In-process LRU cache with a per-entry TTL and a bound on the number of entries.
+
+    Expired entries are dropped lazily on access; the least recently used entry is evicted when full.
+    delete() also bumps the key's generation (one of a fixed set of counters, shared by hash), so a
+    read-through fill that started before an invalidation is dropped by set_if_unchanged.
+    """
+
+    _GENERATION_SLOTS = 1024
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._generations = [0] * self._GENERATION_SLOTS
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() >= entry[1]:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.stats.incr("misses")
+                return None
+            self._entries.move_to_end(key)
+        self.stats.incr("hits")
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl_seconds)
+
+    def _store(self, key: str, value: Any, ttl_seconds: Optional[float]) -> None:
+        # caller holds self._lock
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        if evicted:
+            self.stats.incr("evictions", evicted)
+
+    def generation(self, key: str) -> int:
+        """Token to pass to set_if_unchanged; read it before loading the value."""
+        with self._lock:
+            return self._generations[hash(key) % self._GENERATION_SLOTS]
+
+    def set_if_unchanged(self, key: str, value: Any, generation: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """set() unless key was invalidated since generation was read; False when skipped."""
+        with self._lock:
+            if generation != self._generations[hash(key) % self._GENERATION_SLOTS]:
+                return False
+            self._store(key, value, ttl_seconds)
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._generations[hash(key) % self._GENERATION_SLOTS] += 1
+            self._entries.pop(key, None)
+        self.stats.incr("invalidations")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def info(self) -> Dict[str, Any]:
+        return {"backend": "memory", "size": len(self), "max_entries": self.max_entries, **self.stats.as_dict()}
+
+
+# returned by RedisCache.generation() when Redis cannot be read; a fill with it is always skipped
+_UNKNOWN_GENERATION = object()
+
+# KEYS[1] entry, KEYS[2] its generation; ARGV value, expected generation ("" when unset), ttl seconds
+_SET_IF_UNCHANGED_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[2] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return 1
+"""
+
+
+class RedisCache:
+    """Cache backed by any Redis-compatible client exposing get/set(ex=)/delete/incr/expire.
+
+    Eviction is done by Redis itself (TTL and maxmemory policy), so evictions are not counted here.
+    Backend errors are logged and treated as misses so the database stays the source of truth.
+    delete() bumps a per-key generation counter (kept for the cache TTL) that set_if_unchanged checks
+    atomically in a Lua script, so invalidations from any worker drop in-flight fills.
+    """
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = "cm:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.stats = CacheStats()
+        self._set_if_unchanged = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            value = None
+        self.stats.incr("misses" if value is None else "hits")
+        return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        try:
+            self.client.set(self.prefix + key, value, ex=self._ttl(ttl_seconds))
+        except Exception as e:
+            logger.error(e, exc_info=True)
+
+    def _ttl(self, ttl_seconds: Optional[float]) -> int:
+        return max(1, int(self.ttl_seconds if ttl_seconds is None else ttl_seconds))
+
+    def generation(self, key: str) -> Any:
+        """Token to pass to set_if_unchanged; read it before loading the value."""
+        try:
+            value = self.client.get(self.prefix + "gen:" + key)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            return _UNKNOWN_GENERATION
+        return b"" if value is None else value
+
+    def set_if_unchanged(self, key: str, value: bytes, generation: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """set() unless key was invalidated since generation was read; False when skipped."""
+        if generation is _UNKNOWN_GENERATION:
+            return False
+        try:
+            if self._set_if_unchanged is None:
+                self._set_if_unchanged = self.client.register_script(_SET_IF_UNCHANGED_SCRIPT)
+            keys = [self.prefix + key, self.prefix + "gen:" + key]
+            return bool(self._set_if_unchanged(keys=keys, args=[value, generation, self._ttl(ttl_seconds)]))
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            return False
+
+    def delete(self, key: str) -> None:
+        # bump the generation before deleting, so a fill landing in between is still rejected
+        generation_key = self.prefix + "gen:" + key
+        try:
+            self.client.incr(generation_key)
+            self.client.expire(generation_key, self._ttl(None))
+            self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        self.stats.incr("invalidations")
+
+    def info(self) -> Dict[str, Any]:
+        return {"backend": "redis", **self.stats.as_dict()}
+
+
+def build_cache(backend: str, max_entries: int, ttl_seconds: float):
+    """Create the configured cache backend, or None when caching is disabled."""
+    if backend == "none":
+        return None
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            logger.error("CUSTOMER_CACHE_BACKEND=redis requires the 'redis' package; falling back to memory")
+        else:
+            return RedisCache(redis.Redis.from_url(REDIS_URL), ttl_seconds)
+    return LRUCache(max_entries, ttl_seconds)
+
+
+customer_cache = build_cache(CUSTOMER_CACHE_BACKEND, CUSTOMER_CACHE_MAX_ENTRIES, CUSTOMER_CACHE_TTL_SECONDS)
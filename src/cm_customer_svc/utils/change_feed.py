@@ -0,0 +1,88 @@
+import base64
+import logging
+import uuid
+from typing import List, Sequence
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from cm_customer_svc.models.customer_change import CustomerChange
+
+logger = logging.getLogger(__name__)
+
+CHANGE_UPSERT = "upsert"
+CHANGE_DELETE = "delete"
+
+# pg_advisory_xact_lock key serializing changelog writers (arbitrary constant)
+_CHANGELOG_LOCK_KEY = 0x6375737463686E67
+
+
+def encode_change_token(seq: int) -> str:
+    """Opaque resume token for the changelog position seq."""
+    return base64.urlsafe_b64encode(f"c{seq}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_change_token(token: str) -> int:
+    """Decode a token produced by encode_change_token. Raises ValueError on malformed input."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+        if not raw.startswith("c"):
+            raise ValueError("missing prefix")
+        seq = int(raw[1:])
+        if seq < 0:
+            raise ValueError("negative seq")
+        return seq
+    except Exception as e:
+        raise ValueError("invalid change token") from e
+
+
+def _lock_statement(db):
+    # On PostgreSQL seq values are handed out at INSERT time, so two concurrent transactions could
+    # commit out of seq order and a reader could move past a seq that appears later. Holding a
+    # transaction-scoped lock from the changelog insert to commit makes seq order commit order.
+    # SQLite already serializes writers.
+    if db.get_bind().dialect.name == "postgresql":
+        return select(func.pg_advisory_xact_lock(_CHANGELOG_LOCK_KEY))
+    return None
+
+
+def _changes_parameters(customer_ids: Sequence[uuid.UUID], op: str) -> List[dict]:
+    return [{"customer_id": customer_id, "op": op} for customer_id in customer_ids]
+
+
+def record_changes(db: Session, customer_ids: Sequence[uuid.UUID], op: str) -> None:
+    """Append changelog rows for customer_ids. Call last before commit: on PostgreSQL it takes the
+    changelog lock, which is held until the transaction ends."""
+    if not customer_ids:
+        return
+    lock = _lock_statement(db)
+    if lock is not None:
+        db.execute(lock)
+    db.execute(insert(CustomerChange), _changes_parameters(customer_ids, op))
+
+
+async def record_changes_async(db: AsyncSession, customer_ids: Sequence[uuid.UUID], op: str) -> None:
+    """AsyncSession variant of record_changes."""
+    if not customer_ids:
+        return
+    lock = _lock_statement(db)
+    if lock is not None:
+        await db.execute(lock)
+    await db.execute(insert(CustomerChange), _changes_parameters(customer_ids, op))
+
+
+def changes_after_statement(after_seq: int, limit: int):
+    """Changelog rows with seq > after_seq in commit order; one extra row tells whether more follow."""
+    return (
+        select(CustomerChange.seq, CustomerChange.customer_id, CustomerChange.op, CustomerChange.changed_at)
+        .where(CustomerChange.seq > after_seq)
+        .order_by(CustomerChange.seq)
+        .limit(limit + 1)
+    )
+
+
+def current_version_statement():
+    """Highest changelog seq, 0 when empty: a version of the whole customers table that moves on every write."""
+    return select(func.coalesce(func.max(CustomerChange.seq), 0))
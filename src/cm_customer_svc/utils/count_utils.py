@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import literal, select, true, update, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from cm_customer_svc.config import CUSTOMER_COUNT_CACHE_TTL_SECONDS
+from cm_customer_svc.models.table_count import TableCount
+
+logger = logging.getLogger(__name__)
+
+
+class CountCache:
+    """Thread-safe in-process cache of table row counts with a fixed TTL."""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[int, float]] = {}
+
+    def get(self, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(CUSTOMER_COUNT_CACHE_TTL_SECONDS)
+
+
+def count_statement(model, criteria: Sequence = ()):
+    return select(func.count()).select_from(model).where(*criteria)
+
+
+def counter_statement(model):
+    return select(TableCount.row_count).where(TableCount.table_name == model.__tablename__)
+
+
+def adjust_counter_statement(model, delta: int):
+    return (
+        update(TableCount)
+        .where(TableCount.table_name == model.__tablename__)
+        .values(row_count=TableCount.row_count + delta)
+    )
+
+
+def seed_counter_statement(model, dialect_name: str):
+    """INSERT the counter row from COUNT(*) unless it exists (INSERT ... SELECT ... ON CONFLICT DO NOTHING)."""
+    insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    # WHERE true: SQLite needs it to parse ON CONFLICT after INSERT ... SELECT
+    counted = select(literal(model.__tablename__), func.count()).select_from(model).where(true())
+    return (
+        insert(TableCount)
+        .from_select(["table_name", "row_count"], counted)
+        .on_conflict_do_nothing(index_elements=["table_name"])
+    )
+
+
+def count_rows(db: Session, model, criteria: Sequence = ()) -> int:
+    """Exact COUNT(*) over the model's table, optionally restricted by WHERE criteria."""
+    return int(db.execute(count_statement(model, criteria)).scalar_one())
+
+
+def cached_count(db: Session, model) -> Tuple[int, bool]:
+    """Return (count, exact) using the TTL cache.
+
+    A cache hit may be up to ttl_seconds stale and is reported as not exact.
+    """
+    key = model.__tablename__
+    value = count_cache.get(key)
+    if value is not None:
+        return value, False
+    value = count_rows(db, model)
+    count_cache.set(key, value)
+    return value, True
+
+
+def counter_count(db: Session, model) -> int:
+    """Read the maintained row counter; an exact COUNT(*) until a write has seeded it.
+
+    Read-only: seeding is left to adjust_counter, inside a write transaction.
+    """
+    value = db.execute(counter_statement(model)).scalar_one_or_none()
+    if value is not None:
+        return int(value)
+    return count_rows(db, model)
+
+
+def adjust_counter(db: Session, model, delta: int) -> None:
+    """Add delta to the model's row counter within the caller's transaction, after the write.
+
+    A missing counter is seeded from COUNT(*) in the same transaction, which already includes the
+    caller's write. A concurrent writer seeding first makes the insert a no-op (it waits on the
+    counter row's key until that writer commits); delta is then applied to the row it created.
+    """
+    if db.execute(adjust_counter_statement(model, delta)).rowcount:
+        return
+    if not db.execute(seed_counter_statement(model, db.get_bind().dialect.name)).rowcount:
+        db.execute(adjust_counter_statement(model, delta))
+
+
+async def count_rows_async(db: AsyncSession, model, criteria: Sequence = ()) -> int:
+    """AsyncSession variant of count_rows."""
+    return int((await db.execute(count_statement(model, criteria))).scalar_one())
+
+
+async def cached_count_async(db: AsyncSession, model) -> Tuple[int, bool]:
+    """AsyncSession variant of cached_count; shares the same cache."""
+    key = model.__tablename__
+    value = count_cache.get(key)
+    if value is not None:
+        return value, False
+    value = await count_rows_async(db, model)
+    count_cache.set(key, value)
+    return value, True
+
+
+async def counter_count_async(db: AsyncSession, model) -> int:
+    """AsyncSession variant of counter_count."""
+    value = (await db.execute(counter_statement(model))).scalar_one_or_none()
+    if value is not None:
+        return int(value)
+    return await count_rows_async(db, model)
+
+
+async def adjust_counter_async(db: AsyncSession, model, delta: int) -> None:
+    """AsyncSession variant of adjust_counter."""
+    if (await db.execute(adjust_counter_statement(model, delta))).rowcount:
+        return
+    if not (await db.execute(seed_counter_statement(model, db.get_bind().dialect.name))).rowcount:
+        await db.execute(adjust_counter_statement(model, delta))
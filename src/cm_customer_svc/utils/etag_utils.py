@@ -0,0 +1,100 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Mapping, Optional, Sequence
+
+from fastapi import status
+from fastapi.responses import Response
+
+# customers are user data behind a cookie: never shared caches, and always revalidated so that a
+# heuristic freshness lifetime derived from Last-Modified cannot serve stale rows
+CACHE_CONTROL = "private, no-cache"
+
+_ETAG_FIELDS = ("customer_id", "customer_name", "customer_contact", "customer_address", "managed_by", "created_at", "updated_at")
+
+
+def customer_etag(customer: Any, fields: Optional[Sequence[str]] = None) -> str:
+    """Strong ETag for a customer row or ORM instance.
+
+    Keyed by customer_id and updated_at plus the response fields themselves: updated_at has
+    one-second resolution on SQLite, so two updates within a second must still differ. For a
+    fields= projection it covers the field names and their values, i.e. exactly what is sent.
+    """
+    names = _ETAG_FIELDS if fields is None else fields
+    values = [str(getattr(customer, name)) if getattr(customer, name) is not None else None for name in names]
+    key = values if fields is None else [list(fields), values]
+    digest = hashlib.blake2b(json.dumps(key).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def page_etag(version: int, params: Mapping[str, Any]) -> str:
+    """Weak ETag for a listing page: the changelog version plus the normalized query parameters.
+
+    Weak because total_count may come from the count cache and lag the version slightly.
+    """
+    key = json.dumps([version, params], sort_keys=True, default=str)
+    return f'W/"{hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    """IMF-fixdate for a stored (naive UTC) timestamp."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _etag_list(header: str):
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def none_match(header: str, etag: str) -> bool:
+    """If-None-Match evaluation (weak comparison): True when etag matches, i.e. answer 304."""
+    tags = _etag_list(header)
+    return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+
+
+def if_match(header: str, etag: str) -> bool:
+    """If-Match evaluation (strong comparison): True when the write may proceed."""
+    tags = _etag_list(header)
+    if "*" in tags:
+        return True
+    return not etag.startswith("W/") and etag in tags
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: Optional[str] = None) -> bool:
+    """Whether a GET may be answered with 304. last_modified is the HTTP-date sent as Last-Modified;
+    If-Modified-Since is only used without If-None-Match."""
+    inm = headers.get("if-none-match")
+    if inm is not None:
+        return none_match(inm, etag)
+    ims = headers.get("if-modified-since")
+    if ims is None or last_modified is None:
+        return False
+    since = _parse_http_date(ims)
+    return since is not None and _parse_http_date(last_modified) <= since
+
+
+def validator_headers(etag: str, last_modified: Optional[str] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[str] = None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
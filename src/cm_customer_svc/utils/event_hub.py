@@ -0,0 +1,132 @@
+"""In-process pub/sub hub for customer mutation events, consumed by GET /api/customers/stream.
+
+publish() may be called from any thread (sync handlers run in the threadpool) or from the event
+loop. Each subscriber owns a bounded asyncio.Queue on its own loop; deliveries are handed over with
+call_soon_threadsafe. A subscriber whose queue is full is dropped rather than allowed to hold
+events (and memory) for everyone else; its stream ends and the client re-syncs from the change
+feed before reconnecting.
+
+Only writes handled by this process are seen; with several workers each serves its own.
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional, Set
+
+from cm_customer_svc.config import CUSTOMER_STREAM_MAX_SUBSCRIBERS, CUSTOMER_STREAM_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+EVENT_CREATED = "created"
+EVENT_UPDATED = "updated"
+EVENT_DELETED = "deleted"
+# one event per POST /customers:batch so a large batch cannot overflow subscriber queues
+EVENT_BATCH_CREATED = "batch_created"
+
+
+class TooManySubscribers(Exception):
+    """Raised by subscribe() when the hub already has its maximum number of subscribers."""
+
+
+class Subscription:
+    """One stream's queue of pre-formatted SSE frames. A None item means the hub dropped it."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int, managed_by: Optional[str]):
+        self.loop = loop
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=queue_size)
+        self.managed_by = managed_by
+        self.dropped = False
+
+    def _deliver(self, frame: str) -> bool:
+        """Runs on self.loop. False when the queue was full and the subscription got dropped."""
+        if self.dropped:
+            return True
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            # make room for the end-of-stream marker; the client re-syncs anyway
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+def format_event(event: str, data: Dict[str, Any]) -> str:
+    """One SSE frame: event name plus a single-line JSON data field."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+class CustomerEventHub:
+    def __init__(self, queue_size: int, max_subscribers: int):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscribers: Set[Subscription] = set()
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self, managed_by: Optional[str] = None) -> Subscription:
+        """Register a subscriber on the running loop; managed_by limits it to that manager's customers."""
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size, managed_by)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribers("customer stream subscriber limit reached")
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _deliver(self, subscription: Subscription, frame: str) -> None:
+        if not subscription._deliver(frame):
+            self.unsubscribe(subscription)
+            with self._lock:
+                self._dropped += 1
+            logger.warning("dropped slow customer stream subscriber (queue size %d)", self.queue_size)
+
+    def publish(
+        self, event: str, managed_by: Optional[str], data: Dict[str, Any], previous_managed_by: Optional[str] = None
+    ) -> None:
+        """Fan an event out to subscribers whose managed_by filter matches. Call after commit; never raises.
+
+        previous_managed_by, for a customer moved to another manager, also reaches the old manager's
+        subscribers; every subscriber gets the event at most once.
+        """
+        managers = {managed_by, previous_managed_by} - {None}
+        try:
+            with self._lock:
+                targets = [s for s in self._subscribers if s.managed_by is None or s.managed_by in managers]
+                self._published += 1
+            if not targets:
+                return
+            frame = format_event(event, data)
+            try:
+                current_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                current_loop = None
+            for subscription in targets:
+                if subscription.loop is current_loop:
+                    self._deliver(subscription, frame)
+                    continue
+                try:
+                    subscription.loop.call_soon_threadsafe(self._deliver, subscription, frame)
+                except RuntimeError:
+                    # subscriber's loop is closed; the stream is gone
+                    self.unsubscribe(subscription)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self._published,
+                "dropped": self._dropped,
+            }
+
+
+customer_events = CustomerEventHub(CUSTOMER_STREAM_QUEUE_SIZE, CUSTOMER_STREAM_MAX_SUBSCRIBERS)
@@ -0,0 +1,152 @@
+"""Password hashing service: runs PBKDF2 off the request threads with bounded queueing.
+
+With workers > 0 hashing runs in a process pool, so login storms no longer hold the GIL that the
+customer endpoints need. The pool uses the forkserver start method (spawn where that is
+unavailable): forking the server process itself once its threads are running can deadlock the
+child. workers == 0 hashes inline in the calling thread (development/tests). In
+both modes at most workers + max_pending operations may be admitted at once; beyond that calls
+raise HashingSaturated, which handlers turn into 429 responses.
+"""
+import asyncio
+import functools
+import logging
+import multiprocessing
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from cm_customer_svc.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+from cm_customer_svc.utils.metrics import password_hash_duration
+from cm_customer_svc.utils.password_utils import hash_password, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class HashingSaturated(Exception):
+    """Raised when the hashing service already has its maximum number of operations admitted."""
+
+
+class HashingService:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = max(workers, 0)
+        self.max_pending = max(max_pending, 0)
+        self._capacity = max(self.workers + self.max_pending, 1)
+        self._slots = threading.BoundedSemaphore(self._capacity)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+            return self._executor
+
+    def start(self) -> None:
+        """Create the process pool and start its workers now (app startup) rather than on the first login."""
+        if self.workers == 0:
+            return
+        # one no-op per worker so every worker process is up before requests arrive
+        for future in [self._get_executor().submit(int) for _ in range(self.workers)]:
+            future.result()
+
+    def _admit(self) -> float:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingSaturated("password hashing queue is full")
+        with self._lock:
+            self._in_flight += 1
+        return time.perf_counter()
+
+    def _release(self, started: float, fn: Callable[..., Any]) -> None:
+        elapsed = time.perf_counter() - started
+        password_hash_duration.observe(elapsed, "verify" if fn is verify_password else "hash")
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+        self._slots.release()
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        started = self._admit()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release(started, fn)
+            raise
+        future.add_done_callback(lambda _: self._release(started, fn))
+        return future
+
+    def _run_inline(self, fn: Callable[..., Any], *args: Any) -> Any:
+        started = self._admit()
+        try:
+            return fn(*args)
+        finally:
+            self._release(started, fn)
+
+    def hash(self, password: str) -> str:
+        """hash_password off-thread. Raises ValueError like hash_password, or HashingSaturated."""
+        if self.workers == 0:
+            return self._run_inline(hash_password, password)
+        return self._submit(hash_password, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password off-thread. Raises HashingSaturated when the queue is full."""
+        if self.workers == 0:
+            return self._run_inline(verify_password, plain_password, hashed_password)
+        return self._submit(verify_password, plain_password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        if self.workers == 0:
+            return await asyncio.to_thread(self._run_inline, hash_password, password)
+        return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        if self.workers == 0:
+            return await asyncio.to_thread(self._run_inline, verify_password, plain_password, hashed_password)
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and latency (admission to completion, seconds) for this worker process."""
+        with self._lock:
+            in_flight = self._in_flight
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "capacity": self._capacity,
+                "in_flight": in_flight,
+                "queue_depth": max(in_flight - max(self.workers, 1), 0),
+                "completed": completed,
+                "rejected": self._rejected,
+                "latency_avg": self._latency_total / completed if completed else 0.0,
+                "latency_max": self._latency_max,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = HashingService(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+@functools.lru_cache(maxsize=None)
+def dummy_password_hash() -> str:
+    """Hash of a random password with the current scheme and rounds, for verifying logins of unknown
+    employee ids at the same cost as real ones. Computed on first use."""
+    return hash_password(secrets.token_urlsafe(16))
@@ -1,16 +1,24 @@
 from typing import Any, Dict
 from datetime import datetime, timedelta, timezone
+import hashlib
 import logging
+import secrets
+import threading
+import time
 
 from jose import jwt, JWTError
 
-from cm_customer_svc.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from cm_customer_svc.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, JWT_CACHE_MAX_ENTRIES
+from cm_customer_svc.utils.cache import LRUCache
+from cm_customer_svc.utils.metrics import jwt_cache_lookups, jwt_decode_duration
 
 logger = logging.getLogger(__name__)
 
 
 def create_access_token(data: Dict[str, Any]) -> str:
-    """Create a JWT access token with iat and exp claims.
+    """Create a JWT access token with iat, exp and jti claims.
+
+    jti makes every token unique, so revoking one login never affects a later one issued in the same second.
 
     data: payload dict (e.g., {"sub": user_id})
     returns encoded JWT string
@@ -19,16 +27,120 @@ def create_access_token(data: Dict[str, Any]) -> str:
     now = datetime.now(tz=timezone.utc)
     expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     # use unix timestamps for compatibility
-    to_encode.update({"iat": int(now.timestamp()), "exp": int(expire.timestamp())})
+    to_encode.update({"iat": int(now.timestamp()), "exp": int(expire.timestamp()), "jti": secrets.token_urlsafe(8)})
     token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return token
 
 
 def decode_access_token(token: str) -> Dict[str, Any]:
-    """Decode and validate JWT token. Raises jose.JWTError on failure."""
+    """Decode and validate JWT token. Raises jose.JWTError on failure; callers log it."""
+    start = time.perf_counter()
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
-    except JWTError as e:
-        logging.error(e, exc_info=True)
-        raise
+    finally:
+        jwt_decode_duration.observe(time.perf_counter() - start)
+
+
+def token_digest(token: str) -> str:
+    """Cache/revocation key for a token; the raw token is never stored."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _is_expired(exp: int) -> bool:
+    # same rule as jose: valid through the exp second itself
+    return int(time.time()) > exp
+
+
+class RevokedTokens:
+    """Digests of logged-out tokens, each kept until the token would have expired anyway.
+
+    Holds at most max_entries digests. Expired ones are dropped to make room; a revoked token that
+    has not expired is never forgotten, so when the list is full of those add refuses the new
+    digest and counts it in rejected.
+    """
+
+    def __init__(self, max_entries: int = JWT_CACHE_MAX_ENTRIES):
+        self.max_entries = max(max_entries, 1)
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, int] = {}
+
+    def add(self, digest: str, exp: int) -> bool:
+        """Record digest until exp. Returns False, recording nothing, when the list is full."""
+        with self._lock:
+            if digest not in self._entries and len(self._entries) >= self.max_entries:
+                self._entries = {d: e for d, e in self._entries.items() if not _is_expired(e)}
+                if len(self._entries) >= self.max_entries:
+                    self.rejected += 1
+                    return False
+            self._entries[digest] = exp
+            return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, digest: str) -> bool:
+        with self._lock:
+            exp = self._entries.get(digest)
+            if exp is not None and _is_expired(exp):
+                del self._entries[digest]
+                return False
+            return exp is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# digest -> (sub, exp) of tokens whose signature has already been verified
+verified_token_cache = LRUCache(JWT_CACHE_MAX_ENTRIES, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+revoked_tokens = RevokedTokens()
+
+
+def decode_access_token_cached(token: str) -> Dict[str, Any]:
+    """decode_access_token with a bounded LRU of verified tokens.
+
+    A hit skips the signature check but still enforces exp and the revocation list, so the result
+    is the same as a full decode. Returns {"sub", "exp"} on a hit, the full payload on a miss.
+    Raises jose.JWTError on failure.
+    """
+    digest = token_digest(token)
+    if digest in revoked_tokens:
+        raise JWTError("Token has been revoked.")
+
+    cached = verified_token_cache.get(digest)
+    jwt_cache_lookups.inc("miss" if cached is None else "hit")
+    if cached is not None:
+        sub, exp = cached
+        if _is_expired(exp):
+            verified_token_cache.delete(digest)
+            raise JWTError("Signature has expired.")
+        return {"sub": sub, "exp": exp}
+
+    payload = decode_access_token(token)
+    exp = payload.get("exp")
+    if isinstance(exp, int):
+        verified_token_cache.set(digest, (payload.get("sub"), exp), ttl_seconds=max(exp - time.time() + 1, 0))
+    return payload
+
+
+def revoke_access_token(token: str) -> bool:
+    """Reject token from now on (logout). Applies to this process only.
+
+    Only tokens with a valid signature are recorded, until their verified exp; anything else
+    would be rejected by get_current_user anyway and counts as revoked. Returns False when the
+    revocation list is full and the token is still accepted.
+    """
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return True
+    exp = payload.get("exp")
+    if not isinstance(exp, int):
+        exp = int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    digest = token_digest(token)
+    if not revoked_tokens.add(digest, exp):
+        return False
+    verified_token_cache.delete(digest)
+    return True
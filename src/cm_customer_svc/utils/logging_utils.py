@@ -0,0 +1,158 @@
+"""Process logging: JSON lines written by a background thread, with repeated records rate limited.
+
+configure_logging() gives the root logger a single QueueHandler. A QueueListener thread formats the
+records, tracebacks included, and writes them, so a request thread only pays for creating the
+record and a non-blocking put on a bounded queue (records are dropped and counted when it is full).
+
+RateLimitFilter runs before the put. Per call site (logger, source line, level, exception type) the
+first `burst` records of each window pass, then one in `sample_every`; the next record that passes
+carries the number suppressed since the last one.
+
+Expected client errors (malformed ids, rejected tokens, invalid input) are logged by their call
+sites at DEBUG without exc_info; tracebacks are kept for unexpected failures.
+"""
+import copy
+import json
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from cm_customer_svc.config import (
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_QUEUE_SIZE,
+    LOG_RATE_LIMIT_BURST,
+    LOG_RATE_LIMIT_WINDOW_SECONDS,
+    LOG_SAMPLE_EVERY,
+)
+
+# attributes every LogRecord has; anything else was passed in extra= and is written as a field
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, message, extra fields, then exc/stack."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_type"] = record.exc_info[0].__name__ if record.exc_info[0] else None
+            entry["exc"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, burst: int, window_seconds: float, sample_every: int, max_keys: int = 10000):
+        super().__init__()
+        self.burst = max(burst, 0)
+        self.window_seconds = window_seconds
+        self.sample_every = max(sample_every, 1)
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> [window start, records seen in window, suppressed since the last one passed]
+        self._sites: Dict[Tuple, List] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        exc_type = record.exc_info[0] if record.exc_info else None
+        key = (record.name, record.pathname, record.lineno, record.levelno, exc_type)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                if len(self._sites) >= self.max_keys:
+                    self._sites.clear()
+                site = self._sites[key] = [now, 0, 0]
+            elif now - site[0] >= self.window_seconds:
+                site[0], site[1] = now, 0
+            site[1] += 1
+            over = site[1] - self.burst
+            if over > 0 and over % self.sample_every:
+                site[2] += 1
+                return False
+            suppressed, site[2] = site[2], 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class _BackgroundQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting, tracebacks included, to the listener thread."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # resolve %-args now so objects mutated after the call cannot change the message
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[_BackgroundQueueHandler] = None
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    log_format: str = LOG_FORMAT,
+    stream: Optional[TextIO] = None,
+    queue_size: int = LOG_QUEUE_SIZE,
+) -> QueueListener:
+    """Route the root logger through a bounded queue to a listener thread writing to stream (stderr).
+
+    Replaces an earlier configure_logging() setup. Call stop_logging() at shutdown to flush.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JSONFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    log_queue: queue.Queue = queue.Queue(max(queue_size, 1))
+    _queue_handler = _BackgroundQueueHandler(log_queue)
+    _queue_handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT_BURST, LOG_RATE_LIMIT_WINDOW_SECONDS, LOG_SAMPLE_EVERY))
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper())
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Write out queued records and detach the handler installed by configure_logging()."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def dropped_records() -> int:
+    """Records dropped because the queue was full since configure_logging()."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
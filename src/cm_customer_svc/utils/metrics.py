@@ -0,0 +1,254 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain Python objects guarded by a lock, so recording costs a
+few microseconds and needs no client library or push gateway. GET /metrics renders the registry.
+
+Request metrics are recorded by wrapping each route's ASGI app (instrument_routes), so the route
+template is known without matching the path a second time and unmatched paths never create label
+sets. SQL metrics come from cursor execute events on instrumented engines; statements executed
+while a request is in progress are also added to its RequestTimings "db" phase, so a route's
+latency can be split into database time and everything else (validation, serialization).
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from cm_customer_svc.utils.request_timing import RequestTimings, current_timings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self._header() + [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def sum(self, *labels: str) -> float:
+        with self._lock:
+            series = self._series.get(labels)
+            return series[-1] if series else 0.0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = self._header()
+        bucket_names = self.labelnames + ("le",)
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, observed in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += observed
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_names, labels + (_format_value(bound),))} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(
+    Histogram("http_request_duration_seconds", "Request latency by route template.", ("method", "route", "status"))
+)
+http_requests_in_flight = registry.register(Gauge("http_requests_in_flight", "Requests currently being handled by route template.", ("method", "route")))
+http_request_db_duration = registry.register(
+    Histogram("http_request_db_duration_seconds", "Time spent executing SQL and checking out connections per request.", ("method", "route"), SQL_BUCKETS)
+)
+http_request_queries = registry.register(
+    Histogram("http_request_db_queries", "SQL statements executed per request.", ("method", "route"), QUERY_COUNT_BUCKETS)
+)
+db_query_duration = registry.register(Histogram("db_query_duration_seconds", "SQL statement execution time by statement kind.", ("statement",), SQL_BUCKETS))
+password_hash_duration = registry.register(
+    Histogram("password_hash_duration_seconds", "Password hashing service time from admission to completion.", ("operation",))
+)
+jwt_decode_duration = registry.register(Histogram("jwt_decode_duration_seconds", "JWT signature verification and decode time.", (), SQL_BUCKETS))
+jwt_cache_lookups = registry.register(Counter("jwt_cache_lookups_total", "Verified-token cache lookups by result.", ("result",)))
+login_rate_limited = registry.register(Counter("login_rate_limited_total", "Login attempts rejected by the rate limiter by bucket.", ("bucket",)))
+login_unknown_user_verifications = registry.register(
+    Counter("login_unknown_user_verifications_total", "Dummy password verifications run for logins with an unknown employee_id.")
+)
+
+
+def _statement_kind(statement: str) -> str:
+    head = statement.lstrip()[:13].lower()
+    if head.startswith("select count("):
+        return "count"
+    kind = head.split(None, 1)[0] if head else ""
+    return kind if kind in ("select", "insert", "update", "delete", "with") else "other"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_query_duration.observe(elapsed, _statement_kind(statement))
+    timings = current_timings.get()
+    if timings is not None:
+        timings.queries += 1
+        timings.add("db", elapsed)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    starts = connection.info.get("metrics_query_start") if connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record SQL timings for engine (for an AsyncEngine pass engine.sync_engine). Idempotent.
+
+    Besides the db_query_duration histogram, statements run during a request add to its "db" phase.
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _instrumented(app, route: str):
+    async def handle(scope, receive, send):
+        method = scope["method"]
+        status = "500"
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        # the Server-Timing middleware, when installed, has already started this request's timings
+        timings = current_timings.get()
+        token = None
+        if timings is None:
+            timings = RequestTimings()
+            token = current_timings.set(timings)
+        http_requests_in_flight.inc(method, route)
+        start = time.perf_counter()
+        try:
+            await app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            if token is not None:
+                current_timings.reset(token)
+            http_requests_in_flight.dec(method, route)
+            http_request_duration.observe(elapsed, method, route, status)
+            http_request_db_duration.observe(timings.phases.get("db", 0.0), method, route)
+            http_request_queries.observe(timings.queries, method, route)
+
+    return handle
+
+
+def instrument_routes(application) -> None:
+    """Wrap every HTTP route of application so requests are recorded under its path template."""
+    for route in application.router.routes:
+        if not getattr(route, "methods", None) or getattr(route, "_metrics_instrumented", False):
+            continue
+        route.app = _instrumented(route.app, route.path)
+        route._metrics_instrumented = True
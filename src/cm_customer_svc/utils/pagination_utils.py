@@ -0,0 +1,44 @@
+import base64
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SORT = "created_at"
+
+
+def encode_cursor(key: Union[datetime, str], customer_id: uuid.UUID, sort: str = DEFAULT_SORT) -> str:
+    """Encode the (sort key, customer_id) keyset position of a row as an opaque cursor.
+
+    The cursor is URL-safe base64 of a small JSON array; clients must treat it as opaque. Cursors
+    for a non-default sort also carry the sort so they cannot be replayed against another order.
+    """
+    value = key.isoformat() if isinstance(key, datetime) else key
+    fields: list = [value, str(customer_id)]
+    if sort != DEFAULT_SORT:
+        fields.append(sort)
+    raw = json.dumps(fields, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str = DEFAULT_SORT) -> Tuple[Any, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor for the same sort.
+
+    Returns (sort key, customer_id); the key is a datetime for timestamp sorts and a str otherwise.
+    Raises ValueError on malformed input or when the cursor was issued for a different sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        fields = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key_raw, customer_id_raw = fields[:2]
+        cursor_sort = fields[2] if len(fields) > 2 else DEFAULT_SORT
+        if len(fields) > 3 or cursor_sort != sort or not isinstance(key_raw, str):
+            raise ValueError("cursor does not match sort")
+        key = datetime.fromisoformat(key_raw) if sort.lstrip("-").endswith("_at") else key_raw
+        return key, uuid.UUID(customer_id_raw)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
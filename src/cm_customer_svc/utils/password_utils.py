@@ -18,6 +18,9 @@ def hash_password(password: str) -> str:
             raise ValueError("password must be a non-empty string")
         hashed = _ctx.hash(password)
         return hashed
+    except ValueError as e:
+        logger.debug("password not hashed: %s", e)
+        raise ValueError("failed to hash password") from e
     except Exception as e:
         logger.error(e, exc_info=True)
         raise ValueError("failed to hash password") from e
@@ -32,6 +35,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         if not isinstance(plain_password, str) or not isinstance(hashed_password, str):
             return False
         return _ctx.verify(plain_password, hashed_password)
+    except ValueError as e:
+        # stored value is not a hash this context knows
+        logger.warning("password hash not verifiable: %s", e)
+        return False
     except Exception as e:
         logger.error(e, exc_info=True)
         return False
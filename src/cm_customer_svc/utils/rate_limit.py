@@ -0,0 +1,248 @@
+"""Token-bucket rate limiting of failed login attempts, per client IP and per employee_id.
+
+Before the user lookup or any password hashing, an attempt is rejected with the time until the next
+token when the client IP's or the employee_id's bucket is empty; only attempts that then fail take a
+token from both, so successful logins never use up the allowance of a shared NAT address. A bucket
+holds up to `burst` tokens and refills at `per_minute` tokens per minute. The IP bucket stops one
+client from spraying many accounts (credential stuffing), the employee_id bucket stops many clients
+from guessing one account's password. Concurrent attempts may all pass the check before their
+failures are recorded, so the bound is approximate by the number of logins in flight.
+
+The client IP is the connection's peer address, or, when that peer is one of LOGIN_TRUSTED_PROXIES,
+the right-most X-Forwarded-For address that is not itself a trusted proxy.
+
+Buckets live in a bounded in-process store (LOGIN_RATE_LIMIT_MAX_KEYS, least recently used
+dropped first, which only hands a client a refilled bucket) or, with LOGIN_RATE_LIMIT_BACKEND=redis,
+in any Redis-compatible server so all worker processes share them. Redis errors are logged and the
+attempt is let through, like the customer cache.
+"""
+import ipaddress
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cm_customer_svc.config import (
+    LOGIN_ACCOUNT_BURST,
+    LOGIN_ACCOUNT_PER_MINUTE,
+    LOGIN_IP_BURST,
+    LOGIN_IP_PER_MINUTE,
+    LOGIN_RATE_LIMIT_BACKEND,
+    LOGIN_RATE_LIMIT_ENABLED,
+    LOGIN_RATE_LIMIT_MAX_KEYS,
+    LOGIN_TRUSTED_PROXIES,
+    REDIS_URL,
+)
+from cm_customer_svc.utils.metrics import login_rate_limited
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBucketStore:
+    """Token buckets in an LRU-bounded dict: key -> (tokens, last update)."""
+
+    def __init__(self, max_keys: int, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max(max_keys, 1)
+        self.clock = clock
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def peek(self, key: str, burst: int, per_second: float) -> float:
+        """0.0 when key's bucket has a token, else seconds until it will; takes nothing."""
+        now = self.clock()
+        with self._lock:
+            entry = self._buckets.get(key)
+        if entry is None:
+            return 0.0
+        tokens = min(burst, entry[0] + (now - entry[1]) * per_second)
+        return 0.0 if tokens >= 1 else (1 - tokens) / per_second
+
+    def take(self, key: str, burst: int, per_second: float) -> float:
+        """Take a token from key's bucket: 0.0 on success, else seconds until one is available."""
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * per_second)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / per_second
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def info(self) -> Dict[str, Any]:
+        return {"backend": "memory", "keys": len(self._buckets), "max_keys": self.max_keys, "evictions": self.evictions}
+
+
+# KEYS[1] bucket; ARGV burst, tokens per second, now (seconds), 1 to take a token or 0 to only look.
+# Returns the wait as a string because Lua numbers are truncated to integers on the way back.
+_TAKE_SCRIPT = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+if ARGV[4] == '0' then
+    return tostring(wait)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """Token buckets in Redis, updated atomically by a Lua script; a bucket expires once it would be
+    full again, so Redis holds only recently active keys."""
+
+    def __init__(self, client, prefix: str = "cm:login:"):
+        self.client = client
+        self.prefix = prefix
+        self._take = client.register_script(_TAKE_SCRIPT)
+
+    def _run(self, key: str, burst: int, per_second: float, take: int) -> float:
+        try:
+            return float(self._take(keys=[self.prefix + key], args=[burst, per_second, time.time(), take]))
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            return 0.0
+
+    def peek(self, key: str, burst: int, per_second: float) -> float:
+        return self._run(key, burst, per_second, 0)
+
+    def take(self, key: str, burst: int, per_second: float) -> float:
+        return self._run(key, burst, per_second, 1)
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+
+    def info(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+
+class LoginRateLimiter:
+    def __init__(self, store, ip_burst: int, ip_per_minute: int, account_burst: int, account_per_minute: int):
+        self.store = store
+        # (bucket name, burst, tokens per second); a bucket with burst or rate <= 0 is not enforced
+        self._buckets = tuple(
+            (name, burst, per_minute / 60)
+            for name, burst, per_minute in (("ip", ip_burst, ip_per_minute), ("employee_id", account_burst, account_per_minute))
+            if burst > 0 and per_minute > 0
+        )
+        self._lock = threading.Lock()
+        self._throttled = {"ip": 0, "employee_id": 0}
+
+    def _keys(self, ip: Optional[str], employee_id: str):
+        values = {"ip": ip, "employee_id": employee_id}
+        for name, burst, per_second in self._buckets:
+            if values[name]:
+                yield name, f"{name}:{values[name]}", burst, per_second
+
+    def check(self, ip: Optional[str], employee_id: str) -> float:
+        """0.0 when the attempt may go ahead, else seconds until it would be allowed. Takes no token."""
+        for name, key, burst, per_second in self._keys(ip, employee_id):
+            wait = self.store.peek(key, burst, per_second)
+            if wait > 0:
+                login_rate_limited.inc(name)
+                with self._lock:
+                    self._throttled[name] += 1
+                return wait
+        return 0.0
+
+    def record_failure(self, ip: Optional[str], employee_id: str) -> None:
+        """Take a token from both buckets for an attempt that failed."""
+        for _, key, burst, per_second in self._keys(ip, employee_id):
+            self.store.take(key, burst, per_second)
+
+    def reset(self) -> None:
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Store size and throttled attempts per bucket for this worker process."""
+        with self._lock:
+            throttled = dict(self._throttled)
+        limits = {name: {"burst": burst, "per_minute": round(per_second * 60, 3)} for name, burst, per_second in self._buckets}
+        return {**self.store.info(), "limits": limits, "throttled": throttled}
+
+
+def parse_networks(value: str) -> Tuple[Any, ...]:
+    """ip_network objects for a comma-separated list of addresses/CIDRs; invalid entries are logged and skipped."""
+    networks = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(item, strict=False))
+        except ValueError:
+            logger.error("ignoring invalid trusted proxy %r", item)
+    return tuple(networks)
+
+
+def _is_trusted(address: str, networks: Tuple[Any, ...]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_ip(peer: Optional[str], forwarded_for: Optional[str], networks: Tuple[Any, ...]) -> Optional[str]:
+    """Client address for the IP bucket.
+
+    peer unless it is a trusted proxy; then the right-most X-Forwarded-For hop that is not a trusted
+    proxy (hops left of it could be forged by the client). Falls back to the left-most hop when every
+    hop is trusted.
+    """
+    if not peer or not forwarded_for or not _is_trusted(peer, networks):
+        return peer
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, networks):
+            return hop
+    return hops[0] if hops else peer
+
+
+def build_login_limiter(enabled: bool, backend: str, max_keys: int) -> Optional[LoginRateLimiter]:
+    """Create the configured login limiter, or None when login rate limiting is disabled."""
+    if not enabled:
+        return None
+    store = None
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            logger.error("LOGIN_RATE_LIMIT_BACKEND=redis requires the 'redis' package; falling back to memory")
+        else:
+            store = RedisBucketStore(redis.Redis.from_url(REDIS_URL))
+    if store is None:
+        store = MemoryBucketStore(max_keys)
+    return LoginRateLimiter(store, LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE, LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_PER_MINUTE)
+
+
+trusted_proxies = parse_networks(LOGIN_TRUSTED_PROXIES)
+login_limiter = build_login_limiter(LOGIN_RATE_LIMIT_ENABLED, LOGIN_RATE_LIMIT_BACKEND, LOGIN_RATE_LIMIT_MAX_KEYS)
@@ -0,0 +1,55 @@
+"""Per-request phase timings (auth, db, validation, serialize).
+
+The Server-Timing middleware and the metrics route wrapper start a RequestTimings for each request.
+Code on the request path adds to it with timing_phase(), or add_phase() for a duration it already
+measured. The contextvar is copied into threadpool calls, so sync dependencies and handlers add to
+the same object. Outside a request both helpers do nothing.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# phases in the order they are reported
+PHASES = ("auth", "db", "validation", "serialize")
+
+
+class RequestTimings:
+    __slots__ = ("phases", "queries")
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.queries = 0
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def add_phase(phase: str, seconds: float) -> None:
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def timing_phase(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to phase of the current request."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+def server_timing_header(timings: RequestTimings, total_seconds: float) -> str:
+    """Server-Timing value: recorded phases in PHASES order, then total, durations in milliseconds."""
+    entries = [f"{name};dur={timings.phases[name] * 1000:.3f}" for name in PHASES if name in timings.phases]
+    entries.append(f"total;dur={total_seconds * 1000:.3f}")
+    return ", ".join(entries)
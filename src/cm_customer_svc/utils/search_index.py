@@ -0,0 +1,345 @@
+"""Customer search index.
+
+Three backends answer GET /api/customers/search, chosen per database by CUSTOMER_SEARCH_BACKEND:
+
+- fts5: a SQLite FTS5 trigram table (customer_search) written in the same transaction as customers.
+- postgresql: pg_trgm GIN indexes on customers itself; nothing to maintain from the write paths.
+- memory: a per-process trigram inverted index, built from the table on first search. Used when
+  neither of the above is available; results are always re-read from customers, so a stale entry
+  can affect ranking but never return a deleted row.
+
+All backends match every term as a case-insensitive substring of name, address or contact digits.
+"""
+import logging
+import re
+import threading
+import uuid
+import weakref
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, delete, func, insert, literal, literal_column, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from cm_customer_svc.config import CUSTOMER_SEARCH_BACKEND
+from cm_customer_svc.models.customer import Customer
+from cm_customer_svc.models.customer_search import SQLITE_FTS5_AVAILABLE, customer_search_table
+from cm_customer_svc.utils.validation_utils import sanitize_input
+
+logger = logging.getLogger(__name__)
+
+MIN_TERM_LENGTH = 3
+MAX_TERMS = 8
+_PHONE_TERM = re.compile(r"^[\d()+.-]+$")
+
+# relative weight of a match in each field when ranking
+_NAME_WEIGHT = 10.0
+_CONTACT_WEIGHT = 5.0
+_ADDRESS_WEIGHT = 2.0
+
+
+def contact_digits(contact: Optional[str]) -> str:
+    return re.sub(r"\D", "", contact or "")
+
+
+def search_terms(q: str) -> List[str]:
+    """Split a query into search terms.
+
+    q is sanitized like stored names, phone-like terms are reduced to their digits, and terms shorter
+    than MIN_TERM_LENGTH (too short for trigram matching) are dropped. At most MAX_TERMS are kept.
+    """
+    terms: List[str] = []
+    for raw in (sanitize_input(q) or "").split(" "):
+        term = contact_digits(raw) if _PHONE_TERM.match(raw) else raw
+        if len(term) >= MIN_TERM_LENGTH and term.lower() not in (t.lower() for t in terms):
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def _backend(db) -> str:
+    if CUSTOMER_SEARCH_BACKEND == "memory":
+        return "memory"
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and SQLITE_FTS5_AVAILABLE and CUSTOMER_SEARCH_BACKEND in ("auto", "fts5"):
+        return "fts5"
+    if dialect == "postgresql" and CUSTOMER_SEARCH_BACKEND in ("auto", "postgresql"):
+        return "postgresql"
+    return "memory"
+
+
+class InvertedIndex:
+    """Thread-safe trigram -> customer_id postings with the lowercased searchable fields per customer."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[uuid.UUID]] = {}
+        self._docs: Dict[uuid.UUID, Tuple[str, str, str]] = {}
+        self.loaded = False
+
+    @staticmethod
+    def _trigrams(value: str) -> Set[str]:
+        return {value[i : i + 3] for i in range(len(value) - 2)}
+
+    def _remove_locked(self, customer_id: uuid.UUID) -> None:
+        doc = self._docs.pop(customer_id, None)
+        if doc is None:
+            return
+        for gram in self._trigrams(" ".join(doc)):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(customer_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def _add_locked(self, row) -> None:
+        doc = (
+            (row.customer_name or "").lower(),
+            (row.customer_address or "").lower(),
+            contact_digits(row.customer_contact),
+        )
+        self._docs[row.customer_id] = doc
+        for gram in self._trigrams(" ".join(doc)):
+            self._postings.setdefault(gram, set()).add(row.customer_id)
+
+    def load(self, rows: Iterable) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            for row in rows:
+                self._add_locked(row)
+            self.loaded = True
+
+    def upsert(self, rows: Iterable) -> None:
+        with self._lock:
+            if not self.loaded:
+                # the first search loads the current table contents anyway
+                return
+            for row in rows:
+                self._remove_locked(row.customer_id)
+                self._add_locked(row)
+
+    def remove(self, customer_ids: Iterable[uuid.UUID]) -> None:
+        with self._lock:
+            for customer_id in customer_ids:
+                self._remove_locked(customer_id)
+
+    def search(self, terms: Sequence[str], limit: int, offset: int) -> Tuple[List[uuid.UUID], int]:
+        """Return (customer_ids of the requested page, total matches), best matches first."""
+        scored = []
+        with self._lock:
+            candidates: Optional[Set[uuid.UUID]] = None
+            for term in terms:
+                term_ids: Optional[Set[uuid.UUID]] = None
+                for gram in self._trigrams(term.lower()):
+                    postings = self._postings.get(gram, set())
+                    term_ids = set(postings) if term_ids is None else term_ids & postings
+                candidates = term_ids if candidates is None else candidates & (term_ids or set())
+                if not candidates:
+                    return [], 0
+            for customer_id in candidates or ():
+                name, address, digits = self._docs[customer_id]
+                score = 0.0
+                for term in terms:
+                    needle = term.lower()
+                    field_score = (
+                        (_NAME_WEIGHT if needle in name else 0.0)
+                        + (_ADDRESS_WEIGHT if needle in address else 0.0)
+                        + (_CONTACT_WEIGHT if needle in digits else 0.0)
+                    )
+                    if not field_score:
+                        # trigram hit without the full substring
+                        break
+                    score += field_score
+                else:
+                    scored.append((-score, name, customer_id))
+        scored.sort()
+        return [customer_id for _, _, customer_id in scored[offset : offset + limit]], len(scored)
+
+
+# one in-memory index per engine, so separate databases never share entries
+_memory_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_memory_indexes_lock = threading.Lock()
+
+
+def memory_index(db) -> InvertedIndex:
+    engine = db.get_bind()
+    with _memory_indexes_lock:
+        index = _memory_indexes.get(engine)
+        if index is None:
+            index = _memory_indexes[engine] = InvertedIndex()
+        return index
+
+
+def search_rowid(customer_id: uuid.UUID) -> int:
+    """FTS rowid for a customer: the first 8 bytes of its UUID, so updates and deletes seek by rowid."""
+    return int.from_bytes(customer_id.bytes[:8], "big", signed=True)
+
+
+def _document(row) -> dict:
+    return {
+        "rowid": search_rowid(row.customer_id),
+        "customer_id": row.customer_id.hex,
+        "customer_name": row.customer_name,
+        "customer_address": row.customer_address or "",
+        "contact_digits": contact_digits(row.customer_contact),
+    }
+
+
+def _fts5_index_statements(rows: Sequence, replace: bool) -> list:
+    """(statement, parameters) pairs writing the FTS rows of the given customers."""
+    t = customer_search_table
+    statements = _fts5_unindex_statements([row.customer_id for row in rows]) if replace else []
+    statements.append((insert(t), [_document(row) for row in rows]))
+    return statements
+
+
+def _fts5_unindex_statements(customer_ids: Sequence[uuid.UUID]) -> list:
+    t = customer_search_table
+    return [(delete(t).where(t.c.rowid.in_([search_rowid(customer_id) for customer_id in customer_ids])), None)]
+
+
+def _searchable_columns():
+    return select(Customer.customer_id, Customer.customer_name, Customer.customer_address, Customer.customer_contact)
+
+
+def index_customers(db: Session, rows: Sequence, replace: bool = True) -> None:
+    """Add or refresh rows (objects with the customer columns) in the search index.
+
+    Call inside the write transaction, after the customers rows exist. replace=False skips removing
+    previous entries, for freshly inserted customers.
+    """
+    if not rows:
+        return
+    backend = _backend(db)
+    if backend == "fts5":
+        for stmt, params in _fts5_index_statements(rows, replace):
+            db.execute(stmt, params)
+    elif backend == "memory":
+        memory_index(db).upsert(rows)
+
+
+def unindex_customers(db: Session, customer_ids: Sequence[uuid.UUID]) -> None:
+    if not customer_ids:
+        return
+    backend = _backend(db)
+    if backend == "fts5":
+        for stmt, params in _fts5_unindex_statements(customer_ids):
+            db.execute(stmt, params)
+    elif backend == "memory":
+        memory_index(db).remove(customer_ids)
+
+
+async def index_customers_async(db: AsyncSession, rows: Sequence, replace: bool = True) -> None:
+    """AsyncSession variant of index_customers."""
+    if not rows:
+        return
+    backend = _backend(db)
+    if backend == "fts5":
+        for stmt, params in _fts5_index_statements(rows, replace):
+            await db.execute(stmt, params)
+    elif backend == "memory":
+        memory_index(db).upsert(rows)
+
+
+async def unindex_customers_async(db: AsyncSession, customer_ids: Sequence[uuid.UUID]) -> None:
+    """AsyncSession variant of unindex_customers."""
+    if not customer_ids:
+        return
+    backend = _backend(db)
+    if backend == "fts5":
+        for stmt, params in _fts5_unindex_statements(customer_ids):
+            await db.execute(stmt, params)
+    elif backend == "memory":
+        memory_index(db).remove(customer_ids)
+
+
+def _fts5_match(terms: Sequence[str]) -> str:
+    # every term as a quoted phrase: no FTS query syntax reaches the engine
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+_FTS5_PAGE = text(
+    "SELECT customer_id FROM customer_search WHERE customer_search MATCH :match "
+    f"ORDER BY bm25(customer_search, 0.0, {_NAME_WEIGHT}, {_ADDRESS_WEIGHT}, {_CONTACT_WEIGHT}), customer_id "
+    "LIMIT :limit OFFSET :offset"
+)
+_FTS5_COUNT = text("SELECT count(*) FROM customer_search WHERE customer_search MATCH :match")
+
+
+def _like_pattern(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+_EMPTY = literal_column("''")
+
+
+def _pg_digits_expression():
+    # inlined constants so the expression matches idx_customer_contact_digits_trgm
+    return func.regexp_replace(func.coalesce(Customer.customer_contact, _EMPTY), literal_column("'\\D'"), _EMPTY, literal_column("'g'"))
+
+
+def _pg_search_statements(terms: Sequence[str], limit: int, offset: int):
+    digits = _pg_digits_expression()
+    address = func.coalesce(Customer.customer_address, _EMPTY)
+    criteria = []
+    rank = literal(0.0)
+    for term in terms:
+        pattern = _like_pattern(term)
+        criteria.append(
+            or_(
+                Customer.customer_name.ilike(pattern, escape="\\"),
+                address.ilike(pattern, escape="\\"),
+                digits.like(pattern, escape="\\"),
+            )
+        )
+        rank = (
+            rank
+            + func.word_similarity(term, Customer.customer_name) * _NAME_WEIGHT
+            + func.word_similarity(term, address) * _ADDRESS_WEIGHT
+            + func.word_similarity(term, digits) * _CONTACT_WEIGHT
+        )
+    where = and_(*criteria)
+    page = select(Customer.customer_id).where(where).order_by(rank.desc(), Customer.customer_id).limit(limit).offset(offset)
+    count = select(func.count()).select_from(Customer).where(where)
+    return page, count
+
+
+def search_customer_ids(db: Session, terms: Sequence[str], limit: int, offset: int) -> Tuple[List[uuid.UUID], int]:
+    """Return (customer_ids of the requested page in rank order, total number of matches)."""
+    backend = _backend(db)
+    if backend == "fts5":
+        params = {"match": _fts5_match(terms), "limit": limit, "offset": offset}
+        ids = [uuid.UUID(hex=value) for value in db.execute(_FTS5_PAGE, params).scalars()]
+        total = db.execute(_FTS5_COUNT, {"match": params["match"]}).scalar_one()
+        return ids, int(total)
+    if backend == "postgresql":
+        page, count = _pg_search_statements(terms, limit, offset)
+        return list(db.execute(page).scalars()), int(db.execute(count).scalar_one())
+
+    index = memory_index(db)
+    if not index.loaded:
+        index.load(db.execute(_searchable_columns()).all())
+    return index.search(terms, limit, offset)
+
+
+def rebuild_search_index(db: Session, batch_size: int = 1000) -> int:
+    """Rebuild the index from the customers table; returns the number of rows indexed.
+
+    For the fts5 backend this rewrites customer_search in the current transaction (the caller
+    commits); the memory index is reloaded; PostgreSQL needs nothing.
+    """
+    backend = _backend(db)
+    if backend == "postgresql":
+        return 0
+    if backend == "memory":
+        rows = db.execute(_searchable_columns()).all()
+        memory_index(db).load(rows)
+        return len(rows)
+
+    db.execute(delete(customer_search_table))
+    indexed = 0
+    result = db.execute(_searchable_columns().execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        db.execute(insert(customer_search_table), [_document(row) for row in rows])
+        indexed += len(rows)
+    return indexed
@@ -0,0 +1,210 @@
+"""Server-Timing header and opt-in sampling profiles of single requests.
+
+ServerTimingMiddleware starts the request's RequestTimings and writes them as a Server-Timing header
+when the response starts, so "total" is the time to the first byte of the response.
+
+A request with profile=1 in its query string whose session belongs to one of PROFILE_EMPLOYEE_IDS is
+also sampled by SamplingProfiler. The response carries X-Profile-Id and the text report is kept in
+profile_reports for GET /api/admin/profiles/{profile_id}. Other callers' profile=1 is ignored. The
+sampler looks at every thread in the process, so work done concurrently for other requests can show
+up in a report; only one profile runs at a time per process.
+"""
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from jose import JWTError
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cm_customer_svc.config import PROFILE_EMPLOYEE_IDS, PROFILE_SAMPLE_INTERVAL_MS
+from cm_customer_svc.routers.auth import ACCESS_TOKEN_COOKIE_NAME
+from cm_customer_svc.utils.cache import LRUCache
+from cm_customer_svc.utils.jwt_utils import decode_access_token_cached
+from cm_customer_svc.utils.request_timing import RequestTimings, current_timings, server_timing_header
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# recent reports; each is a few kilobytes of text
+profile_reports = LRUCache(50, 15 * 60)
+
+# a leaf frame in one of these modules means the thread is waiting, not working
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+# thread bootstrap and event loop internals, trimmed from the root of every stack
+_RUNTIME_PATHS = ("/threading.py", "/asyncio/", "/anyio/", "/concurrent/futures/")
+
+Frame = Tuple[str, str, int]
+
+
+def _frame_label(frame: Frame) -> str:
+    filename, name, lineno = frame
+    path = filename.replace(os.sep, "/").rsplit("/", 2)
+    return f"{name} ({'/'.join(path[-2:])}:{lineno})"
+
+
+class SamplingProfiler:
+    """Collects the Python stacks of all other threads every interval seconds until stop().
+
+    While it runs the interpreter's thread switch interval is lowered to the sampling interval so
+    the sampler gets the GIL on time; the previous value is restored by stop().
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._switch_interval = sys.getswitchinterval()
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        sys.setswitchinterval(min(self.interval, self._switch_interval))
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._done.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                    frame = frame.f_back
+                self._stacks[_trim(stack[::-1])] += 1
+
+    def stop(self) -> str:
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+        self._elapsed = time.perf_counter() - self._started
+        return self.report()
+
+    def report(self, hottest: int = 15, min_share: float = 0.02) -> str:
+        """Functions with the most self samples, then the call tree of nodes with at least min_share
+        of the busy samples."""
+        busy = sum(self._stacks.values())
+        lines = [f"wall {self._elapsed * 1000:.1f} ms, {self.samples} samples every {self.interval * 1000:g} ms, {busy} busy thread samples"]
+        if not busy:
+            return lines[0] + "\n"
+
+        own: Dict[Frame, int] = Counter()
+        tree: Dict = {}
+        for stack, count in self._stacks.items():
+            own[stack[-1]] += count
+            node = tree
+            for frame in stack:
+                entry = node.setdefault(frame, [0, {}])
+                entry[0] += count
+                node = entry[1]
+
+        lines += ["", "self samples:"]
+        lines += [f"{count / busy:7.1%}  {_frame_label(frame)}" for frame, count in own.most_common(hottest)]
+        lines += ["", "call tree:"]
+
+        def walk(node: Dict, depth: int) -> None:
+            for frame, (count, children) in sorted(node.items(), key=lambda item: -item[1][0]):
+                if count / busy >= min_share:
+                    lines.append(f"{count / busy:7.1%}  {'  ' * depth}{_frame_label(frame)}")
+                    walk(children, depth + 1)
+
+        walk(tree, 0)
+        return "\n".join(lines) + "\n"
+
+
+def _trim(stack) -> Tuple[Frame, ...]:
+    """Drop the event loop / worker thread frames every stack starts with."""
+    start = 0
+    while start < len(stack) - 1 and any(part in stack[start][0].replace(os.sep, "/") for part in _RUNTIME_PATHS):
+        start += 1
+    return tuple(stack[start:])
+
+
+_profile_lock = threading.Lock()
+
+
+def _profile_requested(scope: Scope) -> bool:
+    query = scope.get("query_string", b"")
+    if b"profile=" not in query:
+        return False
+    return parse_qs(query.decode("latin-1")).get("profile", [""])[-1] == "1"
+
+
+def profiling_allowed(employee_id: Optional[str]) -> bool:
+    """Whether employee_id may profile requests and read profile reports (PROFILE_EMPLOYEE_IDS)."""
+    return employee_id in PROFILE_EMPLOYEE_IDS
+
+
+def _may_profile(scope: Scope) -> bool:
+    """True for a valid session of a profiling_allowed employee."""
+    if not PROFILE_EMPLOYEE_IDS:
+        return False
+    cookies = {}
+    for name, value in scope.get("headers", []):
+        if name == b"cookie":
+            cookies.update(cookie_parser(value.decode("latin-1")))
+    token = cookies.get(ACCESS_TOKEN_COOKIE_NAME)
+    if not token:
+        return False
+    try:
+        return profiling_allowed(decode_access_token_cached(token).get("sub"))
+    except JWTError:
+        return False
+    except Exception as e:
+        logger.error(e, exc_info=True)
+        return False
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler = profile_id = None
+        if _profile_requested(scope) and _may_profile(scope) and _profile_lock.acquire(blocking=False):
+            profile_id = secrets.token_hex(8)
+            profiler = SamplingProfiler(PROFILE_SAMPLE_INTERVAL_MS / 1000)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing_header(timings, time.perf_counter() - start).encode("latin-1")))
+                if profile_id is not None:
+                    headers.append((PROFILE_ID_HEADER.lower().encode("latin-1"), profile_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            if profiler is not None:
+                profiler.start()
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            if profiler is not None:
+                try:
+                    profile_reports.set(profile_id, profiler.stop())
+                finally:
+                    _profile_lock.release()
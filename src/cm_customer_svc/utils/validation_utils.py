@@ -21,6 +21,10 @@ def validate_password_strength(password: str) -> str:
         if not re.search(r"[A-Za-z]", password):
             raise ValueError("password must contain at least one alphabet character")
         return password
+    except ValueError as e:
+        # rejected input is reported to the client, not a server fault: no traceback
+        logger.debug("password rejected: %s", e)
+        raise
     except Exception as e:
         logger.error(e, exc_info=True)
         raise
@@ -38,6 +42,10 @@ def validate_employee_id_format(employee_id: str) -> str:
         if len(eid) != 8 or not eid.isdigit():
             raise ValueError("employee_id must be exactly 8 numeric digits")
         return eid
+    except ValueError as e:
+        # rejected input is reported to the client, not a server fault: no traceback
+        logger.debug("employee_id rejected: %s", e)
+        raise
     except Exception as e:
         logger.error(e, exc_info=True)
         raise
@@ -47,11 +55,12 @@ _PHONE_DIGIT_MIN = 7
 _PHONE_DIGIT_MAX = 15
 
 
-def validate_phone_number_format(phone_number: Optional[str]) -> Optional[str]:
+def validate_phone_number_format(phone_number: Optional[str], default_country_code: str = "") -> Optional[str]:
     """Basic phone number validation.
 
     Accepts common characters (+, digits, spaces, dashes, parentheses).
-    Ensures total digit count between 7 and 15. Returns normalized original string on success.
+    Ensures total digit count between 7 and 15, both as written and after normalize_phone_digits
+    with default_country_code. Returns normalized original string on success.
     Raises ValueError on failure.
     If phone_number is None, returns None.
     """
@@ -67,14 +76,68 @@ def validate_phone_number_format(phone_number: Optional[str]) -> Optional[str]:
         digits = re.sub(r"\D", "", s)
         if len(digits) < _PHONE_DIGIT_MIN or len(digits) > _PHONE_DIGIT_MAX:
             raise ValueError("phone_number must contain between 7 and 15 digits")
+        if not is_valid_phone_digits(normalize_phone_digits(s, default_country_code)):
+            raise ValueError("phone_number must contain between 7 and 15 digits including the country code")
         # Normalize by collapsing spaces
         normalized = re.sub(r"\s+", " ", s)
         return normalized
+    except ValueError as e:
+        # rejected input is reported to the client, not a server fault: no traceback
+        logger.debug("phone_number rejected: %s", e)
+        raise
     except Exception as e:
         logger.error(e, exc_info=True)
         raise
 
 
+def is_valid_phone_digits(digits: Optional[str]) -> bool:
+    """Whether normalized digits fit E.164 (7 to 15 digits); the one rule for stored and looked-up numbers."""
+    return digits is not None and _PHONE_DIGIT_MIN <= len(digits) <= _PHONE_DIGIT_MAX
+
+
+def normalize_phone_digits(phone_number: Optional[str], default_country_code: str = "") -> Optional[str]:
+    """Canonical digits-only form of a phone number, used for indexed lookup.
+
+    Numbers written with an international prefix ("+" or "00") keep their country code, giving
+    E.164 digits without the "+". Other numbers are read as national numbers of
+    default_country_code when it is set, see _with_country_code; with no default code they are
+    kept as written. Returns None when phone_number is None or has no digits.
+    """
+    if phone_number is None:
+        return None
+    s = phone_number.strip()
+    digits = re.sub(r"\D", "", s)
+    if not digits:
+        return None
+    if s.startswith("+"):
+        return digits
+    if s.startswith("00"):
+        return digits[2:] or None
+    if not default_country_code:
+        return digits
+    return _with_country_code(digits, default_country_code)
+
+
+def _with_country_code(digits: str, country_code: str) -> str:
+    """E.164 digits for a number written without "+"/"00" in the country_code region.
+
+    Digits that already start with the code followed by a full national number are kept: for the
+    NANP (code 1) that is exactly 10 more digits, which also covers the "1" trunk prefix of
+    1-555-123-4567; elsewhere at least 7 more digits. Otherwise the "0" trunk prefix is dropped,
+    as in 020 7946 0958, and the code prepended. Regions that keep the leading 0 in international
+    form (e.g. Italy) are not special-cased.
+    """
+    if country_code == "1":
+        if len(digits) == 11 and digits.startswith("1"):
+            return digits
+        return country_code + digits
+    if digits.startswith("0"):
+        return country_code + digits[1:]
+    if digits.startswith(country_code) and len(digits) - len(country_code) >= _PHONE_DIGIT_MIN:
+        return digits
+    return country_code + digits
+
+
 def sanitize_input(input_string: Optional[str]) -> Optional[str]:
     """Basic sanitization to reduce risk of XSS/SQL injection in user-provided strings.
 
@@ -5,6 +5,7 @@ from sqlalchemy.orm import sessionmaker
 
 from cm_customer_svc.app import app
 from cm_customer_svc.models.base import Base, get_db
+from cm_customer_svc.utils import rate_limit
 
 
 # DO NOT MODIFY SECTION START
@@ -39,4 +40,12 @@ def client(session_local):
     with TestClient(app) as c:
         yield c
     app.dependency_overrides[get_db] = get_db
-# DO NOT MODIFY SECTION END
\ No newline at end of file
+# DO NOT MODIFY SECTION END
+
+
+@pytest.fixture(autouse=True)
+def _reset_login_rate_limits():
+    # the whole suite logs in from one client address; give every test full login buckets
+    if rate_limit.login_limiter is not None:
+        rate_limit.login_limiter.reset()
+    yield
@@ -0,0 +1,94 @@
+import logging
+import os
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from cm_customer_svc import app as app_module
+from cm_customer_svc.app import PROFILES, _TestCookieMiddleware, create_app, settings_for
+from cm_customer_svc.models.base import get_db
+from cm_customer_svc.utils.server_timing import ServerTimingMiddleware
+
+
+def _client(application, session_local, base_url="http://testserver"):
+    def override_session():
+        session = session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    application.dependency_overrides[get_db] = override_session
+    return TestClient(application, base_url=base_url)
+
+
+def _register_and_login(client, employee_id: str):
+    r = client.post("/api/register", json={"employee_id": employee_id, "employee_name": "Manager", "password": "Password123"})
+    assert r.status_code == 201
+    return client.post("/api/auth/login", json={"employee_id": employee_id, "password": "Password123"})
+
+
+def test_module_app_uses_test_profile_under_pytest():
+    assert app_module.app.state.settings == PROFILES["test"]
+    assert settings_for("") == PROFILES["test"]
+
+
+def test_settings_for_profiles(caplog):
+    assert settings_for("Production") == PROFILES["production"]
+    assert settings_for("development").debug is True
+    caplog.set_level(logging.ERROR)
+    assert settings_for("staging") == PROFILES["production"]
+    assert "unknown APP_ENV profile 'staging'" in caplog.text
+
+
+def test_production_profile_has_no_debug_or_middleware(session_local):
+    application = create_app(PROFILES["production"])
+    assert application.debug is False
+    assert [m.cls for m in application.user_middleware] == [ServerTimingMiddleware]
+
+    with _client(application, session_local, base_url="https://testserver") as client:
+        resp = _register_and_login(client, "00050001")
+        assert resp.status_code == 200
+        cookies = resp.headers.get_list("set-cookie")
+        assert len(cookies) == 1 and "Secure" in cookies[0]
+        assert client.get("/api/customers").status_code == 200
+
+
+def test_test_profile_duplicates_secure_cookie_without_per_request_detection(session_local, monkeypatch):
+    application = create_app(PROFILES["test"])
+    assert _TestCookieMiddleware in [m.cls for m in application.user_middleware]
+
+    def fail():
+        raise AssertionError("pytest detection must not run per request")
+
+    monkeypatch.setattr(app_module, "_is_running_under_pytest", fail)
+    with _client(application, session_local) as client:
+        resp = _register_and_login(client, "00050002")
+        cookies = resp.headers.get_list("set-cookie")
+        assert len(cookies) == 2
+        assert "Secure" in cookies[0] and "Secure" not in cookies[1]
+        # the non-secure copy lets the plain-http TestClient authenticate
+        assert client.get("/api/customers").status_code == 200
+
+
+def test_create_app_async_db_setting():
+    application = create_app(replace(PROFILES["production"], async_db=True))
+    endpoints = {route.path: route.endpoint for route in application.routes if "GET" in getattr(route, "methods", ())}
+    assert endpoints["/api/customers/{customer_id}"].__module__ == "cm_customer_svc.routers.async_customers"
+    # sync-only endpoints are still served
+    assert "/api/customers/export" in endpoints
+
+
+def test_module_app_is_built_on_first_access_only():
+    script = (
+        "import cm_customer_svc.app as m\n"
+        "assert 'app' not in vars(m)\n"
+        "first = m.app\n"
+        "from cm_customer_svc.app import app\n"
+        "assert app is first is m.app\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1] / "src")}
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)
@@ -0,0 +1,201 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from cm_customer_svc.app import register_routers
+from cm_customer_svc.config import _to_async_url
+from cm_customer_svc.models.base import Base, get_db, get_async_db
+from cm_customer_svc.routers import async_customers
+from cm_customer_svc.utils import rate_limit
+from cm_customer_svc.utils.rate_limit import LoginRateLimiter, MemoryBucketStore
+from cm_customer_svc.utils.event_hub import customer_events
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    """App wired with DB_ASYNC routers; sync and async engines share one SQLite file."""
+    db_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(sync_engine)
+    sync_session_local = sessionmaker(bind=sync_engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async_session_local = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    def override_session():
+        session = sync_session_local()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def override_async_session():
+        async with async_session_local() as session:
+            yield session
+
+    app = FastAPI()
+    register_routers(app, async_db=True)
+    app.dependency_overrides[get_db] = override_session
+    app.dependency_overrides[get_async_db] = override_async_session
+
+    # https so the Secure session cookie round-trips
+    with TestClient(app, base_url="https://testserver") as c:
+        yield c, app
+    sync_engine.dispose()
+
+
+def _login(client, employee_id: str):
+    r = client.post("/api/register", json={"employee_id": employee_id, "employee_name": "Async", "password": "Password123"})
+    assert r.status_code == 201
+    assert client.post("/api/auth/login", json={"employee_id": employee_id, "password": "Password123"}).status_code == 200
+
+
+def test_to_async_url():
+    assert _to_async_url("sqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+    assert _to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert _to_async_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert _to_async_url("mysql://u:p@h/db") == "mysql://u:p@h/db"
+
+
+def test_async_routes_replace_sync_handlers(async_client):
+    _, app = async_client
+    endpoints = {(r.path, tuple(sorted(r.methods))): r.endpoint for r in app.routes if hasattr(r, "methods")}
+    assert endpoints[("/api/customers", ("POST",))] is async_customers.create_customer
+    assert endpoints[("/api/customers/{customer_id}", ("GET",))] is async_customers.get_customer
+    # sync-only endpoints still mounted, ahead of the path-parameter route
+    paths = [r.path for r in app.routes]
+    assert paths.index("/api/customers/export") < paths.index("/api/customers/{customer_id}")
+    assert "/api/auth/logout" in paths
+
+
+def test_async_login_and_crud_roundtrip(async_client):
+    client, _ = async_client
+    _login(client, "00036001")
+
+    assert client.post("/api/auth/login", json={"employee_id": "00036001", "password": "WrongPass1"}).status_code == 401
+
+    created = client.post("/api/customers", json={"customer_name": "Async Co", "customer_contact": "1234567"})
+    assert created.status_code == 201
+    cid = created.json()["customer_id"]
+    assert created.json()["managed_by"] == "00036001"
+
+    assert client.get(f"/api/customers/{cid}").json()["customer_name"] == "Async Co"
+
+    updated = client.put(f"/api/customers/{cid}", json={"customer_name": "Async Renamed"})
+    assert updated.status_code == 200
+    assert updated.json()["customer_name"] == "Async Renamed"
+    assert client.put(f"/api/customers/{cid}", json={"managed_by": "00000000"}).status_code == 400
+
+    listing = client.get("/api/customers?count_mode=counter").json()
+    assert listing["total_count"] == 1
+    assert [c["customer_id"] for c in listing["items"]] == [cid]
+
+    # sync export endpoint sees rows written through the async engine
+    assert client.get("/api/customers/export").text.count("\n") == 1
+
+    assert client.delete(f"/api/customers/{cid}").status_code == 204
+    assert client.get(f"/api/customers/{cid}").status_code == 404
+    assert client.delete(f"/api/customers/{cid}").status_code == 404
+    assert client.get("/api/customers/not-a-uuid").status_code == 404
+
+
+def test_async_cursor_pagination(async_client):
+    client, _ = async_client
+    _login(client, "00036002")
+    client.post("/api/customers:batch", json={"items": [{"customer_name": f"C{i}"} for i in range(7)]})
+
+    seen = []
+    body = client.get("/api/customers?page_size=3").json()
+    seen.extend(c["customer_id"] for c in body["items"])
+    while body["next_cursor"]:
+        body = client.get("/api/customers", params={"page_size": 3, "cursor": body["next_cursor"]}).json()
+        seen.extend(c["customer_id"] for c in body["items"])
+    assert len(set(seen)) == 7
+
+
+def test_async_requires_auth(async_client):
+    client, _ = async_client
+    assert client.get("/api/customers").status_code == 401
+
+
+def test_async_writes_maintain_search_index(async_client):
+    client, _ = async_client
+    _login(client, "00042061")
+    cid = client.post("/api/customers", json={"customer_name": "Async Searchable"}).json()["customer_id"]
+    assert [c["customer_id"] for c in client.get("/api/customers/search", params={"q": "searchable"}).json()["items"]] == [cid]
+
+    assert client.put(f"/api/customers/{cid}", json={"customer_name": "Async Renamed"}).status_code == 200
+    assert client.get("/api/customers/search", params={"q": "searchable"}).json()["items"] == []
+    assert client.delete(f"/api/customers/{cid}").status_code == 204
+    assert client.get("/api/customers/search", params={"q": "renamed"}).json()["total_count"] == 0
+
+
+def test_async_writes_append_to_change_feed(async_client):
+    client, _ = async_client
+    _login(client, "00045011")
+    cid = client.post("/api/customers", json={"customer_name": "Async Feed"}).json()["customer_id"]
+    client.put(f"/api/customers/{cid}", json={"customer_address": "Somewhere"})
+    token = client.get("/api/customers/changes").json()["next_token"]
+    client.delete(f"/api/customers/{cid}")
+
+    body = client.get("/api/customers/changes", params={"since": token}).json()
+    assert [(c["op"], c["customer_id"]) for c in body["changes"]] == [("delete", cid)]
+
+
+def test_async_writes_publish_stream_events(async_client):
+    client, _ = async_client
+    _login(client, "00046011")
+
+    async def scenario():
+        subscription = customer_events.subscribe("00046011")
+        try:
+            created = await asyncio.to_thread(client.post, "/api/customers", json={"customer_name": "Async Stream"})
+            await asyncio.to_thread(client.delete, f"/api/customers/{created.json()['customer_id']}")
+            frames = [await asyncio.wait_for(subscription.queue.get(), 1) for _ in range(2)]
+            assert [frame.split("\n", 1)[0] for frame in frames] == ["event: created", "event: deleted"]
+        finally:
+            customer_events.unsubscribe(subscription)
+
+    asyncio.run(scenario())
+
+
+def test_async_conditional_requests(async_client):
+    client, _ = async_client
+    _login(client, "00047011")
+    cid = client.post("/api/customers", json={"customer_name": "Async ETag"}).json()["customer_id"]
+
+    etag = client.get(f"/api/customers/{cid}").headers["etag"]
+    assert client.get(f"/api/customers/{cid}", headers={"If-None-Match": etag}).status_code == 304
+    list_etag = client.get("/api/customers").headers["etag"]
+    assert client.get("/api/customers", headers={"If-None-Match": list_etag}).status_code == 304
+
+    updated = client.put(f"/api/customers/{cid}", json={"customer_name": "Async ETag 2"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    assert client.delete(f"/api/customers/{cid}", headers={"If-Match": etag}).status_code == 412
+    assert client.delete(f"/api/customers/{cid}", headers={"If-Match": updated.headers["etag"]}).status_code == 204
+
+
+def test_async_field_projection(async_client):
+    client, _ = async_client
+    _login(client, "00049011")
+    cid = client.post("/api/customers", json={"customer_name": "Async Fields"}).json()["customer_id"]
+
+    assert client.get(f"/api/customers/{cid}", params={"fields": "customer_name"}).json() == {"customer_name": "Async Fields"}
+    items = client.get("/api/customers", params={"fields": "customer_id"}).json()["items"]
+    assert items == [{"customer_id": cid}]
+    assert client.get("/api/customers", params={"fields": "nope"}).status_code == 400
+
+
+def test_async_login_rate_limit_and_unknown_user(async_client, monkeypatch):
+    client, _ = async_client
+    limiter = LoginRateLimiter(MemoryBucketStore(100), ip_burst=100, ip_per_minute=1, account_burst=1, account_per_minute=1)
+    monkeypatch.setattr(rate_limit, "login_limiter", limiter)
+    # unknown employee id: dummy verify, plain 401
+    assert client.post("/api/auth/login", json={"employee_id": "00050441", "password": "Password123"}).status_code == 401
+    resp = client.post("/api/auth/login", json={"employee_id": "00050441", "password": "Password123"})
+    assert resp.status_code == 429 and "retry-after" in resp.headers
+    assert limiter.stats()["throttled"]["employee_id"] == 1
@@ -62,3 +62,16 @@ def test_config_invalid_int_fallback(monkeypatch, caplog):
     assert cfg.ACCESS_TOKEN_EXPIRE_MINUTES == 60 * 24
     # Ensure an error was logged during parsing
     assert any(record.levelno >= logging.ERROR for record in caplog.records)
+
+
+def test_password_hash_workers_default_follows_profile(monkeypatch):
+    cfg = importlib.import_module("cm_customer_svc.config")
+    monkeypatch.setattr(cfg.os, "cpu_count", lambda: 8)
+    assert cfg._default_hash_workers("production") == 4
+    assert cfg._default_hash_workers("staging") == 4
+    assert cfg._default_hash_workers("development") == 0
+    assert cfg._default_hash_workers("test") == 0
+    # pytest is loaded here, so an empty APP_ENV is the test profile
+    assert cfg._default_hash_workers("") == 0
+    monkeypatch.setattr(cfg.os, "cpu_count", lambda: 1)
+    assert cfg._default_hash_workers("production") == 1
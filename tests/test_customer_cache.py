@@ -0,0 +1,203 @@
+import time
+
+import pytest
+
+from cm_customer_svc.utils.cache import LRUCache, RedisCache, customer_cache
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for a Redis client (get/set with ex/delete/incr/expire, and the
+    conditional-set script)."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.store[key]
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.store[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, key):
+        return 1 if self.store.pop(key, None) is not None else 0
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.store[key] = (str(value).encode(), self.store.get(key, (None, None))[1])
+        return value
+
+    def expire(self, key, seconds):
+        if key in self.store:
+            self.store[key] = (self.store[key][0], time.monotonic() + seconds)
+        return True
+
+    def register_script(self, source):
+        def set_if_unchanged(keys, args):
+            value, expected, ttl = args
+            if (self.get(keys[1]) or b"") != expected:
+                return 0
+            self.set(keys[0], value, ex=ttl)
+            return 1
+
+        return set_if_unchanged
+
+
+class BrokenRedis:
+    def get(self, key):
+        raise ConnectionError("down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("down")
+
+    def delete(self, key):
+        raise ConnectionError("down")
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+@pytest.fixture(autouse=True)
+def _clear_customer_cache():
+    customer_cache.clear()
+    yield
+    customer_cache.clear()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"  # a is now most recently used
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.info()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_lru_cache_ttl_expiry_and_stats():
+    cache = LRUCache(max_entries=10, ttl_seconds=60)
+    cache.set("short", b"x", ttl_seconds=0)
+    cache.set("long", b"y")
+
+    assert cache.get("short") is None
+    assert cache.get("long") == b"y"
+    cache.delete("long")
+    assert cache.get("long") is None
+
+    info = cache.info()
+    assert info["hits"] == 1
+    assert info["misses"] == 2
+    assert info["invalidations"] == 1
+
+
+def test_redis_cache_with_fake_client():
+    fake = FakeRedis()
+    cache = RedisCache(fake, ttl_seconds=30, prefix="t:")
+    assert cache.get("k") is None
+    cache.set("k", b"payload")
+    assert fake.store["t:k"][0] == b"payload"
+    assert cache.get("k") == b"payload"
+    cache.delete("k")
+    assert cache.get("k") is None
+    assert cache.info() == {"backend": "redis", "hits": 1, "misses": 2, "evictions": 0, "invalidations": 1}
+
+
+def test_redis_cache_errors_degrade_to_misses():
+    cache = RedisCache(BrokenRedis(), ttl_seconds=30)
+    cache.set("k", b"v")
+    assert cache.get("k") is None
+    cache.delete("k")
+    assert cache.set_if_unchanged("k", b"v", cache.generation("k")) is False
+
+
+@pytest.mark.parametrize("make_cache", [lambda: LRUCache(max_entries=10, ttl_seconds=60), lambda: RedisCache(FakeRedis(), ttl_seconds=60)])
+def test_fill_skipped_after_invalidation(make_cache):
+    cache = make_cache()
+    generation = cache.generation("k")
+    cache.delete("k")
+    assert cache.set_if_unchanged("k", b"stale", generation) is False
+    assert cache.get("k") is None
+
+    assert cache.set_if_unchanged("k", b"fresh", cache.generation("k")) is True
+    assert cache.get("k") == b"fresh"
+
+
+def test_get_customer_served_from_cache(client, db_session):
+    _login_via_registration(client, "00038001", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Cached"}).json()["customer_id"]
+
+    first = client.get(f"/api/customers/{cid}")
+    assert first.status_code == 200
+    hits_before = customer_cache.info()["hits"]
+
+    # change the row behind the API's back: a cache hit still returns the stored payload
+    from cm_customer_svc.models import Customer
+    import uuid
+
+    db_session.get(Customer, uuid.UUID(cid)).customer_name = "Changed In DB"
+    db_session.commit()
+
+    second = client.get(f"/api/customers/{cid}")
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert customer_cache.info()["hits"] == hits_before + 1
+
+
+def test_update_and_delete_invalidate_cache(client):
+    _login_via_registration(client, "00038002", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Original"}).json()["customer_id"]
+    assert client.get(f"/api/customers/{cid}").json()["customer_name"] == "Original"
+
+    assert client.put(f"/api/customers/{cid}", json={"customer_name": "Renamed"}).status_code == 200
+    assert client.get(f"/api/customers/{cid}").json()["customer_name"] == "Renamed"
+
+    assert client.delete(f"/api/customers/{cid}").status_code == 204
+    assert client.get(f"/api/customers/{cid}").status_code == 404
+
+
+def test_write_during_read_through_fill_is_not_overwritten(client, monkeypatch):
+    from cm_customer_svc.routers import customers as customers_module
+
+    _login_via_registration(client, "00038004", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Racing"}).json()["customer_id"]
+    read_generation = customers_module._cache_generation
+
+    def generation_then_concurrent_write(pk):
+        generation = read_generation(pk)
+        # a PUT commits and invalidates while this GET is still reading the old row
+        customers_module._invalidate_customer(pk)
+        return generation
+
+    monkeypatch.setattr(customers_module, "_cache_generation", generation_then_concurrent_write)
+    assert client.get(f"/api/customers/{cid}").status_code == 200
+    monkeypatch.undo()
+    assert len(customer_cache) == 0
+
+    assert client.get(f"/api/customers/{cid}").status_code == 200
+    assert len(customer_cache) == 1
+
+
+def test_cache_stats_endpoint(client):
+    _login_via_registration(client, "00038003", "Password123")
+    resp = client.get("/api/admin/cache")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["backend"] == "memory"
+    assert {"hits", "misses", "evictions", "invalidations", "size"} <= set(body)
@@ -0,0 +1,117 @@
+import pytest
+
+from cm_customer_svc.models import CustomerChange
+from cm_customer_svc.utils.change_feed import decode_change_token, encode_change_token
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _changes(client, **params):
+    resp = client.get("/api/customers/changes", params=params)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_change_token_roundtrip():
+    assert decode_change_token(encode_change_token(0)) == 0
+    assert decode_change_token(encode_change_token(123456789)) == 123456789
+    for bad in ("", "abc", encode_change_token(5)[:-1] + "!"):
+        with pytest.raises(ValueError):
+            decode_change_token(bad)
+
+
+def test_feed_reports_upserts_and_tombstones_in_commit_order(client):
+    _login_via_registration(client, "00045001", "Password123")
+    a = client.post("/api/customers", json={"customer_name": "A"}).json()["customer_id"]
+    b = client.post("/api/customers", json={"customer_name": "B"}).json()["customer_id"]
+
+    body = _changes(client)
+    assert [(c["op"], c["customer_id"], c["customer"]["customer_name"]) for c in body["changes"]] == [
+        ("upsert", a, "A"),
+        ("upsert", b, "B"),
+    ]
+    assert body["has_more"] is False
+    token = body["next_token"]
+
+    # nothing new: same position comes back
+    empty = _changes(client, since=token)
+    assert empty["changes"] == []
+    assert empty["next_token"] == token
+
+    assert client.put(f"/api/customers/{a}", json={"customer_name": "A2"}).status_code == 200
+    assert client.delete(f"/api/customers/{b}").status_code == 204
+
+    body = _changes(client, since=token)
+    assert [(c["op"], c["customer_id"]) for c in body["changes"]] == [("upsert", a), ("delete", b)]
+    assert body["changes"][0]["customer"]["customer_name"] == "A2"
+    assert body["changes"][1]["customer"] is None
+    assert body["changes"][0]["seq"] < body["changes"][1]["seq"]
+
+
+def test_feed_compacts_per_customer_within_page(client):
+    _login_via_registration(client, "00045002", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "V1"}).json()["customer_id"]
+    client.put(f"/api/customers/{cid}", json={"customer_name": "V2"})
+    client.put(f"/api/customers/{cid}", json={"customer_name": "V3"})
+    gone = client.post("/api/customers", json={"customer_name": "Gone"}).json()["customer_id"]
+    client.delete(f"/api/customers/{gone}")
+
+    body = _changes(client)
+    assert [(c["op"], c["customer_id"]) for c in body["changes"]] == [("upsert", cid), ("delete", gone)]
+    assert body["changes"][0]["customer"]["customer_name"] == "V3"
+
+
+def test_feed_pages_with_limit_and_batch_creates(client):
+    _login_via_registration(client, "00045003", "Password123")
+    items = [{"customer_name": f"Batch {i}"} for i in range(5)]
+    created = client.post("/api/customers:batch", json={"items": items}).json()["items"]
+
+    seen = []
+    token = None
+    while True:
+        params = {"limit": 2}
+        if token:
+            params["since"] = token
+        body = _changes(client, **params)
+        seen.extend(c["customer_id"] for c in body["changes"])
+        token = body["next_token"]
+        if not body["has_more"]:
+            break
+
+    assert seen == [c["customer_id"] for c in created]
+
+
+def test_upsert_of_customer_deleted_later_is_skipped(client, db_session):
+    _login_via_registration(client, "00045004", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Short Lived"}).json()["customer_id"]
+    client.delete(f"/api/customers/{cid}")
+
+    # first page only reaches the upsert; the customer no longer exists so it is left out
+    body = _changes(client, limit=1)
+    assert body["changes"] == []
+    assert body["has_more"] is True
+    body = _changes(client, since=body["next_token"])
+    assert [(c["op"], c["customer_id"]) for c in body["changes"]] == [("delete", cid)]
+
+
+def test_changelog_written_in_write_transaction(client, db_session):
+    _login_via_registration(client, "00045005", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Keep"}).json()["customer_id"]
+
+    # a rejected update leaves no changelog row behind
+    assert client.put(f"/api/customers/{cid}", json={"managed_by": "00000000"}).status_code == 400
+    assert [row.op for row in db_session.query(CustomerChange).order_by(CustomerChange.seq)] == ["upsert"]
+
+
+def test_invalid_since_and_auth(client):
+    assert client.get("/api/customers/changes").status_code == 401
+    _login_via_registration(client, "00045006", "Password123")
+    assert client.get("/api/customers/changes", params={"since": "garbage"}).status_code == 400
+    assert client.get("/api/customers/changes", params={"limit": 0}).status_code == 422
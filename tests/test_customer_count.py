@@ -0,0 +1,114 @@
+import pytest
+
+from cm_customer_svc.models import Customer, TableCount
+from cm_customer_svc.utils.count_utils import CountCache, count_cache
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _create_customers(client, count: int):
+    ids = []
+    for i in range(count):
+        resp = client.post("/api/customers", json={"customer_name": f"Customer {i}"})
+        assert resp.status_code == 201
+        ids.append(resp.json()["customer_id"])
+    return ids
+
+
+@pytest.fixture(autouse=True)
+def _clear_count_cache():
+    count_cache.clear()
+    yield
+    count_cache.clear()
+
+
+def test_count_cache_expires():
+    cache = CountCache(ttl_seconds=0)
+    cache.set("customers", 5)
+    assert cache.get("customers") is None
+
+    cache = CountCache(ttl_seconds=60)
+    cache.set("customers", 5)
+    assert cache.get("customers") == 5
+
+
+def test_include_total_false_skips_count(client):
+    _login_via_registration(client, "00032001", "Password123")
+    _create_customers(client, 2)
+
+    resp = client.get("/api/customers?include_total=false")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total_count"] is None
+    assert body["total_count_exact"] is False
+    assert len(body["items"]) == 2
+
+
+def test_exact_count_is_reported_exact(client):
+    _login_via_registration(client, "00032002", "Password123")
+    _create_customers(client, 3)
+
+    body = client.get("/api/customers").json()
+    assert body["total_count"] == 3
+    assert body["total_count_exact"] is True
+
+
+def test_cached_count_serves_stale_value_within_ttl(client):
+    _login_via_registration(client, "00032003", "Password123")
+    _create_customers(client, 2)
+
+    first = client.get("/api/customers?count_mode=cached").json()
+    assert first["total_count"] == 2
+    assert first["total_count_exact"] is True
+
+    _create_customers(client, 1)
+    second = client.get("/api/customers?count_mode=cached").json()
+    assert second["total_count"] == 2
+    assert second["total_count_exact"] is False
+
+
+def test_counter_tracks_create_and_delete(client, db_session):
+    _login_via_registration(client, "00032004", "Password123")
+    ids = _create_customers(client, 2)
+
+    # the first write seeded the counter from COUNT(*), including its own row
+    body = client.get("/api/customers?count_mode=counter").json()
+    assert body["total_count"] == 2
+    assert db_session.get(TableCount, Customer.__tablename__).row_count == 2
+
+    _create_customers(client, 2)
+    assert client.get("/api/customers?count_mode=counter").json()["total_count"] == 4
+
+    assert client.delete(f"/api/customers/{ids[0]}").status_code == 204
+    assert client.get("/api/customers?count_mode=counter").json()["total_count"] == 3
+
+
+def test_invalid_count_mode_rejected(client):
+    _login_via_registration(client, "00032005", "Password123")
+    resp = client.get("/api/customers?count_mode=bogus")
+    assert resp.status_code == 422
+
+
+def test_counter_read_does_not_seed(client, db_session):
+    _login_via_registration(client, "00032006", "Password123")
+    ids = _create_customers(client, 2)
+    db_session.query(TableCount).delete()
+    db_session.commit()
+
+    # an unseeded counter reads as COUNT(*) and the GET writes nothing
+    assert client.get("/api/customers?count_mode=counter").json()["total_count"] == 2
+    assert db_session.get(TableCount, Customer.__tablename__) is None
+
+    # the next write seeds it; a delete seeds the count without the deleted row
+    assert client.delete(f"/api/customers/{ids[0]}").status_code == 204
+    db_session.expire_all()
+    assert db_session.get(TableCount, Customer.__tablename__).row_count == 1
+    _create_customers(client, 1)
+    assert client.get("/api/customers?count_mode=counter").json()["total_count"] == 2
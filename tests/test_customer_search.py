@@ -0,0 +1,119 @@
+import pytest
+from sqlalchemy import text
+
+from cm_customer_svc.utils import search_index
+from cm_customer_svc.utils.search_index import rebuild_search_index, search_terms
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _create(client, name: str, address: str = None, contact: str = None) -> str:
+    payload = {"customer_name": name, "customer_address": address, "customer_contact": contact}
+    resp = client.post("/api/customers", json={k: v for k, v in payload.items() if v is not None})
+    assert resp.status_code == 201
+    return resp.json()["customer_id"]
+
+
+def _search(client, q: str, **params):
+    resp = client.get("/api/customers/search", params={"q": q, **params})
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def _names(body):
+    return [item["customer_name"] for item in body["items"]]
+
+
+@pytest.fixture(params=["fts5", "memory"])
+def backend(request, monkeypatch):
+    monkeypatch.setattr(search_index, "CUSTOMER_SEARCH_BACKEND", request.param)
+    return request.param
+
+
+def test_search_terms():
+    assert search_terms("  Acme   (555) 123-4567 ") == ["Acme", "555", "1234567"]
+    assert search_terms("ab cd") == []
+    assert search_terms("acme ACME Acme") == ["acme"]
+    assert search_terms("A & B Co") == ["&amp;"]
+
+
+def test_search_matches_name_address_and_phone_digits(client, backend):
+    _login_via_registration(client, f"0004200{1 if backend == 'fts5' else 2}", "Password123")
+    _create(client, "Acme Widgets", "12 Harbor Road", "+1 (555) 123-4567")
+    _create(client, "Globex", "99 Acme Street", "555 987 6543")
+    _create(client, "Initech", "1 Office Park", "444-000-1111")
+
+    # name matches rank above address matches
+    assert _names(_search(client, "acme")) == ["Acme Widgets", "Globex"]
+    assert _names(_search(client, "harb")) == ["Acme Widgets"]
+    assert _names(_search(client, "1234567")) == ["Acme Widgets"]
+    assert _names(_search(client, "(444) 000")) == ["Initech"]
+    # every term must match
+    assert _names(_search(client, "acme street")) == ["Globex"]
+    assert _search(client, "nothing-like-this")["items"] == []
+
+
+def test_search_follows_updates_and_deletes(client, backend):
+    _login_via_registration(client, f"0004201{1 if backend == 'fts5' else 2}", "Password123")
+    cid = _create(client, "Original Name")
+    assert _names(_search(client, "original")) == ["Original Name"]
+
+    assert client.put(f"/api/customers/{cid}", json={"customer_name": "Renamed Corp"}).status_code == 200
+    assert _search(client, "original")["items"] == []
+    assert _names(_search(client, "renamed")) == ["Renamed Corp"]
+
+    assert client.delete(f"/api/customers/{cid}").status_code == 204
+    body = _search(client, "renamed")
+    assert body["items"] == []
+    assert body["total_count"] == 0
+
+
+def test_search_pagination_and_batch_created_rows(client, backend):
+    _login_via_registration(client, f"0004202{1 if backend == 'fts5' else 2}", "Password123")
+    items = [{"customer_name": f"Batch Customer {i}"} for i in range(7)]
+    assert client.post("/api/customers:batch", json={"items": items}).json()["created_count"] == 7
+
+    first = _search(client, "batch", page_size=5)
+    second = _search(client, "batch", page_size=5, page=2)
+    assert first["total_count"] == 7
+    assert len(first["items"]) == 5
+    assert len(second["items"]) == 2
+    names = _names(first) + _names(second)
+    assert sorted(names) == sorted(item["customer_name"] for item in items)
+
+
+def test_search_rejects_short_or_missing_query(client):
+    _login_via_registration(client, "00042031", "Password123")
+    assert client.get("/api/customers/search", params={"q": "ab"}).status_code == 400
+    assert client.get("/api/customers/search").status_code == 422
+
+
+def test_fts_query_syntax_is_escaped(client):
+    _login_via_registration(client, "00042041", "Password123")
+    _create(client, 'Quote "Acme" Inc')
+    assert _search(client, 'OR "acme NEAR(')["items"] == []
+    assert _names(_search(client, "acme inc")) == ['Quote &quot;Acme&quot; Inc']
+
+
+def test_search_requires_auth(client):
+    assert client.get("/api/customers/search", params={"q": "acme"}).status_code == 401
+
+
+def test_rebuild_search_index(client, db_session):
+    _login_via_registration(client, "00042051", "Password123")
+    _create(client, "Rebuilt One")
+    _create(client, "Rebuilt Two")
+    db_session.execute(text("DELETE FROM customer_search"))
+    db_session.commit()
+    assert _search(client, "rebuilt")["items"] == []
+
+    assert rebuild_search_index(db_session) == 2
+    db_session.commit()
+    assert sorted(_names(_search(client, "rebuilt"))) == ["Rebuilt One", "Rebuilt Two"]
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import threading
+
+from cm_customer_svc.routers.customers import _stream_frames
+from cm_customer_svc.utils.event_hub import CustomerEventHub, customer_events
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _parse(frame: str):
+    lines = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+    return lines["event"], json.loads(lines["data"])
+
+
+def test_hub_filters_by_managed_by_and_accepts_publishes_from_threads():
+    hub = CustomerEventHub(queue_size=10, max_subscribers=10)
+
+    async def scenario():
+        everyone = hub.subscribe()
+        mine = hub.subscribe("00046001")
+        hub.publish("created", "00046001", {"customer_id": "a"})
+        # sync handlers publish from threadpool threads
+        worker = threading.Thread(target=hub.publish, args=("updated", "00046002", {"customer_id": "b"}))
+        worker.start()
+        worker.join()
+
+        first = await asyncio.wait_for(everyone.queue.get(), 1)
+        second = await asyncio.wait_for(everyone.queue.get(), 1)
+        assert [_parse(first)[0], _parse(second)[0]] == ["created", "updated"]
+        assert _parse(await asyncio.wait_for(mine.queue.get(), 1)) == ("created", {"customer_id": "a"})
+        await asyncio.sleep(0)
+        assert mine.queue.empty()
+
+    asyncio.run(scenario())
+    assert hub.stats()["published"] == 2
+
+
+def test_hub_drops_slow_subscriber_without_affecting_others():
+    hub = CustomerEventHub(queue_size=2, max_subscribers=10)
+
+    async def scenario():
+        slow = hub.subscribe()
+        fast = hub.subscribe()
+        for i in range(3):
+            hub.publish("created", "00046003", {"customer_id": str(i)})
+            if not fast.queue.empty():
+                await fast.queue.get()
+
+        assert slow.dropped and slow.queue.get_nowait() is None
+        assert not fast.dropped
+        # a dropped subscriber no longer receives events
+        hub.publish("created", "00046003", {"customer_id": "late"})
+        assert slow.queue.empty()
+        assert hub.stats() == {"subscribers": 1, "published": 4, "dropped": 1}
+
+    asyncio.run(scenario())
+
+
+def test_stream_frames_heartbeat_events_and_drop_notice():
+    hub = CustomerEventHub(queue_size=1, max_subscribers=10)
+
+    async def scenario():
+        subscription = hub.subscribe()
+        frames = _stream_frames(subscription, heartbeat_seconds=0.01)
+        assert (await frames.__anext__()).startswith("retry:")
+        assert await frames.__anext__() == ": heartbeat\n\n"
+
+        hub.publish("deleted", "00046004", {"customer_id": "x"})
+        assert _parse(await frames.__anext__())[0] == "deleted"
+
+        hub.publish("created", "00046004", {"customer_id": "y"})
+        hub.publish("created", "00046004", {"customer_id": "z"})
+        assert _parse(await frames.__anext__())[0] == "dropped"
+        remaining = [frame async for frame in frames]
+        assert remaining == []
+
+    asyncio.run(scenario())
+
+
+def test_customer_writes_publish_events(client):
+    _login_via_registration(client, "00046005", "Password123")
+
+    async def scenario():
+        own = customer_events.subscribe("00046005")
+        other = customer_events.subscribe("00046099")
+        try:
+            created = (await asyncio.to_thread(client.post, "/api/customers", json={"customer_name": "Streamed"})).json()
+            cid = created["customer_id"]
+            await asyncio.to_thread(client.put, f"/api/customers/{cid}", json={"customer_name": "Streamed 2"})
+            await asyncio.to_thread(client.post, "/api/customers:batch", json={"items": [{"customer_name": "B1"}, {"customer_name": "B2"}]})
+            await asyncio.to_thread(client.delete, f"/api/customers/{cid}")
+
+            events = [_parse(await asyncio.wait_for(own.queue.get(), 1)) for _ in range(4)]
+            assert [name for name, _ in events] == ["created", "updated", "batch_created", "deleted"]
+            assert events[0][1]["customer"]["customer_name"] == "Streamed"
+            assert events[1][1]["customer"]["customer_name"] == "Streamed 2"
+            assert len(events[2][1]["customer_ids"]) == 2
+            assert events[3][1] == {"customer_id": cid, "managed_by": "00046005", "customer": None}
+            assert other.queue.empty()
+        finally:
+            customer_events.unsubscribe(own)
+            customer_events.unsubscribe(other)
+
+    asyncio.run(scenario())
+
+
+def test_reassignment_reaches_old_and_new_manager_streams(client):
+    r = client.post("/api/register", json={"employee_id": "00046008", "employee_name": "New Manager", "password": "Password123"})
+    assert r.status_code == 201
+    _login_via_registration(client, "00046007", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Moving"}).json()["customer_id"]
+
+    async def scenario():
+        old = customer_events.subscribe("00046007")
+        new = customer_events.subscribe("00046008")
+        everyone = customer_events.subscribe()
+        try:
+            r = await asyncio.to_thread(client.put, f"/api/customers/{cid}", json={"managed_by": "00046008"})
+            assert r.status_code == 200
+
+            for subscription in (old, new, everyone):
+                name, data = _parse(await asyncio.wait_for(subscription.queue.get(), 1))
+                assert name == "updated"
+                assert data["managed_by"] == "00046008" and data["previous_managed_by"] == "00046007"
+                await asyncio.sleep(0)
+                # delivered once, even to a subscriber matching both managers
+                assert subscription.queue.empty()
+
+            # later updates only reach the new manager
+            await asyncio.to_thread(client.put, f"/api/customers/{cid}", json={"customer_name": "Moved"})
+            name, data = _parse(await asyncio.wait_for(new.queue.get(), 1))
+            assert "previous_managed_by" not in data
+            await asyncio.sleep(0)
+            assert old.queue.empty()
+        finally:
+            for subscription in (old, new, everyone):
+                customer_events.unsubscribe(subscription)
+
+    asyncio.run(scenario())
+
+
+def test_stream_requires_auth_and_valid_filter(client):
+    assert client.get("/api/customers/stream").status_code == 401
+    _login_via_registration(client, "00046006", "Password123")
+    assert client.get("/api/customers/stream", params={"managed_by": "bogus"}).status_code == 422
+    assert client.get("/api/admin/stream").json()["subscribers"] == 0
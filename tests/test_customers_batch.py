@@ -0,0 +1,80 @@
+from sqlalchemy import select, func
+
+from cm_customer_svc.models import Customer
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def test_batch_create_persists_all_valid_items(client, db_session):
+    manager_emp = "00033001"
+    _login_via_registration(client, manager_emp, "Password123")
+
+    items = [{"customer_name": f"Batch {i}", "customer_contact": "1234567"} for i in range(25)]
+    resp = client.post("/api/customers:batch", json={"items": items})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created_count"] == 25
+    assert body["error_count"] == 0
+    # returned in request order with server-generated fields
+    assert [item["customer_name"] for item in body["items"]] == [f"Batch {i}" for i in range(25)]
+    assert all(item["managed_by"] == manager_emp for item in body["items"])
+    assert all(item["created_at"] for item in body["items"])
+
+    total = db_session.execute(select(func.count()).select_from(Customer)).scalar_one()
+    assert total == 25
+
+
+def test_batch_create_reports_per_item_errors(client):
+    _login_via_registration(client, "00033002", "Password123")
+
+    items = [
+        {"customer_name": "Good"},
+        {"customer_name": "BadPhone", "customer_contact": "abcdefg"},
+        {"customer_contact": "1234567"},
+        {"customer_name": "AlsoGood"},
+    ]
+    resp = client.post("/api/customers:batch", json={"items": items})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created_count"] == 2
+    assert body["error_count"] == 2
+    assert [e["index"] for e in body["errors"]] == [1, 2]
+    assert body["errors"][1]["errors"][0]["loc"] == ["customer_name"]
+
+    listing = client.get("/api/customers").json()
+    assert sorted(c["customer_name"] for c in listing["items"]) == ["AlsoGood", "Good"]
+
+
+def test_batch_create_spans_multiple_chunks(client, monkeypatch):
+    from cm_customer_svc.routers import customers
+
+    monkeypatch.setattr(customers, "CUSTOMER_BATCH_CHUNK_SIZE", 4)
+    _login_via_registration(client, "00033003", "Password123")
+
+    items = [{"customer_name": f"Chunked {i}"} for i in range(10)]
+    body = client.post("/api/customers:batch", json={"items": items}).json()
+    assert body["created_count"] == 10
+    assert len({item["customer_id"] for item in body["items"]}) == 10
+
+
+def test_batch_create_rejects_empty_and_oversized(client):
+    _login_via_registration(client, "00033004", "Password123")
+
+    assert client.post("/api/customers:batch", json={"items": []}).status_code == 422
+
+    from cm_customer_svc.config import CUSTOMER_BATCH_MAX_ITEMS
+
+    items = [{"customer_name": "x"}] * (CUSTOMER_BATCH_MAX_ITEMS + 1)
+    assert client.post("/api/customers:batch", json={"items": items}).status_code == 422
+
+
+def test_batch_create_unauthenticated(client):
+    resp = client.post("/api/customers:batch", json={"items": [{"customer_name": "NoAuth"}]})
+    assert resp.status_code == 401
@@ -0,0 +1,75 @@
+import logging
+import uuid
+
+from sqlalchemy import event
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _create_customers(client, count: int):
+    items = [{"customer_name": f"Customer {i}"} for i in range(count)]
+    resp = client.post("/api/customers:batch", json={"items": items})
+    assert resp.status_code == 200
+    return [item["customer_id"] for item in resp.json()["items"]]
+
+
+def test_batch_get_returns_items_in_request_order_and_missing_ids(client):
+    _login_via_registration(client, "00044001", "Password123")
+    ids = _create_customers(client, 5)
+    unknown = str(uuid.uuid4())
+
+    requested = [ids[3], unknown, ids[0], "not-a-uuid", ids[3]]
+    resp = client.post("/api/customers:batchGet", json={"ids": requested})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [item["customer_id"] for item in body["items"]] == [ids[3], ids[0]]
+    assert body["missing_ids"] == [unknown, "not-a-uuid"]
+    assert body["items"][0]["customer_name"] == "Customer 3"
+
+
+def test_batch_get_uses_one_query_per_chunk(client, db_session, monkeypatch):
+    from cm_customer_svc.routers import customers
+
+    monkeypatch.setattr(customers, "CUSTOMER_BATCH_CHUNK_SIZE", 4)
+    _login_via_registration(client, "00044002", "Password123")
+    ids = _create_customers(client, 10)
+
+    statements = []
+    engine = db_session.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        body = client.post("/api/customers:batchGet", json={"ids": ids}).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert [item["customer_id"] for item in body["items"]] == ids
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 3
+    assert all(" IN (" in s for s in selects)
+
+
+def test_batch_get_malformed_ids_do_not_log_tracebacks(client, caplog):
+    _login_via_registration(client, "00044003", "Password123")
+    with caplog.at_level(logging.DEBUG, logger="cm_customer_svc"):
+        resp = client.post("/api/customers:batchGet", json={"ids": ["bad-1", "bad-2", "bad-3"]})
+    assert resp.status_code == 200
+    assert resp.json() == {"items": [], "missing_ids": ["bad-1", "bad-2", "bad-3"]}
+    assert not [r for r in caplog.records if r.exc_info]
+
+
+def test_batch_get_validates_size_and_auth(client):
+    assert client.post("/api/customers:batchGet", json={"ids": [str(uuid.uuid4())]}).status_code == 401
+    _login_via_registration(client, "00044004", "Password123")
+    assert client.post("/api/customers:batchGet", json={"ids": []}).status_code == 422
+    assert client.post("/api/customers:batchGet", json={"ids": ["x"] * 1001}).status_code == 422
@@ -0,0 +1,86 @@
+import uuid
+
+from sqlalchemy import text
+
+from cm_customer_svc.models import Customer
+from cm_customer_svc.routers import customers as customers_module
+from cm_customer_svc.schemas import customer as customer_schemas
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def test_contact_digits_written_on_create_batch_and_update(client, db_session):
+    _login_via_registration(client, "00043001", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Single", "customer_contact": "+1 (555) 123-4567"}).json()["customer_id"]
+    batch = client.post("/api/customers:batch", json={"items": [{"customer_name": "Batch", "customer_contact": "555 000 1111"}]}).json()
+    bid = batch["items"][0]["customer_id"]
+
+    assert db_session.get(Customer, uuid.UUID(cid)).customer_contact_digits == "15551234567"
+    assert db_session.get(Customer, uuid.UUID(bid)).customer_contact_digits == "5550001111"
+
+    assert client.put(f"/api/customers/{cid}", json={"customer_contact": "555-222-3333"}).status_code == 200
+    db_session.expire_all()
+    assert db_session.get(Customer, uuid.UUID(cid)).customer_contact_digits == "5552223333"
+
+    # the derived column is internal and not part of the response
+    assert "customer_contact_digits" not in client.get(f"/api/customers/{cid}").json()
+
+
+def test_lookup_by_phone_ignores_formatting(client):
+    _login_via_registration(client, "00043002", "Password123")
+    first = client.post("/api/customers", json={"customer_name": "First", "customer_contact": "555-123-4567"}).json()
+    second = client.post("/api/customers", json={"customer_name": "Second", "customer_contact": "(555) 123 4567"}).json()
+    client.post("/api/customers", json={"customer_name": "Other", "customer_contact": "555-999-0000"})
+
+    for number in ("5551234567", "555.123.4567", "(555) 123-4567"):
+        resp = client.get(f"/api/customers/by-phone/{number}")
+        assert resp.status_code == 200
+        # created_at has second resolution, so both rows may share it; compare as a set
+        assert {c["customer_id"] for c in resp.json()} == {first["customer_id"], second["customer_id"]}
+
+
+def test_lookup_by_phone_not_found_and_invalid(client):
+    _login_via_registration(client, "00043003", "Password123")
+    assert client.get("/api/customers/by-phone/5550000000").status_code == 404
+    assert client.get("/api/customers/by-phone/12").status_code == 400
+    assert client.get("/api/customers/by-phone/not-a-number").status_code == 400
+
+
+def test_lookup_by_phone_uses_index(db_session):
+    plan = db_session.execute(
+        text("EXPLAIN QUERY PLAN SELECT customer_id FROM customers WHERE customer_contact_digits = :d"), {"d": "5551234567"}
+    ).all()
+    assert "INDEX idx_customer_contact_digits" in " ".join(row[-1] for row in plan)
+
+
+def test_country_code_counts_towards_digit_limit(client, db_session, monkeypatch):
+    monkeypatch.setattr(customer_schemas, "PHONE_DEFAULT_COUNTRY_CODE", "44")
+    monkeypatch.setattr(customers_module, "PHONE_DEFAULT_COUNTRY_CODE", "44")
+    _login_via_registration(client, "00043004", "Password123")
+
+    # 15 digits as written would be 17 stored: rejected up front instead of overflowing the column
+    assert client.post("/api/customers", json={"customer_name": "Long", "customer_contact": "123456789012345"}).status_code == 422
+
+    cid = client.post("/api/customers", json={"customer_name": "Longest", "customer_contact": "1234567890123"}).json()["customer_id"]
+    assert db_session.get(Customer, uuid.UUID(cid)).customer_contact_digits == "441234567890123"
+    found = client.get("/api/customers/by-phone/1234567890123")
+    assert found.status_code == 200 and [c["customer_id"] for c in found.json()] == [cid]
+    assert client.get("/api/customers/by-phone/12345678901234").status_code == 400
+
+
+def test_lookup_matches_national_and_international_forms(client, monkeypatch):
+    monkeypatch.setattr(customer_schemas, "PHONE_DEFAULT_COUNTRY_CODE", "1")
+    monkeypatch.setattr(customers_module, "PHONE_DEFAULT_COUNTRY_CODE", "1")
+    _login_via_registration(client, "00043005", "Password123")
+
+    cid = client.post("/api/customers", json={"customer_name": "Trunk", "customer_contact": "1-555-123-4567"}).json()["customer_id"]
+    for number in ("+1 555 123 4567", "555-123-4567", "15551234567"):
+        found = client.get(f"/api/customers/by-phone/{number}")
+        assert found.status_code == 200 and [c["customer_id"] for c in found.json()] == [cid]
@@ -0,0 +1,149 @@
+from sqlalchemy import update
+
+from cm_customer_svc.models import Customer
+from cm_customer_svc.routers import customers as customers_module
+from cm_customer_svc.schemas.customer import CustomerResponse
+from cm_customer_svc.utils.cache import customer_cache
+from cm_customer_svc.utils.etag_utils import if_match, none_match
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _create(client, name: str) -> str:
+    r = client.post("/api/customers", json={"customer_name": name})
+    assert r.status_code == 201
+    return r.json()["customer_id"]
+
+
+def test_etag_comparison_rules():
+    assert none_match('"a", "b"', '"b"')
+    assert none_match('W/"b"', '"b"')
+    assert none_match("*", '"b"')
+    assert not none_match('"a"', '"b"')
+    # If-Match uses the strong comparison
+    assert if_match('"a", "b"', '"b"')
+    assert if_match("*", '"b"')
+    assert not if_match('W/"b"', '"b"')
+    assert not if_match('W/"b"', 'W/"b"')
+
+
+def test_get_customer_conditional_requests(client):
+    _login_via_registration(client, "00047001", "Password123")
+    cid = _create(client, "Conditional")
+
+    first = client.get(f"/api/customers/{cid}")
+    assert first.status_code == 200
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+    assert etag.startswith('"') and first.headers["cache-control"] == "private, no-cache"
+
+    # served from the cache, which keeps the validators next to the payload
+    cached = client.get(f"/api/customers/{cid}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    customer_cache.clear()
+    fresh = client.get(f"/api/customers/{cid}", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert fresh.status_code == 304 and fresh.headers["last-modified"] == last_modified
+
+    assert client.get(f"/api/customers/{cid}", headers={"If-None-Match": '"other"'}).json() == first.json()
+
+    assert client.get(f"/api/customers/{cid}", headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(f"/api/customers/{cid}", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
+    # If-None-Match takes precedence over If-Modified-Since
+    both = {"If-None-Match": '"other"', "If-Modified-Since": last_modified}
+    assert client.get(f"/api/customers/{cid}", headers=both).status_code == 200
+
+
+def test_not_modified_skips_serialization(client, monkeypatch):
+    _login_via_registration(client, "00047002", "Password123")
+    cid = _create(client, "No Serialize")
+    etag = client.get(f"/api/customers/{cid}").headers["etag"]
+    customer_cache.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("serialized a 304 response")
+
+    monkeypatch.setattr(CustomerResponse, "model_validate", fail)
+    assert client.get(f"/api/customers/{cid}", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_etag_changes_on_update_within_the_same_second(client):
+    _login_via_registration(client, "00047003", "Password123")
+    cid = _create(client, "Before")
+    before = client.get(f"/api/customers/{cid}").headers["etag"]
+
+    updated = client.put(f"/api/customers/{cid}", json={"customer_name": "After"})
+    assert updated.status_code == 200
+    assert updated.headers["etag"] != before
+
+    r = client.get(f"/api/customers/{cid}", headers={"If-None-Match": before})
+    assert r.status_code == 200 and r.json()["customer_name"] == "After"
+    assert r.headers["etag"] == updated.headers["etag"]
+
+
+def test_listing_etag_follows_writes_and_query(client):
+    _login_via_registration(client, "00047004", "Password123")
+    _create(client, "Listed")
+
+    page = client.get("/api/customers", params={"page_size": 5})
+    etag = page.headers["etag"]
+    assert etag.startswith('W/"')
+    assert client.get("/api/customers", params={"page_size": 5}, headers={"If-None-Match": etag}).status_code == 304
+
+    other_query = client.get("/api/customers", params={"page_size": 6}, headers={"If-None-Match": etag})
+    assert other_query.status_code == 200 and other_query.headers["etag"] != etag
+
+    _create(client, "Listed Later")
+    after_write = client.get("/api/customers", params={"page_size": 5}, headers={"If-None-Match": etag})
+    assert after_write.status_code == 200
+    assert after_write.headers["etag"] != etag
+    assert len(after_write.json()["items"]) == 2
+
+
+def test_if_match_guards_update_and_delete(client):
+    _login_via_registration(client, "00047005", "Password123")
+    cid = _create(client, "Guarded")
+    etag = client.get(f"/api/customers/{cid}").headers["etag"]
+
+    ok = client.put(f"/api/customers/{cid}", json={"customer_name": "Guarded 2"}, headers={"If-Match": etag})
+    assert ok.status_code == 200
+    new_etag = ok.headers["etag"]
+
+    stale = client.put(f"/api/customers/{cid}", json={"customer_name": "Lost Update"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert stale.headers["etag"] == new_etag
+    assert client.get(f"/api/customers/{cid}").json()["customer_name"] == "Guarded 2"
+
+    assert client.delete(f"/api/customers/{cid}", headers={"If-Match": etag}).status_code == 412
+    assert client.put(f"/api/customers/{cid}", json={}, headers={"If-Match": "*"}).status_code == 200
+    assert client.delete(f"/api/customers/{cid}", headers={"If-Match": new_etag}).status_code == 204
+    assert client.delete(f"/api/customers/{cid}", headers={"If-Match": "*"}).status_code == 404
+
+
+def test_if_match_write_racing_a_concurrent_update_gets_412(client, monkeypatch):
+    _login_via_registration(client, "00047006", "Password123")
+    cid = _create(client, "Raced")
+    etag = client.get(f"/api/customers/{cid}").headers["etag"]
+    require_if_match = customers_module._require_if_match
+
+    def checked_then_overwritten(db, request, pk):
+        expected = require_if_match(db, request, pk)
+        # another writer lands between the If-Match check and the guarded write
+        db.execute(update(Customer).where(Customer.customer_id == pk).values(customer_name="Concurrent"))
+        return expected
+
+    monkeypatch.setattr(customers_module, "_require_if_match", checked_then_overwritten)
+    put = client.put(f"/api/customers/{cid}", json={"customer_name": "Lost Update"}, headers={"If-Match": etag})
+    assert put.status_code == 412
+    assert client.delete(f"/api/customers/{cid}", headers={"If-Match": etag}).status_code == 412
+
+    # neither write applied (the 412 also rolled back the simulated writer, which shared the transaction)
+    monkeypatch.undo()
+    assert client.get(f"/api/customers/{cid}").json()["customer_name"] == "Raced"
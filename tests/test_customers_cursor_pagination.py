@@ -0,0 +1,67 @@
+from cm_customer_svc.utils.pagination_utils import encode_cursor, decode_cursor
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _create_customers(client, count: int):
+    for i in range(count):
+        resp = client.post("/api/customers", json={"customer_name": f"Customer {i}"})
+        assert resp.status_code == 201
+
+
+def test_cursor_roundtrip():
+    import uuid
+    from datetime import datetime
+
+    cid = uuid.uuid4()
+    ts = datetime(2024, 5, 1, 12, 30, 15)
+    assert decode_cursor(encode_cursor(ts, cid)) == (ts, cid)
+
+
+def test_cursor_walk_covers_all_customers_in_offset_order(client):
+    _login_via_registration(client, "00031001", "Password123")
+    _create_customers(client, 12)
+
+    # offset mode is ordered by the same keys, so both walks must agree
+    offset_ids = []
+    for page in (1, 2, 3):
+        body = client.get(f"/api/customers?page={page}&page_size=5").json()
+        offset_ids.extend(item["customer_id"] for item in body["items"])
+
+    cursor_ids = []
+    body = client.get("/api/customers?page_size=5").json()
+    cursor_ids.extend(item["customer_id"] for item in body["items"])
+    while body["next_cursor"]:
+        resp = client.get("/api/customers", params={"page_size": 5, "cursor": body["next_cursor"]})
+        assert resp.status_code == 200
+        body = resp.json()
+        cursor_ids.extend(item["customer_id"] for item in body["items"])
+
+    assert len(cursor_ids) == 12
+    assert len(set(cursor_ids)) == 12
+    assert cursor_ids == offset_ids
+    assert body["total_count"] == 12
+
+
+def test_next_cursor_absent_on_last_page(client):
+    _login_via_registration(client, "00031002", "Password123")
+    _create_customers(client, 3)
+
+    body = client.get("/api/customers?page_size=3").json()
+    assert len(body["items"]) == 3
+    assert body["next_cursor"] is None
+
+
+def test_invalid_cursor_returns_400(client):
+    _login_via_registration(client, "00031003", "Password123")
+
+    resp = client.get("/api/customers", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+    assert resp.json().get("detail") == "invalid cursor"
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _create_customers(client, count: int):
+    items = [{"customer_name": f"Export {i}", "customer_contact": "1234567", "customer_address": f"{i}, Main St"} for i in range(count)]
+    resp = client.post("/api/customers:batch", json={"items": items})
+    assert resp.status_code == 200
+
+
+def test_export_ndjson_streams_all_rows(client, monkeypatch):
+    from cm_customer_svc.routers import customers
+
+    # force several fetch batches
+    monkeypatch.setattr(customers, "CUSTOMER_EXPORT_YIELD_PER", 3)
+    _login_via_registration(client, "00034001", "Password123")
+    _create_customers(client, 10)
+
+    resp = client.get("/api/customers/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = resp.text.splitlines()
+    assert len(lines) == 10
+    rows = [json.loads(line) for line in lines]
+    assert {r["customer_name"] for r in rows} == {f"Export {i}" for i in range(10)}
+    assert set(rows[0]) == {
+        "customer_id",
+        "customer_name",
+        "customer_contact",
+        "customer_address",
+        "managed_by",
+        "created_at",
+        "updated_at",
+    }
+
+    # same order and values as the list endpoint
+    listing = client.get("/api/customers?page_size=100").json()["items"]
+    assert rows == listing
+
+
+def test_export_csv_has_header_and_quoted_values(client):
+    _login_via_registration(client, "00034002", "Password123")
+    _create_customers(client, 4)
+
+    resp = client.get("/api/customers/export?format=csv")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="customers.csv"' in resp.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(rows) == 4
+    assert {r["customer_address"] for r in rows} == {f"{i}, Main St" for i in range(4)}
+    assert all(r["managed_by"] == "00034002" for r in rows)
+
+
+def test_export_empty_table(client):
+    _login_via_registration(client, "00034003", "Password123")
+
+    assert client.get("/api/customers/export").text == ""
+    assert client.get("/api/customers/export?format=csv").text.strip() == (
+        "customer_id,customer_name,customer_contact,customer_address,managed_by,created_at,updated_at"
+    )
+
+
+def test_export_invalid_format(client):
+    _login_via_registration(client, "00034004", "Password123")
+    assert client.get("/api/customers/export?format=xml").status_code == 422
+
+
+def test_export_unauthenticated(client):
+    assert client.get("/api/customers/export").status_code == 401
+
+
+def test_export_streams_from_its_own_session(client, monkeypatch, session_local):
+    from cm_customer_svc.routers import customers
+
+    _login_via_registration(client, "00034006", "Password123")
+    _create_customers(client, 3)
+    opened = []
+
+    def recording_session_local(bind):
+        session = session_local(bind=bind)
+        opened.append(session)
+        return session
+
+    monkeypatch.setattr(customers, "SessionLocal", recording_session_local)
+    resp = client.get("/api/customers/export")
+    assert resp.status_code == 200
+    assert len(resp.text.splitlines()) == 3
+
+    # one session opened by the generator on the request's engine, and released after the last chunk
+    assert len(opened) == 1
+    assert opened[0].get_bind() is session_local.kw["bind"]
+    assert not opened[0].in_transaction()
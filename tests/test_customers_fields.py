@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from sqlalchemy import event
+
+from cm_customer_svc.utils.serialization import parse_fields
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _customer_selects(engine, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM customers" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return result, statements
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    # response order, duplicates and spaces ignored
+    assert parse_fields("customer_name, customer_id,customer_name") == ("customer_id", "customer_name")
+    assert parse_fields("customer_id,customer_name,customer_contact,customer_address,managed_by,created_at,updated_at") is None
+    with pytest.raises(ValueError, match="unknown fields: bogus, customer_contact_digits"):
+        parse_fields("customer_id,bogus,customer_contact_digits")
+
+
+def test_list_projection_narrows_select_and_items(client, db_session):
+    _login_via_registration(client, "00049001", "Password123")
+    for i in range(3):
+        client.post("/api/customers", json={"customer_name": f"Proj {i}", "customer_address": "A long address " * 20})
+
+    resp, statements = _customer_selects(
+        db_session.get_bind(),
+        lambda: client.get(
+            "/api/customers",
+            params={"fields": "customer_name,customer_id", "sort": "customer_name", "page_size": 2, "include_total": "false"},
+        ),
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [list(item) for item in body["items"]] == [["customer_id", "customer_name"]] * 2
+    assert [item["customer_name"] for item in body["items"]] == ["Proj 0", "Proj 1"]
+    assert len(statements) == 1
+    assert "customer_address" not in statements[0] and "customer_contact" not in statements[0]
+
+    # keyset paging works even though the sort key is not returned
+    params = {"fields": "customer_name", "sort": "customer_name", "page_size": 2, "cursor": body["next_cursor"]}
+    follow = client.get("/api/customers", params=params).json()
+    assert follow["items"] == [{"customer_name": "Proj 2"}]
+
+    by_created = client.get("/api/customers", params={"fields": "customer_id", "sort": "-created_at", "page_size": 2}).json()
+    assert len(by_created["items"]) == 2 and by_created["next_cursor"]
+
+
+def test_list_projection_has_its_own_etag(client):
+    _login_via_registration(client, "00049002", "Password123")
+    client.post("/api/customers", json={"customer_name": "Etag Proj"})
+    full = client.get("/api/customers").headers["etag"]
+    projected = client.get("/api/customers", params={"fields": "customer_id"})
+    assert projected.headers["etag"] != full
+    assert client.get("/api/customers", params={"fields": "customer_id"}, headers={"If-None-Match": full}).status_code == 200
+    assert client.get("/api/customers", params={"fields": "customer_id"}, headers={"If-None-Match": projected.headers["etag"]}).status_code == 304
+
+
+def test_get_customer_projection(client, db_session):
+    _login_via_registration(client, "00049003", "Password123")
+    created = client.post("/api/customers", json={"customer_name": "Single", "customer_address": "Addr"}).json()
+    cid = created["customer_id"]
+
+    resp, statements = _customer_selects(db_session.get_bind(), lambda: client.get(f"/api/customers/{cid}", params={"fields": "customer_name"}))
+    assert resp.status_code == 200
+    assert resp.json() == {"customer_name": "Single"}
+    assert "customer_address" not in statements[0]
+    assert resp.headers["last-modified"]
+    assert client.get(f"/api/customers/{cid}", params={"fields": "customer_name"}, headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+    # an address change does not change the name-only representation
+    client.put(f"/api/customers/{cid}", json={"customer_address": "Elsewhere"})
+    again = client.get(f"/api/customers/{cid}", params={"fields": "customer_name"})
+    assert again.headers["etag"] == resp.headers["etag"]
+
+    # projections bypass the cache; the full representation is unaffected
+    assert client.get(f"/api/customers/{cid}").json()["customer_address"] == "Elsewhere"
+
+
+def test_export_projection(client):
+    _login_via_registration(client, "00049004", "Password123")
+    client.post("/api/customers", json={"customer_name": "Exported", "customer_contact": "555-123-4567"})
+
+    ndjson = client.get("/api/customers/export", params={"fields": "customer_name,customer_id"})
+    assert [json.loads(line) for line in ndjson.text.splitlines()][0].keys() == {"customer_id", "customer_name"}
+    csv_body = client.get("/api/customers/export", params={"format": "csv", "fields": "customer_name"}).text
+    assert csv_body.splitlines() == ["customer_name", "Exported"]
+
+
+@pytest.mark.parametrize("path", ["/api/customers", "/api/customers/export", "/api/customers/00000000-0000-0000-0000-000000000000"])
+def test_invalid_fields_are_rejected(client, path):
+    _login_via_registration(client, "00049005", "Password123")
+    resp = client.get(path, params={"fields": "customer_id,password_hash"})
+    assert resp.status_code == 400
+    assert resp.json() == {"detail": "unknown fields: password_hash"}
+    assert client.get(path, params={"fields": "customer_id;drop"}).status_code == 422
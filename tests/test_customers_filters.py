@@ -0,0 +1,192 @@
+import sys
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from cm_customer_svc.models import Customer
+from cm_customer_svc.routers.customers import _filter_criteria, _page_statement, _prefix_upper_bound
+from cm_customer_svc.schemas.customer import CustomerListFilters, PaginationParams
+from cm_customer_svc.utils.count_utils import count_statement
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _create(client, name: str) -> str:
+    resp = client.post("/api/customers", json={"customer_name": name})
+    assert resp.status_code == 201
+    return resp.json()["customer_id"]
+
+
+def _set_timestamps(db_session, customer_id: str, created_at: datetime, updated_at: datetime):
+    customer = db_session.get(Customer, uuid.UUID(customer_id))
+    customer.created_at = created_at
+    customer.updated_at = updated_at
+    db_session.commit()
+
+
+def _names(body):
+    return [item["customer_name"] for item in body["items"]]
+
+
+def test_filter_by_managed_by(client):
+    _login_via_registration(client, "00041001", "Password123")
+    _create(client, "Mine A")
+    _create(client, "Mine B")
+    _login_via_registration(client, "00041002", "Password123")
+    _create(client, "Theirs")
+
+    body = client.get("/api/customers", params={"managed_by": "00041001"}).json()
+    assert sorted(_names(body)) == ["Mine A", "Mine B"]
+    assert body["total_count"] == 2
+    assert body["total_count_exact"] is True
+
+    # filtered totals are exact even when a table-wide count mode is requested
+    body = client.get("/api/customers", params={"managed_by": "00041002", "count_mode": "counter"}).json()
+    assert body["total_count"] == 1
+    assert body["total_count_exact"] is True
+
+
+def test_filter_by_created_and_updated_after(client, db_session):
+    _login_via_registration(client, "00041003", "Password123")
+    old = _create(client, "Old")
+    new = _create(client, "New")
+    touched = _create(client, "Touched")
+    _set_timestamps(db_session, old, datetime(2024, 1, 1), datetime(2024, 1, 1))
+    _set_timestamps(db_session, new, datetime(2024, 6, 1), datetime(2024, 6, 1))
+    _set_timestamps(db_session, touched, datetime(2024, 1, 2), datetime(2024, 7, 1))
+
+    body = client.get("/api/customers", params={"created_after": "2024-03-01T00:00:00"}).json()
+    assert _names(body) == ["New"]
+
+    body = client.get("/api/customers", params={"updated_after": "2024-03-01T00:00:00Z", "sort": "-updated_at"}).json()
+    assert _names(body) == ["Touched", "New"]
+
+    # timezone-aware bounds are compared in UTC
+    body = client.get("/api/customers", params={"created_after": "2024-01-02T02:00:00+03:00"}).json()
+    assert _names(body) == ["Touched", "New"]
+
+
+def test_name_prefix_is_case_sensitive_range(client):
+    _login_via_registration(client, "00041004", "Password123")
+    for name in ("Acme", "Acorn", "Ace & Co", "acme lower", "Bolt", "Ab"):
+        _create(client, name)
+
+    body = client.get("/api/customers", params={"name_prefix": "Ac", "sort": "customer_name"}).json()
+    assert _names(body) == ["Ace &amp; Co", "Acme", "Acorn"]
+
+    # the prefix is sanitized like stored names
+    body = client.get("/api/customers", params={"name_prefix": "Ace &"}).json()
+    assert _names(body) == ["Ace &amp; Co"]
+
+
+def test_prefix_upper_bound_carries_past_the_last_code_point():
+    top = chr(sys.maxunicode)
+    assert _prefix_upper_bound("Ac") == "Ad"
+    assert _prefix_upper_bound("A" + top) == "B"
+    assert _prefix_upper_bound("A" + top + top) == "B"
+    assert _prefix_upper_bound(top) is None
+    assert _prefix_upper_bound("A\ud7ff") == "A\ue000"
+
+
+def test_name_prefix_ending_in_the_last_code_point(client):
+    _login_via_registration(client, "00041009", "Password123")
+    top = chr(sys.maxunicode)
+    for name in ("A" + top + "x", "A" + top, "Az", "B"):
+        _create(client, name)
+
+    r = client.get("/api/customers", params={"name_prefix": "A" + top, "sort": "customer_name"})
+    assert r.status_code == 200
+    assert _names(r.json()) == ["A" + top, "A" + top + "x"]
+    r = client.get("/api/customers", params={"name_prefix": top})
+    assert r.status_code == 200 and _names(r.json()) == []
+
+
+def test_descending_name_sort_cursor_walk(client):
+    _login_via_registration(client, "00041005", "Password123")
+    names = [f"Customer {i:02d}" for i in range(7)]
+    for name in names:
+        _create(client, name)
+    _create(client, "Customer 03")  # duplicate key, ordered by customer_id
+
+    seen = []
+    body = client.get("/api/customers", params={"sort": "-customer_name", "page_size": 3}).json()
+    seen.extend(_names(body))
+    while body["next_cursor"]:
+        resp = client.get("/api/customers", params={"sort": "-customer_name", "page_size": 3, "cursor": body["next_cursor"]})
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(_names(body))
+
+    assert seen == sorted(names + ["Customer 03"], reverse=True)
+
+
+def test_cursor_rejected_for_other_sort(client):
+    _login_via_registration(client, "00041006", "Password123")
+    for i in range(3):
+        _create(client, f"Customer {i}")
+
+    cursor = client.get("/api/customers", params={"sort": "customer_name", "page_size": 1}).json()["next_cursor"]
+    assert cursor
+    resp = client.get("/api/customers", params={"sort": "-customer_name", "cursor": cursor})
+    assert resp.status_code == 400
+
+
+def test_invalid_filter_and_sort_values_rejected(client):
+    _login_via_registration(client, "00041007", "Password123")
+    assert client.get("/api/customers", params={"sort": "customer_address"}).status_code == 422
+    assert client.get("/api/customers", params={"managed_by": "not-an-id"}).status_code == 422
+    assert client.get("/api/customers", params={"created_after": "yesterday"}).status_code == 422
+
+
+def _query_plan(session, stmt) -> str:
+    """Run stmt, then return SQLite's EXPLAIN QUERY PLAN for the SQL it actually sent."""
+    connection = session.connection()
+    captured = {}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured["sql"], captured["params"] = statement, parameters
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        session.execute(stmt).fetchall()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + captured["sql"], captured["params"]).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "filters, sort, index",
+    [
+        ({"managed_by": "00041001"}, "created_at", "idx_customer_managed_by_created_at"),
+        ({"managed_by": "00041001"}, "-created_at", "idx_customer_managed_by_created_at"),
+        ({"created_after": datetime(2024, 1, 1)}, "created_at", "idx_customer_created_at_customer_id"),
+        ({"updated_after": datetime(2024, 1, 1)}, "updated_at", "idx_customer_updated_at_customer_id"),
+        ({"name_prefix": "Ac"}, "customer_name", "idx_customer_name_customer_id"),
+        ({"name_prefix": "Ac"}, "created_at", "idx_customer_name_customer_id"),
+    ],
+)
+def test_filters_use_supporting_index(db_session, filters, sort, index):
+    criteria = _filter_criteria(CustomerListFilters(**filters))
+
+    page_plan = _query_plan(db_session, _page_statement(PaginationParams(sort=sort), criteria))
+    assert f"INDEX {index}" in page_plan
+    assert "SEARCH" in page_plan
+
+    count_plan = _query_plan(db_session, count_statement(Customer, criteria))
+    assert f"INDEX {index}" in count_plan
+
+
+@pytest.mark.parametrize("sort", ["customer_name", "-customer_name", "updated_at", "-updated_at"])
+def test_sorts_avoid_temp_btree(db_session, sort):
+    plan = _query_plan(db_session, _page_statement(PaginationParams(sort=sort)))
+    assert "TEMP B-TREE" not in plan
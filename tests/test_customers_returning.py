@@ -0,0 +1,97 @@
+import uuid
+
+from sqlalchemy import event
+
+from cm_customer_svc.models import User
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _count_statements(engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+def test_update_issues_single_update_returning(client, db_session):
+    _login_via_registration(client, "00035001", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Before"}).json()["customer_id"]
+
+    statements = _count_statements(db_session.get_bind())
+    resp = client.put(f"/api/customers/{cid}", json={"customer_name": "After", "customer_address": "Addr"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["customer_name"] == "After"
+    assert body["customer_address"] == "Addr"
+    assert body["customer_id"] == cid
+
+    # the auth dependency does not touch the DB, so the handler's only customers statement is the
+    # UPDATE; the rest refresh the search index and append to the changelog
+    customer_statements = [s for s in statements if "customer_search" not in s and "customer_changes" not in s]
+    assert len(customer_statements) == 1
+    assert customer_statements[0].lstrip().upper().startswith("UPDATE")
+    assert "RETURNING" in customer_statements[0].upper()
+
+
+def test_update_managed_by_to_existing_user(client, db_session):
+    _login_via_registration(client, "00035002", "Password123")
+    db_session.add(User(employee_id="00035099", employee_name="Other", password_hash="pw"))
+    db_session.commit()
+    cid = client.post("/api/customers", json={"customer_name": "Reassign"}).json()["customer_id"]
+
+    resp = client.put(f"/api/customers/{cid}", json={"managed_by": "00035099"})
+    assert resp.status_code == 200
+    assert resp.json()["managed_by"] == "00035099"
+
+
+def test_update_managed_by_unknown_user_returns_400_and_keeps_row(client):
+    _login_via_registration(client, "00035003", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Keep"}).json()["customer_id"]
+
+    resp = client.put(f"/api/customers/{cid}", json={"customer_name": "Changed", "managed_by": "00000000"})
+    assert resp.status_code == 400
+    assert "does not exist" in resp.json()["detail"]
+
+    # nothing from the rejected statement was applied
+    body = client.get(f"/api/customers/{cid}").json()
+    assert body["customer_name"] == "Keep"
+    assert body["managed_by"] == "00035003"
+
+
+def test_update_unknown_customer_with_unknown_manager_returns_404(client):
+    _login_via_registration(client, "00035004", "Password123")
+    resp = client.put(f"/api/customers/{uuid.uuid4()}", json={"managed_by": "00000000"})
+    assert resp.status_code == 404
+
+
+def test_update_empty_payload_returns_current_row(client):
+    _login_via_registration(client, "00035005", "Password123")
+    created = client.post("/api/customers", json={"customer_name": "NoOp"}).json()
+
+    resp = client.put(f"/api/customers/{created['customer_id']}", json={})
+    assert resp.status_code == 200
+    assert resp.json() == created
+
+
+def test_delete_issues_single_delete_returning(client, db_session):
+    _login_via_registration(client, "00035006", "Password123")
+    cid = client.post("/api/customers", json={"customer_name": "Gone"}).json()["customer_id"]
+
+    statements = _count_statements(db_session.get_bind())
+    assert client.delete(f"/api/customers/{cid}").status_code == 204
+
+    deletes = [s for s in statements if s.lstrip().upper().startswith("DELETE FROM CUSTOMERS ")]
+    assert len(deletes) == 1
+    assert "RETURNING" in deletes[0].upper()
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in statements)
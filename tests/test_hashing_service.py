@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+import anyio
+import pytest
+
+from cm_customer_svc.routers import auth as auth_router_module
+from cm_customer_svc.routers import registration as registration_router_module
+from cm_customer_svc.utils.hashing_service import HashingSaturated, HashingService
+
+
+@pytest.fixture
+def saturated_hasher(monkeypatch):
+    """A hashing service whose only slot is taken, patched into the login and register handlers."""
+    service = HashingService(workers=0, max_pending=1)
+    service._slots.acquire()
+    monkeypatch.setattr(auth_router_module, "password_hasher", service)
+    monkeypatch.setattr(registration_router_module, "password_hasher", service)
+    yield service
+    service._slots.release()
+
+
+def test_inline_hash_and_verify_records_stats():
+    service = HashingService(workers=0, max_pending=4)
+    hashed = service.hash("Password123")
+    assert service.verify("Password123", hashed)
+    assert not service.verify("WrongPass1", hashed)
+
+    stats = service.stats()
+    assert stats["completed"] == 3
+    assert stats["in_flight"] == 0
+    assert stats["rejected"] == 0
+    assert stats["latency_max"] > 0
+
+
+def test_process_pool_sync_and_async():
+    service = HashingService(workers=1, max_pending=2)
+    try:
+        service.start()
+        assert service._executor._mp_context.get_start_method() in ("forkserver", "spawn")
+        hashed = service.hash("Password123")
+        assert service.verify("Password123", hashed)
+        assert asyncio.run(service.verify_async("Password123", hashed))
+        assert not asyncio.run(service.verify_async("WrongPass1", hashed))
+        with pytest.raises(ValueError):
+            service.hash("")
+        assert service.stats()["completed"] == 5
+    finally:
+        service.shutdown()
+
+
+def test_rejects_when_saturated():
+    service = HashingService(workers=0, max_pending=1)
+    service._slots.acquire()
+    with pytest.raises(HashingSaturated):
+        service.hash("Password123")
+    with pytest.raises(HashingSaturated):
+        asyncio.run(service.verify_async("Password123", "x"))
+    assert service.stats()["rejected"] == 2
+
+
+def test_login_returns_429_when_hashing_saturated(client, saturated_hasher, monkeypatch):
+    from cm_customer_svc.utils.hashing_service import password_hasher
+
+    # register through the real service so only the login path is saturated
+    monkeypatch.setattr(registration_router_module, "password_hasher", password_hasher)
+    r = client.post("/api/register", json={"employee_id": "00040001", "employee_name": "Manager", "password": "Password123"})
+    assert r.status_code == 201
+
+    r = client.post("/api/auth/login", json={"employee_id": "00040001", "password": "Password123"})
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "1"
+
+
+def test_register_returns_429_when_hashing_saturated(client, saturated_hasher):
+    r = client.post("/api/register", json={"employee_id": "00040002", "employee_name": "Manager", "password": "Password123"})
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "1"
+
+
+class BlockingHasher:
+    """verify_async waits until released, like logins queued behind a busy process pool."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.waiting = 0
+
+    async def verify_async(self, plain_password, hashed_password):
+        self.waiting += 1
+        while not self.release.is_set():
+            await asyncio.sleep(0.01)
+        return False
+
+
+def test_pending_logins_do_not_hold_threadpool_threads(client, monkeypatch):
+    r = client.post("/api/register", json={"employee_id": "00040004", "employee_name": "Manager", "password": "Password123"})
+    assert r.status_code == 201
+    assert client.post("/api/auth/login", json={"employee_id": "00040004", "password": "Password123"}).status_code == 200
+    customer_id = client.post("/api/customers", json={"customer_name": "Reader"}).json()["customer_id"]
+
+    hasher = BlockingHasher()
+    monkeypatch.setattr(auth_router_module, "password_hasher", hasher)
+    limiter = client.portal.call(anyio.to_thread.current_default_thread_limiter)
+    total_tokens = limiter.total_tokens
+    # fewer threadpool threads than waiting logins: a login that held its thread would starve the read
+    limiter.total_tokens = 2
+    statuses = []
+
+    def attempt():
+        statuses.append(client.post("/api/auth/login", json={"employee_id": "00040005", "password": "WrongPass1"}).status_code)
+
+    logins = [threading.Thread(target=attempt) for _ in range(3)]
+    try:
+        for t in logins:
+            t.start()
+        deadline = time.monotonic() + 5
+        while hasher.waiting < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert hasher.waiting == 3
+
+        reads = []
+        reader = threading.Thread(target=lambda: reads.append(client.get(f"/api/customers/{customer_id}").status_code))
+        reader.start()
+        reader.join(timeout=5)
+        assert reads == [200]
+    finally:
+        hasher.release.set()
+        for t in logins:
+            t.join(timeout=5)
+        limiter.total_tokens = total_tokens
+    assert statuses == [401, 401, 401]
+
+
+def test_admin_hashing_stats(client):
+    r = client.post("/api/register", json={"employee_id": "00040003", "employee_name": "Manager", "password": "Password123"})
+    assert r.status_code == 201
+    assert client.post("/api/auth/login", json={"employee_id": "00040003", "password": "Password123"}).status_code == 200
+
+    r = client.get("/api/admin/hashing")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["completed"] >= 2
+    assert set(body) >= {"workers", "in_flight", "queue_depth", "rejected", "latency_avg", "latency_max"}
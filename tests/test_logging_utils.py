@@ -0,0 +1,70 @@
+import io
+import json
+import logging
+
+from cm_customer_svc.routers.auth import ACCESS_TOKEN_COOKIE_NAME
+from cm_customer_svc.utils.logging_utils import RateLimitFilter, configure_logging, stop_logging
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _record(lineno: int = 10) -> logging.LogRecord:
+    return logging.LogRecord("cm_customer_svc.test", logging.ERROR, __file__, lineno, "boom", (), None)
+
+
+def test_rate_limit_filter_burst_then_sample():
+    limiter = RateLimitFilter(burst=3, window_seconds=60, sample_every=5)
+    records = [_record() for _ in range(13)]
+    passed = [record for record in records if limiter.filter(record)]
+    # 3 burst records, then the 5th and 10th after the burst
+    assert len(passed) == 5
+    assert [getattr(record, "suppressed", 0) for record in passed] == [0, 0, 0, 4, 4]
+    # other call sites have their own budget
+    assert limiter.filter(_record(lineno=11))
+
+
+def test_configure_logging_writes_json_lines():
+    root = logging.getLogger()
+    level = root.level
+    stream = io.StringIO()
+    configure_logging(level="INFO", log_format="json", stream=stream)
+    try:
+        log = logging.getLogger("cm_customer_svc.test")
+        log.info("customer %s updated", "abc", extra={"customer_id": "abc"})
+        log.debug("not written")
+        try:
+            raise ValueError("bad value")
+        except ValueError as e:
+            log.error(e, exc_info=True)
+    finally:
+        stop_logging()
+        root.setLevel(level)
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["level"] == "INFO" and first["logger"] == "cm_customer_svc.test"
+    assert first["message"] == "customer abc updated" and first["customer_id"] == "abc"
+    assert second["exc_type"] == "ValueError" and second["exc"].startswith("Traceback")
+    assert first["ts"].endswith("Z")
+
+
+def test_client_errors_log_without_tracebacks(client, caplog):
+    _login_via_registration(client, "00050301", "Password123")
+    with caplog.at_level(logging.DEBUG, logger="cm_customer_svc"):
+        assert client.get("/api/customers/not-a-uuid").status_code == 404
+        assert client.post("/api/customers", json={"customer_name": "X", "customer_contact": "abc"}).status_code == 422
+        assert client.post("/api/register", json={"employee_id": "00050301", "employee_name": "Dup", "password": "Password123"}).status_code == 409
+        client.cookies.set(ACCESS_TOKEN_COOKIE_NAME, "not-a-token")
+        assert client.get("/api/customers").status_code == 401
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("malformed customer id") for message in messages)
+    assert any(message.startswith("phone_number rejected") for message in messages)
+    assert any(message.startswith("access token rejected") for message in messages)
+    assert not [record for record in caplog.records if record.exc_info or record.levelno >= logging.ERROR]
@@ -0,0 +1,169 @@
+import pytest
+
+from cm_customer_svc.routers import auth as auth_router_module
+from cm_customer_svc.utils import rate_limit
+from cm_customer_svc.utils.metrics import login_rate_limited, login_unknown_user_verifications
+from cm_customer_svc.utils.rate_limit import LoginRateLimiter, MemoryBucketStore, RedisBucketStore, client_ip, parse_networks
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScriptRecorder:
+    """Redis client stand-in whose registered script records its calls and returns a fixed wait."""
+
+    def __init__(self, result="0", error=None):
+        self.calls = []
+        self.result = result
+        self.error = error
+
+    def register_script(self, source):
+        def run(keys, args):
+            if self.error is not None:
+                raise self.error
+            self.calls.append((keys, args))
+            return self.result
+
+        return run
+
+
+class CountingHasher:
+    """Wraps the real hashing service and counts verify_async calls."""
+
+    def __init__(self, hasher):
+        self.hasher = hasher
+        self.verifies = 0
+
+    async def verify_async(self, plain_password, hashed_password):
+        self.verifies += 1
+        return await self.hasher.verify_async(plain_password, hashed_password)
+
+
+@pytest.fixture
+def strict_limiter(monkeypatch):
+    limiter = LoginRateLimiter(MemoryBucketStore(100), ip_burst=3, ip_per_minute=1, account_burst=2, account_per_minute=1)
+    monkeypatch.setattr(rate_limit, "login_limiter", limiter)
+    return limiter
+
+
+@pytest.fixture
+def counting_hasher(monkeypatch):
+    hasher = CountingHasher(auth_router_module.password_hasher)
+    monkeypatch.setattr(auth_router_module, "password_hasher", hasher)
+    return hasher
+
+
+def _register(client, employee_id: str):
+    r = client.post("/api/register", json={"employee_id": employee_id, "employee_name": "Limited", "password": "Password123"})
+    assert r.status_code == 201
+
+
+def test_memory_bucket_burst_refill_and_bound():
+    clock = FakeClock()
+    store = MemoryBucketStore(max_keys=2, clock=clock)
+    assert store.take("a", 2, 1.0) == 0.0
+    assert store.take("a", 2, 1.0) == 0.0
+    assert store.take("a", 2, 1.0) == pytest.approx(1.0)
+    clock.now += 0.5
+    assert store.take("a", 2, 1.0) == pytest.approx(0.5)
+    clock.now += 1.0
+    assert store.take("a", 2, 1.0) == 0.0
+
+    # looking at a bucket takes nothing and creates nothing
+    assert store.peek("a", 2, 1.0) == pytest.approx(0.5) == store.peek("a", 2, 1.0)
+    assert store.peek("new", 2, 1.0) == 0.0
+    assert store.info()["keys"] == 1
+
+    store.take("b", 2, 1.0)
+    store.take("c", 2, 1.0)
+    assert store.info()["keys"] == 2 and store.evictions == 1
+    # the evicted bucket comes back full
+    assert store.take("a", 2, 1.0) == 0.0
+
+
+def test_redis_bucket_store_keys_and_fail_open():
+    recorder = ScriptRecorder(result="2.5")
+    store = RedisBucketStore(recorder, prefix="t:")
+    assert store.take("ip:10.0.0.1", 5, 0.5) == 2.5
+    keys, args = recorder.calls[0]
+    assert keys == ["t:ip:10.0.0.1"] and args[:2] == [5, 0.5] and args[3] == 1
+    store.peek("ip:10.0.0.1", 5, 0.5)
+    assert recorder.calls[1][1][3] == 0
+
+    assert RedisBucketStore(ScriptRecorder(error=ConnectionError("down"))).take("ip:x", 5, 0.5) == 0.0
+
+
+def test_employee_id_bucket_rejects_before_hashing(client, strict_limiter, counting_hasher):
+    _register(client, "00050401")
+    before = login_rate_limited.value("employee_id")
+    for _ in range(2):
+        assert client.post("/api/auth/login", json={"employee_id": "00050401", "password": "WrongPass1"}).status_code == 401
+    assert counting_hasher.verifies == 2
+
+    resp = client.post("/api/auth/login", json={"employee_id": "00050401", "password": "Password123"})
+    assert resp.status_code == 429
+    assert int(resp.headers["retry-after"]) >= 1
+    assert counting_hasher.verifies == 2
+    assert login_rate_limited.value("employee_id") == before + 1
+    assert strict_limiter.stats()["throttled"] == {"ip": 0, "employee_id": 1}
+
+
+def test_ip_bucket_limits_attempts_across_accounts(client, strict_limiter, counting_hasher):
+    before = login_rate_limited.value("ip")
+    for employee_id in ("00050411", "00050412", "00050413"):
+        assert client.post("/api/auth/login", json={"employee_id": employee_id, "password": "Password123"}).status_code == 401
+    assert client.post("/api/auth/login", json={"employee_id": "00050414", "password": "Password123"}).status_code == 429
+    assert counting_hasher.verifies == 3
+    assert login_rate_limited.value("ip") == before + 1
+
+
+def test_unknown_employee_id_runs_dummy_verify(client, counting_hasher):
+    before = login_unknown_user_verifications.value()
+    resp = client.post("/api/auth/login", json={"employee_id": "00050421", "password": "Password123"})
+    assert resp.status_code == 401
+    assert resp.json() == {"detail": "Invalid credentials"}
+    assert counting_hasher.verifies == 1
+    assert login_unknown_user_verifications.value() == before + 1
+
+
+def test_login_limits_endpoint(client):
+    _register(client, "00050431")
+    assert client.post("/api/auth/login", json={"employee_id": "00050431", "password": "Password123"}).status_code == 200
+    stats = client.get("/api/admin/login-limits").json()
+    assert stats["backend"] == "memory"
+    assert stats["limits"]["employee_id"]["burst"] >= 1
+    assert set(stats["throttled"]) == {"ip", "employee_id"}
+
+
+def test_successful_logins_take_no_tokens(client, strict_limiter):
+    _register(client, "00050451")
+    for _ in range(6):
+        assert client.post("/api/auth/login", json={"employee_id": "00050451", "password": "Password123"}).status_code == 200
+    assert strict_limiter.stats()["throttled"] == {"ip": 0, "employee_id": 0}
+
+
+def test_client_ip_trusts_forwarded_for_only_from_trusted_proxies():
+    proxies = parse_networks("10.0.0.0/8, 127.0.0.1, not-an-address")
+    assert len(proxies) == 2
+    assert client_ip("203.0.113.9", "198.51.100.1", proxies) == "203.0.113.9"
+    assert client_ip("10.1.2.3", "198.51.100.1", proxies) == "198.51.100.1"
+    # a client-supplied hop left of the real one is ignored
+    assert client_ip("10.1.2.3", "1.2.3.4, 198.51.100.1, 10.9.9.9", proxies) == "198.51.100.1"
+    assert client_ip("10.1.2.3", "", proxies) == "10.1.2.3"
+
+
+def test_forwarded_for_keys_ip_bucket_behind_trusted_proxy(client, strict_limiter, monkeypatch):
+    # the test client's peer address is "testclient"; trust it as if it were the proxy
+    monkeypatch.setattr(rate_limit, "client_ip", lambda peer, forwarded_for, networks: forwarded_for or peer)
+    for employee_id in ("00050461", "00050462", "00050463"):
+        resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": "Password123"}, headers={"X-Forwarded-For": "198.51.100.7"})
+        assert resp.status_code == 401
+    blocked = client.post("/api/auth/login", json={"employee_id": "00050464", "password": "Password123"}, headers={"X-Forwarded-For": "198.51.100.7"})
+    assert blocked.status_code == 429
+    other = client.post("/api/auth/login", json={"employee_id": "00050464", "password": "Password123"}, headers={"X-Forwarded-For": "198.51.100.8"})
+    assert other.status_code == 401
@@ -0,0 +1,114 @@
+import asyncio
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from cm_customer_svc.utils import metrics
+from cm_customer_svc.utils.request_timing import RequestTimings, current_timings
+from cm_customer_svc.utils.metrics import Counter, Histogram, MetricsRegistry, instrument_engine
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _sample(body: str, name: str, **labels) -> float:
+    """Value of the series name{labels...} (labels matched as a subset) in a /metrics body."""
+    for line in body.splitlines():
+        match = re.match(r"^(\w+)(?:\{(.*)\})? (\S+)$", line)
+        if not match or match.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2) or ""))
+        if all(found.get(k) == v for k, v in labels.items()):
+            return float(match.group(3))
+    return 0.0
+
+
+def test_histogram_and_counter_rendering():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0)))
+    counter = registry.register(Counter("demo_total", "Demo counter.", ("path",)))
+    histogram.observe(0.1, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3.0, "/a")
+    counter.inc('say "hi"\\')
+
+    assert registry.render().splitlines() == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/a",le="0.1"} 1',
+        'demo_seconds_bucket{route="/a",le="1.0"} 2',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 3',
+        'demo_seconds_sum{route="/a"} 3.6',
+        'demo_seconds_count{route="/a"} 3',
+        "# HELP demo_total Demo counter.",
+        "# TYPE demo_total counter",
+        'demo_total{path="say \\"hi\\"\\\\"} 1',
+    ]
+
+
+def test_statement_kind():
+    assert metrics._statement_kind("SELECT count(*) AS count_1 \nFROM customers") == "count"
+    assert metrics._statement_kind("\n  SELECT customers.customer_id FROM customers") == "select"
+    assert metrics._statement_kind("INSERT INTO customers VALUES (?)") == "insert"
+    assert metrics._statement_kind("PRAGMA foreign_keys") == "other"
+
+
+def test_metrics_endpoint_reports_routes_sql_hashing_and_jwt(client, db_session):
+    instrument_engine(db_session.get_bind())
+    _login_via_registration(client, "00050101", "Password123")
+    before = client.get("/metrics").text
+
+    client.post("/api/customers", json={"customer_name": "Metered"})
+    client.get("/api/customers")
+    client.get("/api/customers")
+    client.get("/api/definitely-not-a-route")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    route = {"method": "GET", "route": "/api/customers"}
+
+    def delta(name, **labels):
+        return _sample(body, name, **labels) - _sample(before, name, **labels)
+
+    assert delta("http_request_duration_seconds_count", status="200", **route) == 2
+    assert delta("http_request_duration_seconds_count", method="POST", route="/api/customers", status="201") == 1
+    assert _sample(body, "http_requests_in_flight", **route) == 0
+    # list = page query + count query, all recorded against the route
+    assert delta("http_request_db_queries_sum", **route) >= 4
+    assert delta("http_request_db_duration_seconds_count", **route) == 2
+    assert delta("db_query_duration_seconds_count", statement="count") >= 1
+    assert delta("db_query_duration_seconds_count", statement="insert") >= 1
+    assert "definitely-not-a-route" not in body
+    # registration hashed and login verified a password; the session cookie was decoded on first use
+    assert _sample(body, "password_hash_duration_seconds_count", operation="hash") >= 1
+    assert _sample(body, "password_hash_duration_seconds_count", operation="verify") >= 1
+    assert _sample(body, "jwt_decode_duration_seconds_count") >= 1
+    assert delta("jwt_cache_lookups_total", result="hit") >= 2
+
+
+def test_async_engine_queries_count_towards_the_request(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}")
+        instrument_engine(engine.sync_engine)
+        current = RequestTimings()
+        token = current_timings.set(current)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+        finally:
+            current_timings.reset(token)
+            await engine.dispose()
+        return current
+
+    current = asyncio.run(run())
+    assert current.queries == 2 and current.phases["db"] > 0
@@ -0,0 +1,47 @@
+from sqlalchemy import select
+
+from cm_customer_svc.models.customer import Customer
+from cm_customer_svc.schemas.customer import CustomerResponse
+from cm_customer_svc.utils.serialization import CUSTOMER_COLUMNS, CustomerJSONResponse, customer_dict, customer_json, customer_row_dicts
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def test_fast_path_matches_pydantic_serialization(client, db_session):
+    _login_via_registration(client, "00048001", "Password123")
+    client.post("/api/customers", json={"customer_name": 'Quote " and ümlaut', "customer_contact": "555-0100"})
+    client.post("/api/customers", json={"customer_name": "No Contact"})
+
+    customers = db_session.execute(select(Customer).order_by(Customer.customer_name)).scalars().all()
+    rows = db_session.execute(select(*CUSTOMER_COLUMNS).order_by(Customer.customer_name)).all()
+    for customer in customers:
+        assert customer_json(customer) == CustomerResponse.model_validate(customer).model_dump_json().encode("utf-8")
+    assert customer_row_dicts(rows) == [customer_dict(customer) for customer in customers]
+    assert CustomerJSONResponse(customer_row_dicts(rows)).body == b"[" + b",".join(customer_json(c) for c in customers) + b"]"
+
+
+def test_customer_endpoints_return_only_response_fields(client):
+    _login_via_registration(client, "00048002", "Password123")
+    created = client.post("/api/customers", json={"customer_name": "Fields Only", "customer_contact": "555-123-4567"}).json()
+    cid = created["customer_id"]
+    fields = set(CustomerResponse.model_fields)
+
+    page = client.get("/api/customers")
+    assert page.headers["content-type"] == "application/json"
+    body = page.json()
+    assert set(body) == {"total_count", "total_count_exact", "page", "page_size", "items", "next_cursor"}
+    assert body["items"] == [created]
+
+    assert client.get(f"/api/customers/{cid}").json() == created
+    assert client.get("/api/customers/by-phone/5551234567").json() == [created]
+    assert client.post("/api/customers:batchGet", json={"ids": [cid, "nope"]}).json() == {"items": [created], "missing_ids": ["nope"]}
+    search = client.get("/api/customers/search", params={"q": "Fields"}).json()
+    assert search["items"] == [created] and search["total_count_exact"] is True
+    assert all(set(item) == fields for item in body["items"] + search["items"])
@@ -0,0 +1,71 @@
+import re
+
+from cm_customer_svc.utils import server_timing
+from cm_customer_svc.utils.metrics import instrument_engine
+from cm_customer_svc.utils.request_timing import RequestTimings, server_timing_header
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def _phases(resp) -> dict:
+    return {name: float(dur) for name, dur in re.findall(r"(\w+);dur=([\d.]+)", resp.headers["server-timing"])}
+
+
+def test_server_timing_header_format():
+    timings = RequestTimings()
+    timings.add("serialize", 0.0005)
+    timings.add("auth", 0.001)
+    timings.add("auth", 0.001)
+    assert server_timing_header(timings, 0.0123456) == "auth;dur=2.000, serialize;dur=0.500, total;dur=12.346"
+
+
+def test_server_timing_phases(client, db_session):
+    instrument_engine(db_session.get_bind())
+    _login_via_registration(client, "00050201", "Password123")
+
+    created = client.post("/api/customers", json={"customer_name": "Timed"})
+    assert list(_phases(created)) == ["auth", "db", "validation", "total"]
+
+    listed = client.get("/api/customers")
+    phases = _phases(listed)
+    assert list(phases) == ["auth", "db", "serialize", "total"]
+    # durations are rounded to microseconds
+    assert phases["total"] + 0.002 >= phases["auth"] + phases["db"] + phases["serialize"]
+
+    # phases only appear when they ran
+    assert list(_phases(client.get("/api/definitely-not-a-route"))) == ["total"]
+
+
+def test_profile_report_for_allowed_employee(client, monkeypatch):
+    monkeypatch.setattr(server_timing, "PROFILE_EMPLOYEE_IDS", frozenset({"00050202"}))
+    _login_via_registration(client, "00050202", "Password123")
+    client.post("/api/customers", json={"customer_name": "Profiled"})
+
+    assert "x-profile-id" not in client.get("/api/customers").headers
+    resp = client.get("/api/customers", params={"profile": "1"})
+    assert resp.status_code == 200 and resp.json()["items"][0]["customer_name"] == "Profiled"
+    profile_id = resp.headers["x-profile-id"]
+
+    report = client.get(f"/api/admin/profiles/{profile_id}")
+    assert report.status_code == 200
+    assert report.headers["content-type"].startswith("text/plain")
+    assert re.match(r"wall [\d.]+ ms, \d+ samples every 1 ms", report.text)
+    assert client.get("/api/admin/profiles/unknown").status_code == 404
+
+
+def test_profile_ignored_for_other_employees(client, monkeypatch):
+    monkeypatch.setattr(server_timing, "PROFILE_EMPLOYEE_IDS", frozenset({"00050299"}))
+    assert "x-profile-id" not in client.get("/api/customers", params={"profile": "1"}).headers
+
+    _login_via_registration(client, "00050203", "Password123")
+    resp = client.get("/api/customers", params={"profile": "1"})
+    assert resp.status_code == 200
+    assert "x-profile-id" not in resp.headers
+    assert client.get("/api/admin/profiles/anything").status_code == 403
@@ -0,0 +1,112 @@
+import importlib
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from cm_customer_svc.models import base
+
+
+def _login_via_registration(client, employee_id: str, password: str):
+    reg_payload = {"employee_id": employee_id, "employee_name": "Manager", "password": password}
+    r = client.post("/api/register", json=reg_payload)
+    assert r.status_code == 201
+
+    resp = client.post("/api/auth/login", json={"employee_id": employee_id, "password": password})
+    assert resp.status_code == 200
+
+
+def test_get_db_checks_out_lazily_and_records_wait():
+    before = base.pool_stats.acquisitions
+    gen = base.get_db()
+    session = next(gen)
+    try:
+        assert isinstance(session, Session)
+        assert session.get_bind() is base.engine
+        # no connection is held until the session runs SQL
+        assert base.pool_stats.acquisitions == before
+        assert session.in_transaction() is False
+
+        session.execute(select(1))
+        assert base.pool_stats.acquisitions == before + 1
+        session.execute(select(1))
+        assert base.pool_stats.acquisitions == before + 1
+
+        # a new transaction after commit checks out again
+        session.commit()
+        session.execute(select(1))
+        assert base.pool_stats.acquisitions == before + 2
+    finally:
+        gen.close()
+
+
+def test_engine_options_sqlite_skips_queue_pool_sizing():
+    options = base.engine_options("sqlite:///:memory:")
+    assert "pool_size" not in options
+    assert "max_overflow" not in options
+    assert set(options) >= {"pool_pre_ping", "pool_recycle"}
+
+
+def test_engine_options_postgres_pool_and_statement_timeout(monkeypatch):
+    monkeypatch.setattr(base, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(base, "DB_MAX_OVERFLOW", 5)
+    monkeypatch.setattr(base, "DB_POOL_PRE_PING", True)
+    monkeypatch.setattr(base, "DB_STATEMENT_TIMEOUT_MS", 2500)
+
+    options = base.engine_options("postgresql://u:p@localhost/db")
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=2500"}
+
+    async_options = base.engine_options("postgresql+asyncpg://u:p@localhost/db")
+    assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "2500"}}
+
+
+def test_pool_config_env_overrides(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "12")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "true")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "1000")
+    import cm_customer_svc.config as config
+
+    cfg = importlib.reload(config)
+    try:
+        assert cfg.DB_POOL_SIZE == 12
+        assert cfg.DB_POOL_PRE_PING is True
+        assert cfg.DB_STATEMENT_TIMEOUT_MS == 1000
+    finally:
+        monkeypatch.undo()
+        importlib.reload(config)
+
+
+def test_pool_stats_endpoint(client):
+    _login_via_registration(client, "00037001", "Password123")
+
+    resp = client.get("/api/admin/pool")
+    assert resp.status_code == 200
+    sync_stats = resp.json()["sync"]
+    for key in ("pool_class", "size", "checkedout", "acquisitions", "avg_wait_ms", "max_wait_ms"):
+        assert key in sync_stats
+
+
+def test_pool_stats_requires_auth(client):
+    assert client.get("/api/admin/pool").status_code == 401
+
+
+def test_async_sessions_record_wait_on_first_query():
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        factory = async_sessionmaker(bind=engine, sync_session_class=base._AsyncSyncSession)
+        before = base.async_pool_stats.acquisitions
+        try:
+            async with factory() as session:
+                assert base.async_pool_stats.acquisitions == before
+                await session.execute(select(1))
+                assert base.async_pool_stats.acquisitions == before + 1
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,138 @@
+import time
+
+import pytest
+from fastapi import Request, HTTPException
+from jose import JWTError, jwt
+
+from cm_customer_svc.config import SECRET_KEY, ALGORITHM
+from cm_customer_svc.dependencies.auth import get_current_user
+from cm_customer_svc.routers.auth import ACCESS_TOKEN_COOKIE_NAME
+from cm_customer_svc.utils import jwt_utils
+from cm_customer_svc.utils.jwt_utils import (
+    create_access_token,
+    decode_access_token_cached,
+    revoke_access_token,
+    revoked_tokens,
+    token_digest,
+    verified_token_cache,
+)
+
+
+def _request(token: str) -> Request:
+    headers = [(b"cookie", f"{ACCESS_TOKEN_COOKIE_NAME}={token}".encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture(autouse=True)
+def _clear_token_caches():
+    verified_token_cache.clear()
+    revoked_tokens.clear()
+    yield
+    verified_token_cache.clear()
+    revoked_tokens.clear()
+
+
+def test_repeat_requests_skip_signature_check(monkeypatch):
+    token = create_access_token({"sub": "cached_user"})
+    assert get_current_user(_request(token)) == "cached_user"
+    hits_before = verified_token_cache.info()["hits"]
+
+    def fail_decode(token):
+        raise AssertionError("signature should not be re-verified")
+
+    monkeypatch.setattr(jwt_utils, "decode_access_token", fail_decode)
+    assert get_current_user(_request(token)) == "cached_user"
+    assert verified_token_cache.info()["hits"] == hits_before + 1
+
+
+def test_cached_token_still_expires_at_exp(monkeypatch):
+    exp = int(time.time()) + 5
+    token = jwt.encode({"sub": "short_lived", "exp": exp}, SECRET_KEY, algorithm=ALGORITHM)
+    assert decode_access_token_cached(token)["sub"] == "short_lived"
+
+    # still valid through the exp second itself, rejected right after
+    monkeypatch.setattr(jwt_utils.time, "time", lambda: exp + 0.5)
+    assert decode_access_token_cached(token)["sub"] == "short_lived"
+    monkeypatch.setattr(jwt_utils.time, "time", lambda: exp + 1)
+    with pytest.raises(JWTError):
+        decode_access_token_cached(token)
+
+
+def test_invalid_tokens_are_not_cached():
+    with pytest.raises(HTTPException):
+        get_current_user(_request("not-a-token"))
+    assert len(verified_token_cache) == 0
+
+
+def test_revoked_token_rejected_even_when_cached():
+    token = create_access_token({"sub": "revoked_user"})
+    assert get_current_user(_request(token)) == "revoked_user"
+
+    revoke_access_token(token)
+    assert token_digest(token) in revoked_tokens
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(_request(token))
+    assert exc.value.status_code == 401
+
+
+def test_tokens_are_unique_per_login():
+    assert create_access_token({"sub": "same"}) != create_access_token({"sub": "same"})
+
+
+def test_logout_revokes_cookie_copy(client):
+    r = client.post("/api/register", json={"employee_id": "00039001", "employee_name": "Manager", "password": "Password123"})
+    assert r.status_code == 201
+    r = client.post("/api/auth/login", json={"employee_id": "00039001", "password": "Password123"})
+    assert r.status_code == 200
+    token = r.cookies.get(ACCESS_TOKEN_COOKIE_NAME)
+    assert client.get("/api/users/me").status_code == 200
+
+    assert client.post("/api/auth/logout").status_code == 200
+    client.cookies.set(ACCESS_TOKEN_COOKIE_NAME, token)
+    assert client.get("/api/users/me").status_code == 401
+    client.cookies.clear()
+
+    # a fresh login is unaffected by the earlier revocation
+    r = client.post("/api/auth/login", json={"employee_id": "00039001", "password": "Password123"})
+    assert r.status_code == 200
+    assert client.get("/api/users/me").status_code == 200
+
+
+def test_logout_ignores_invalid_tokens(client):
+    for i in range(5):
+        client.cookies.set(ACCESS_TOKEN_COOKIE_NAME, f"junk-{i}")
+        assert client.post("/api/auth/logout").status_code == 200
+    client.cookies.clear()
+    forged = jwt.encode({"sub": "x", "exp": int(time.time()) + 60}, "wrong-secret", algorithm=ALGORITHM)
+    revoke_access_token(forged)
+    assert len(revoked_tokens) == 0
+
+
+def test_revoked_tokens_full_refuses_instead_of_forgetting(monkeypatch):
+    revoked = jwt_utils.RevokedTokens(max_entries=2)
+    now = int(time.time())
+    assert revoked.add("late", now + 300)
+    assert revoked.add("soon", now + 10)
+    assert not revoked.add("later", now + 600)
+    assert revoked.rejected == 1
+    assert "late" in revoked and "soon" in revoked and "later" not in revoked
+
+    # expired digests make room again
+    monkeypatch.setattr(jwt_utils.time, "time", lambda: now + 11)
+    assert revoked.add("later", now + 600)
+    assert "later" in revoked and "late" in revoked
+
+
+def test_logout_reports_unrecorded_revocation(client, monkeypatch):
+    monkeypatch.setattr(jwt_utils, "revoked_tokens", jwt_utils.RevokedTokens(max_entries=1))
+    jwt_utils.revoked_tokens.add("other", int(time.time()) + 300)
+    r = client.post("/api/register", json={"employee_id": "00039003", "employee_name": "Manager", "password": "Password123"})
+    assert r.status_code == 201
+    assert client.post("/api/auth/login", json={"employee_id": "00039003", "password": "Password123"}).status_code == 200
+
+    r = client.post("/api/auth/logout")
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
+    assert jwt_utils.revoked_tokens.rejected == 1
+    # the cookie is still cleared on the client
+    assert "max-age=0" in r.headers["set-cookie"].lower()
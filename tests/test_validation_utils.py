@@ -56,6 +56,53 @@ def test_validate_phone_number_format_with_letters():
         v.validate_phone_number_format("555-ABC-1234")
 
 
+def test_normalize_phone_digits():
+    assert v.normalize_phone_digits("+1 (555) 123-4567") == "15551234567"
+    assert v.normalize_phone_digits("0044 20 7946 0958") == "442079460958"
+    assert v.normalize_phone_digits("555.123.4567") == "5551234567"
+    assert v.normalize_phone_digits("555-123-4567", default_country_code="1") == "15551234567"
+    assert v.normalize_phone_digits("+1 555 123 4567", default_country_code="1") == "15551234567"
+    assert v.normalize_phone_digits(None) is None
+    assert v.normalize_phone_digits("--") is None
+
+
+@pytest.mark.parametrize(
+    "country_code, forms, expected",
+    [
+        ("1", ["1-555-123-4567", "+1 555 123 4567", "555-123-4567", "(555) 123-4567", "001 555 123 4567"], "15551234567"),
+        ("44", ["020 7946 0958", "+44 20 7946 0958", "0044 20 7946 0958", "44 20 7946 0958"], "442079460958"),
+    ],
+)
+def test_normalize_phone_digits_collapses_national_and_international_forms(country_code, forms, expected):
+    assert {v.normalize_phone_digits(form, country_code) for form in forms} == {expected}
+
+
+def test_migration_backfill_normalizes_like_the_app():
+    import importlib.util
+    from pathlib import Path
+
+    path = Path(__file__).resolve().parents[1] / "migrations" / "versions" / "c4b8e2d61a9f_add_customer_contact_digits.py"
+    spec = importlib.util.spec_from_file_location("c4b8e2d61a9f", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    for country_code in ("", "1", "44"):
+        for form in ("1-555-123-4567", "+1 555 123 4567", "555-123-4567", "020 7946 0958", "44 20 7946 0958", "0044 20 7946 0958", "12345"):
+            digits = v.normalize_phone_digits(form, country_code)
+            expected = digits if v.is_valid_phone_digits(digits) else None
+            assert migration._normalize(form, country_code) == expected
+
+
+def test_validate_phone_number_format_counts_default_country_code():
+    local = "123 456 789 012 345"  # 15 digits: valid as written, 17 with country code 44
+    assert v.validate_phone_number_format(local) == local
+    with pytest.raises(ValueError, match="including the country code"):
+        v.validate_phone_number_format(local, default_country_code="44")
+    # an explicit international prefix is not given the default country code
+    assert v.validate_phone_number_format("+" + local, default_country_code="44") == "+" + local
+    assert v.is_valid_phone_digits(v.normalize_phone_digits("555 123 4567", "44"))
+    assert not v.is_valid_phone_digits(None)
+
+
 # sanitize
 def test_sanitize_input_html_and_whitespace():
     raw = "  <script>alert(1)</script>   DROP TABLE users;\n"